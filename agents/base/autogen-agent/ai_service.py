@@ -1,10 +1,16 @@
-def deployable_ai_service(context, url=None, model_id=None):
-    import asyncio
-    import threading
+def deployable_ai_service(
+    context,
+    url=None,
+    model_id=None,
+    event_loop_pool_size=1,
+    stream_max_batch_size=64,
+    stream_max_buffered_chunks=256,
+):
     from typing import Generator, AsyncGenerator
-    from ibm_watsonx_ai import Credentials
     from autogen_core import CancellationToken
     from autogen_agent_base.agent import get_agent_chat
+    from autogen_agent_base.client_manager import APIClientManager
+    from autogen_agent_base.streaming import EventLoopPool
     from autogen_agentchat.messages import (
         TextMessage,
         BaseChatMessage,
@@ -12,15 +18,23 @@ def deployable_ai_service(context, url=None, model_id=None):
         BaseMessage,
     )
 
-    persistent_loop = asyncio.new_event_loop()  # Create a persistent event loop that will be used by generate and generate_stream
-
-    def start_loop(loop: asyncio.AbstractEventLoop) -> None:
-        asyncio.set_event_loop(loop)
-        loop.run_forever()
-
-    threading.Thread(
-        target=start_loop, args=(persistent_loop,), daemon=True
-    ).start()  # We run a persistent loop in a separate daemon thread
+    def create_loop_agent() -> tuple:
+        # The async HTTP client of an API client is bound to the event loop it first
+        # ran on, so each loop gets its own API client and ModelInference
+        client_manager = APIClientManager(
+            url=url,
+            space_id=context.get_space_id(),
+            token=context.generate_token(),
+        )
+        return client_manager, get_agent_chat(client_manager.client, model_id)
+
+    # Persistent event loops, each running in a separate daemon thread, that will be used by generate and generate_stream
+    loop_pool = EventLoopPool(
+        size=event_loop_pool_size,
+        max_batch_size=stream_max_batch_size,
+        max_buffered=stream_max_buffered_chunks,
+        initializer=create_loop_agent,
+    )
 
     def get_choice_from_message(
         message: BaseMessage, is_assistant: bool = False
@@ -91,6 +105,20 @@ def deployable_ai_service(context, url=None, model_id=None):
 
         return choice
 
+    def get_usage(messages: list[BaseMessage]) -> dict:
+        """Token usage of the model calls made for a single request."""
+        prompt_tokens = completion_tokens = 0
+        for message in messages:
+            if message.models_usage is not None:
+                prompt_tokens += message.models_usage.prompt_tokens
+                completion_tokens += message.models_usage.completion_tokens
+
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
     async def generate_async(context) -> dict:
         """
         The `generate` function handles the REST call to the inference endpoint
@@ -116,9 +144,9 @@ def deployable_ai_service(context, url=None, model_id=None):
         Please note that the `system message` MUST be placed first in the list of messages!
         """
 
-        credentials = Credentials(url=url, token=context.get_token())
-
-        agent = get_agent_chat(credentials, model_id, context.get_space_id())
+        # API client and agent factory of the event loop serving this request
+        client_manager, agent = loop_pool.get_loop_state()
+        client_manager.set_token(context.get_token())
 
         payload = context.get_json()
         messages = payload.get("messages", [])
@@ -155,9 +183,9 @@ def deployable_ai_service(context, url=None, model_id=None):
         }
         Please note that the `system message` MUST be placed first in the list of messages!
         """
-        credentials = Credentials(url=url, token=context.get_token())
-
-        agent = get_agent_chat(credentials, model_id, context.get_space_id())
+        # API client and agent factory of the event loop serving this request
+        client_manager, agent = loop_pool.get_loop_state()
+        client_manager.set_token(context.get_token())
 
         payload = context.get_json()
         headers = context.get_headers()
@@ -205,10 +233,7 @@ def deployable_ai_service(context, url=None, model_id=None):
         A synchronous wrapper for the asynchronous `generate_async` method.
         """
 
-        future = asyncio.run_coroutine_threadsafe(
-            generate_async(context), persistent_loop
-        )
-        generated_response = future.result()
+        generated_response = loop_pool.submit(generate_async(context)).result()
         choices = [
             {
                 "index": 0,
@@ -220,7 +245,10 @@ def deployable_ai_service(context, url=None, model_id=None):
         ]
         return {
             "headers": {"Content-Type": "application/json"},
-            "body": {"choices": choices},
+            "body": {
+                "choices": choices,
+                "usage": get_usage(generated_response.messages),
+            },
         }
 
     def generate_stream(context) -> Generator:
@@ -228,16 +256,7 @@ def deployable_ai_service(context, url=None, model_id=None):
         A synchronous wrapper for the asynchronous `generate_async_stream` method.
         """
 
-        gen = generate_async_stream(context)
-
-        while True:
-            try:
-                future = asyncio.run_coroutine_threadsafe(
-                    gen.__anext__(), persistent_loop
-                )
-                value = future.result()
-            except StopAsyncIteration:
-                break
-            yield value
+        # Chunks are handed over from the event loop in batches
+        yield from loop_pool.stream(generate_async_stream(context))
 
     return generate, generate_stream
@@ -0,0 +1,112 @@
+"""Benchmark of the sync streaming bridge used by `generate_stream` in `ai_service.py`.
+
+Compares streamed chunks/sec of:
+- the previous design, a single event loop with one cross-thread hop per chunk,
+- `EventLoopPool.stream`, handing chunks over in batches through an `asyncio.Queue`,
+  with 1 or more event loops in the pool (`event_loop_pool_size`),
+at increasing numbers of concurrent streams.
+
+The agent is replaced with a fake async generator yielding chunks the way a
+streamed model response does (a network read every few chunks), so only the
+bridge overhead is measured and no credentials are needed.
+
+Usage:
+    python scripts/benchmark_streaming.py --chunks 2000 --concurrency 1 8 32
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncGenerator, Callable, Generator
+
+# Add src directory to Python path to import the agent package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from autogen_agent_base.streaming import EventLoopPool  # noqa: E402
+
+
+async def fake_stream(n_chunks: int, chunks_per_read: int) -> AsyncGenerator:
+    """Yield `n_chunks` model chunks, awaiting the network every `chunks_per_read`."""
+    for i in range(n_chunks):
+        if i % chunks_per_read == 0:
+            await asyncio.sleep(0.0001)
+        yield {
+            "choices": [
+                {"index": 0, "delta": {"role": "assistant", "content": "token"}}
+            ]
+        }
+
+
+def single_loop_bridge() -> Callable[[AsyncGenerator], Generator]:
+    persistent_loop = asyncio.new_event_loop()
+    threading.Thread(target=persistent_loop.run_forever, daemon=True).start()
+
+    def stream(gen: AsyncGenerator) -> Generator:
+        while True:
+            try:
+                future = asyncio.run_coroutine_threadsafe(
+                    gen.__anext__(), persistent_loop
+                )
+                value = future.result()
+            except StopAsyncIteration:
+                break
+            yield value
+
+    return stream
+
+
+def run(
+    stream: Callable[[AsyncGenerator], Generator],
+    concurrency: int,
+    n_chunks: int,
+    chunks_per_read: int,
+) -> float:
+    """Consume `concurrency` streams in parallel threads and return chunks/sec."""
+
+    def consume(_) -> int:
+        count = 0
+        for chunk in stream(fake_stream(n_chunks, chunks_per_read)):
+            json.dumps(chunk)  # SSE serialization done by the server
+            count += 1
+        return count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        total = sum(executor.map(consume, range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=2000, help="Chunks per stream")
+    parser.add_argument(
+        "--chunks-per-read",
+        type=int,
+        default=8,
+        help="Number of chunks received from the model per network read",
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    bridges = {"single loop, per-chunk hop": single_loop_bridge()}
+    for size in args.pool_sizes:
+        bridges[f"batched queue, {size} loop(s)"] = EventLoopPool(size=size).stream
+
+    print(f"{'bridge':<30}" + "".join(f"{c:>12}" for c in args.concurrency))
+    for name, stream in bridges.items():
+        results = [
+            run(stream, concurrency, args.chunks, args.chunks_per_read)
+            for concurrency in args.concurrency
+        ]
+        print(f"{name:<30}" + "".join(f"{r:>12,.0f}" for r in results))
+    print("(chunks/sec, columns are numbers of concurrent streams)")
+
+
+if __name__ == "__main__":
+    main()
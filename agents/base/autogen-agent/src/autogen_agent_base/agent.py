@@ -1,8 +1,10 @@
 from typing import Callable
 
-from ibm_watsonx_ai import Credentials
+from ibm_watsonx_ai import APIClient
+from ibm_watsonx_ai.foundation_models import ModelInference
 
-from autogen_watsonx_client.config import WatsonxClientConfiguration
+from autogen_core.models import RequestUsage
+from autogen_core.tools import BaseTool, FunctionTool
 from autogen_watsonx_client.client import WatsonXChatCompletionClient
 
 from autogen_agentchat.agents import AssistantAgent
@@ -10,22 +12,50 @@ from autogen_agentchat.agents import AssistantAgent
 from autogen_agent_base import TOOLS
 
 
-def get_agent_chat(
-    credentials: Credentials,
-    model_id: str,
-    space_id: str | None = None,
-) -> Callable:
-    """Workflow generator closure."""
+class RequestChatCompletionClient(WatsonXChatCompletionClient):
+    """`WatsonXChatCompletionClient` of a single request, over a shared `ModelInference`.
 
-    # Initialise WatsonxClientConfiguration
-    wx_config = WatsonxClientConfiguration(
-        model_id=model_id,  # pick a model you have access to on wx.ai here
-        token=credentials.token,
-        url=credentials.url,
-        space_id=space_id,
-    )
+    `WatsonXChatCompletionClient` creates its own `ModelInference`, with a new API
+    client and HTTP connections, and accumulates the token usage of all its calls.
+    This client is cheap to create for every request instead: it sends the calls
+    through a `ModelInference` created once from the shared API client, and its
+    `actual_usage` and `total_usage` cover the calls of this request only.
 
-    wx_client = WatsonXChatCompletionClient(**wx_config)
+    Relies on the attributes set by the constructor of autogen-watsonx-client 0.0.8,
+    the version pinned in pyproject.toml.
+    """
+
+    def __init__(self, model_inference: ModelInference) -> None:
+        # The parent constructor is not called, as it would create a ModelInference
+        self._raw_config = {"model_id": model_inference.model_id}
+        self._client = model_inference
+        self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    async def close(self) -> None:
+        # The shared ModelInference, and its HTTP clients, serve the other requests
+        pass
+
+
+def get_agent_chat(client: APIClient, model_id: str) -> Callable:
+    """Workflow generator closure.
+
+    The `ModelInference` is created once from `client`, so all agents returned by
+    the closure send their requests through the HTTP connection pools of `client`,
+    authorized with the token set on `client` for the current request. Each agent
+    gets its own model client, so the token usage is reported per request.
+    """
+
+    # pick a model you have access to on wx.ai here
+    model_inference = ModelInference(model_id=model_id, api_client=client)
+
+    # Wrap the tools once, so their schemas are not rebuilt for every agent
+    tools = [
+        tool
+        if isinstance(tool, BaseTool)
+        else FunctionTool(tool, description=tool.__doc__ or "")
+        for tool in TOOLS
+    ]
 
     # Define system prompt
     default_system_prompt = "You are a helpful AI assistant, please respond to the user's query to the best of your ability!"
@@ -33,11 +63,11 @@ def get_agent_chat(
     def get_agent(system_prompt: str = default_system_prompt) -> AssistantAgent:
         """Get compiled workflow with overwritten system prompt, if provided"""
 
-        # Create instance of compiled workflow
+        # Agents keep the conversation state, so each request gets its own instance
         return AssistantAgent(
             name="assistant",
-            model_client=wx_client,
-            tools=TOOLS,
+            model_client=RequestChatCompletionClient(model_inference),
+            tools=tools,
             system_message=system_prompt,
             model_client_stream=True,
             reflect_on_tool_use=True,
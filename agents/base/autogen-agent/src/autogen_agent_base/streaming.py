@@ -0,0 +1,124 @@
+import asyncio
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Callable, Coroutine, Generator
+
+
+class _StreamEnd:
+    pass
+
+
+class _StreamError:
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+
+class EventLoopPool:
+    """Pool of event loops, each one running forever in its own daemon thread.
+
+    Coroutines and async generators are dispatched to the loops in a round-robin
+    fashion, so concurrent requests are spread across `size` loop threads.
+
+    Objects bound to the event loop they first run on, e.g. async HTTP clients, must
+    not be shared by the loops. Such objects are created once per loop by
+    `initializer`, and a coroutine gets the ones of the loop it runs on with
+    `get_loop_state`.
+
+    Async generators are bridged to synchronous generators through an `asyncio.Queue`.
+    The whole async generator is consumed by a single task on the loop, which puts
+    the items into a queue holding at most `max_buffered` items, so a slow reader
+    applies backpressure to the producer. The reader takes the items out of the queue
+    in batches of up to `max_batch_size`, i.e. it waits for the loop thread once per
+    batch instead of once per item.
+
+    Args:
+        size: Number of event loops (and threads) in the pool.
+        max_batch_size: Maximum number of stream items handed over to the reader at once.
+        max_buffered: Maximum number of stream items buffered ahead of the reader.
+        initializer: Factory called once for each loop, creating the loop state.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_batch_size: int = 64,
+        max_buffered: int = 256,
+        initializer: Callable[[], Any] | None = None,
+    ) -> None:
+        self.max_batch_size = max_batch_size
+        self.max_buffered = max_buffered
+
+        self.loops = [asyncio.new_event_loop() for _ in range(size)]
+        self._loop_states = {
+            loop: initializer() if initializer is not None else None
+            for loop in self.loops
+        }
+        for loop in self.loops:
+            threading.Thread(target=self._run_loop, args=(loop,), daemon=True).start()
+
+        self._next_loop = itertools.cycle(self.loops).__next__
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def get_loop_state(self) -> Any:
+        """Get the state created by `initializer` for the loop running the caller."""
+        try:
+            return self._loop_states[asyncio.get_running_loop()]
+        except KeyError:
+            raise RuntimeError("Not running on an event loop of the pool") from None
+
+    def submit(self, coroutine: Coroutine) -> Future:
+        """Run the coroutine on the next loop of the pool."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._next_loop())
+
+    def stream(self, async_iterator: AsyncIterator) -> Generator[Any, None, None]:
+        """Iterate over the async iterator on the next loop of the pool."""
+        loop = self._next_loop()
+        queue, producer = asyncio.run_coroutine_threadsafe(
+            self._start_producer(async_iterator), loop
+        ).result()
+
+        try:
+            while True:
+                batch = asyncio.run_coroutine_threadsafe(
+                    self._get_batch(queue), loop
+                ).result()
+                for item in batch:
+                    if isinstance(item, _StreamEnd):
+                        return
+                    if isinstance(item, _StreamError):
+                        raise item.error
+                    yield item
+        finally:
+            # Stop the producer, e.g. when the client disconnected
+            loop.call_soon_threadsafe(producer.cancel)
+
+    async def _start_producer(
+        self, async_iterator: AsyncIterator
+    ) -> tuple[asyncio.Queue, asyncio.Task]:
+        queue = asyncio.Queue(maxsize=self.max_buffered)
+        producer = asyncio.create_task(self._produce(async_iterator, queue))
+        return queue, producer
+
+    @staticmethod
+    async def _produce(async_iterator: AsyncIterator, queue: asyncio.Queue) -> None:
+        try:
+            async for item in async_iterator:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(_StreamError(e))
+        else:
+            await queue.put(_StreamEnd())
+        finally:
+            if hasattr(async_iterator, "aclose"):
+                await async_iterator.aclose()
+
+    async def _get_batch(self, queue: asyncio.Queue) -> list:
+        batch = [await queue.get()]
+        while len(batch) < self.max_batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
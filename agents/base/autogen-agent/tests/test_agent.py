@@ -0,0 +1,36 @@
+import inspect
+import re
+
+import pytest
+
+client = pytest.importorskip("autogen_watsonx_client.client")
+
+from autogen_agent_base.agent import RequestChatCompletionClient  # noqa: E402
+
+# Private attributes of WatsonXChatCompletionClient set by RequestChatCompletionClient
+REQUEST_CLIENT_ATTRIBUTES = {"_raw_config", "_client", "_total_usage", "_actual_usage"}
+
+
+def assigned_attributes(function) -> set[str]:
+    return set(re.findall(r"self\.(_\w+)\s*=", inspect.getsource(function)))
+
+
+class TestRequestChatCompletionClient:
+    def test_parent_constructor_sets_the_same_attributes(self):
+        assert (
+            assigned_attributes(client.WatsonXChatCompletionClient.__init__)
+            == REQUEST_CLIENT_ATTRIBUTES
+        )
+
+    @pytest.mark.parametrize("method", ["create", "create_stream"])
+    def test_parent_calls_use_the_attributes(self, method):
+        source = inspect.getsource(getattr(client.WatsonXChatCompletionClient, method))
+
+        for attribute in ["_client", "_total_usage", "_actual_usage"]:
+            assert f"self.{attribute}" in source
+
+    def test_request_client_sets_the_attributes(self):
+        assert (
+            assigned_attributes(RequestChatCompletionClient.__init__)
+            == REQUEST_CLIENT_ATTRIBUTES
+        )
@@ -0,0 +1,100 @@
+"""Tests for the sync streaming bridge in autogen_agent_base.streaming."""
+
+import asyncio
+import time
+from contextvars import ContextVar
+
+import pytest
+
+from autogen_agent_base.streaming import EventLoopPool
+
+request_id: ContextVar[int | None] = ContextVar("request_id", default=None)
+
+
+async def numbers(n: int, produced: list | None = None):
+    for i in range(n):
+        await asyncio.sleep(0)
+        if produced is not None:
+            produced.append(i)
+        yield i
+
+
+def test_stream_keeps_order_and_completes() -> None:
+    pool = EventLoopPool(size=2, max_batch_size=8, max_buffered=16)
+
+    assert list(pool.stream(numbers(100))) == list(range(100))
+    assert list(pool.stream(numbers(0))) == []
+
+
+def test_stream_reraises_errors() -> None:
+    async def failing():
+        yield 1
+        raise ValueError("boom")
+
+    stream = EventLoopPool().stream(failing())
+
+    assert next(stream) == 1
+    with pytest.raises(ValueError, match="boom"):
+        next(stream)
+
+
+def test_stream_applies_backpressure() -> None:
+    produced = []
+    stream = EventLoopPool(max_batch_size=1, max_buffered=4).stream(
+        numbers(100, produced)
+    )
+
+    next(stream)
+    time.sleep(0.05)
+    # The producer stops once the queue is full
+    assert len(produced) <= 1 + 4 + 1
+
+    stream.close()
+
+
+def test_context_is_kept_for_the_whole_stream() -> None:
+    async def context_values():
+        request_id.set(1)
+        for _ in range(5):
+            await asyncio.sleep(0)
+            yield request_id.get()
+
+    assert list(EventLoopPool().stream(context_values())) == [1] * 5
+
+
+def test_submit_spreads_coroutines_across_loops() -> None:
+    pool = EventLoopPool(size=3)
+
+    async def running_loop():
+        return asyncio.get_running_loop()
+
+    loops = {pool.submit(running_loop()).result() for _ in range(6)}
+    assert loops == set(pool.loops)
+
+
+def test_each_loop_gets_its_own_state() -> None:
+    created = []
+
+    def initializer() -> object:
+        created.append(object())
+        return created[-1]
+
+    pool = EventLoopPool(size=3, initializer=initializer)
+
+    async def loop_and_state():
+        return asyncio.get_running_loop(), pool.get_loop_state()
+
+    states = dict(pool.submit(loop_and_state()).result() for _ in range(6))
+    assert len(created) == 3
+    assert set(states) == set(pool.loops)
+    assert set(map(id, states.values())) == set(map(id, created))
+
+
+def test_loop_state_requires_a_pool_loop() -> None:
+    pool = EventLoopPool()
+
+    async def loop_state():
+        return pool.get_loop_state()
+
+    with pytest.raises(RuntimeError, match="Not running on an event loop"):
+        asyncio.run(loop_state())
@@ -0,0 +1,102 @@
+"""Micro-benchmark of the graph construction strategies available in `ai_service.py`.
+
+Compares requests/sec of:
+- building a new graph on every request (`graph_cache_size = 0`),
+- reusing graphs from the compiled graph cache (`graph_cache_size > 0`),
+- a single graph with the system prompt passed in the graph state (`prompt_as_state = true`).
+
+The watsonx.ai chat model is replaced with a fake model answering instantly,
+so only the per-request graph overhead is measured and no credentials are needed.
+
+Usage:
+    python scripts/benchmark_prompt_as_state.py --requests 500 --prompts 4
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+# Add src directory to Python path to import the agent package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from langgraph_react_agent_base import agent  # noqa: E402
+
+
+class FakeChatModel(GenericFakeChatModel):
+    """Chat model answering every request with the same static message."""
+
+    def bind_tools(self, tools, **kwargs) -> "FakeChatModel":
+        return self
+
+
+def fake_chat_watsonx(**kwargs) -> FakeChatModel:
+    return FakeChatModel(messages=itertools.cycle([AIMessage(content="IBM")]))
+
+
+def run(request: Callable[[str], None], prompts: list[str], n_requests: int) -> float:
+    """Run `n_requests` requests cycling through `prompts` and return requests/sec."""
+    start = time.perf_counter()
+    for _, prompt in zip(range(n_requests), itertools.cycle(prompts)):
+        request(prompt)
+    return n_requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument(
+        "--prompts", type=int, default=4, help="Number of distinct system prompts"
+    )
+    args = parser.parse_args()
+
+    prompts = [
+        f"{agent.DEFAULT_SYSTEM_PROMPT} Conversation profile: {i}."
+        for i in range(args.prompts)
+    ]
+    messages = [HumanMessage(content="What is IBM watsonx.ai?")]
+
+    with mock.patch.object(agent, "ChatWatsonx", fake_chat_watsonx):
+        per_request_graph = agent.get_graph_closure(None, "", graph_cache_size=0)
+        cached_graph = agent.get_graph_closure(None, "", graph_cache_size=16)
+        shared_graph = agent.get_prompt_as_state_graph(None, "")
+
+    results = {
+        "per-request build": run(
+            lambda prompt: per_request_graph(SystemMessage(prompt)).invoke(
+                {"messages": messages}
+            ),
+            prompts,
+            args.requests,
+        ),
+        "graph cache": run(
+            lambda prompt: cached_graph(SystemMessage(prompt)).invoke(
+                {"messages": messages}
+            ),
+            prompts,
+            args.requests,
+        ),
+        "prompt as state": run(
+            lambda prompt: shared_graph.invoke(
+                {"messages": messages, "system_prompt": prompt}
+            ),
+            prompts,
+            args.requests,
+        ),
+    }
+
+    baseline = results["per-request build"]
+    print(f"{args.requests} requests, {args.prompts} distinct system prompts\n")
+    print(f"{'strategy':<20}{'requests/sec':>14}{'speedup':>10}")
+    for name, rps in results.items():
+        print(f"{name:<20}{rps:>14.1f}{rps / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
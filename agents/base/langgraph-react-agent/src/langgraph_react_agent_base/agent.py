@@ -1,28 +1,141 @@
-from typing import Callable
+import hashlib
+import json
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Hashable, NamedTuple
+
+from typing_extensions import NotRequired
 
 from ibm_watsonx_ai import APIClient
+from langchain_core.messages import BaseMessage, SystemMessage
 from langchain_ibm import ChatWatsonx
 from langgraph.prebuilt import create_react_agent
+from langgraph.prebuilt.chat_agent_executor import AgentState
 from langgraph.graph.state import CompiledStateGraph
 
 from langgraph_react_agent_base import TOOLS
 
+DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant, please respond to the user's query to the best of your ability!"
+
+
+class PromptAgentState(AgentState):
+    """ReAct agent state carrying the system prompt of the current request."""
+
+    system_prompt: NotRequired[str]
+
+
+class GraphCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class CompiledGraphCache:
+    """Bounded, thread-safe LRU cache of compiled graphs."""
+
+    def __init__(self, maxsize: int = 16) -> None:
+        self.maxsize = max(int(maxsize), 0)
+        self._graphs: OrderedDict[Hashable, CompiledStateGraph] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_create(
+        self, key: Hashable, factory: Callable[[], CompiledStateGraph]
+    ) -> CompiledStateGraph:
+        """Return the graph stored under `key`, compiling it with `factory` on a miss."""
+        with self._lock:
+            if (graph := self._graphs.get(key)) is not None:
+                self._graphs.move_to_end(key)
+                self._hits += 1
+                return graph
+            self._misses += 1
+
+        # Compile outside the lock, so that a slow build does not block cache hits
+        graph = factory()
+
+        if self.maxsize == 0:
+            return graph
+
+        with self._lock:
+            # Another thread might have compiled the same graph in the meantime
+            graph = self._graphs.setdefault(key, graph)
+            self._graphs.move_to_end(key)
+            while len(self._graphs) > self.maxsize:
+                self._graphs.popitem(last=False)
+
+        return graph
+
+    def cache_info(self) -> GraphCacheInfo:
+        with self._lock:
+            return GraphCacheInfo(
+                self._hits, self._misses, self.maxsize, len(self._graphs)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+            self._hits = 0
+            self._misses = 0
+
 
-def get_graph_closure(client: APIClient, model_id: str) -> Callable:
+def get_graph_closure(
+    client: APIClient, model_id: str, graph_cache_size: int = 16
+) -> Callable:
     """Graph generator closure."""
 
     # Initialise ChatWatsonx
-    chat = ChatWatsonx(
-        model_id=model_id, watsonx_client=client, params={"temperature": 0.01}
-    )
+    params = {"temperature": 0.01}
+    chat = ChatWatsonx(model_id=model_id, watsonx_client=client, params=params)
 
-    # Define system prompt
-    default_system_prompt = "You are a helpful AI assistant, please respond to the user's query to the best of your ability!"
+    # Compiled graphs are reused between requests sharing the same system prompt
+    graph_cache = CompiledGraphCache(maxsize=graph_cache_size)
+    tool_names = tuple(sorted(tool.name for tool in TOOLS))
+    model_params = json.dumps(params, sort_keys=True)
 
-    def get_graph(system_prompt=default_system_prompt) -> CompiledStateGraph:
+    def get_graph(system_prompt=DEFAULT_SYSTEM_PROMPT) -> CompiledStateGraph:
         """Get compiled graph with overwritten system prompt, if provided"""
 
+        # `create_react_agent` accepts either a prompt string or a SystemMessage
+        prompt_text = getattr(system_prompt, "content", system_prompt)
+        cache_key = (
+            hashlib.sha256(str(prompt_text).encode("utf-8")).hexdigest(),
+            tool_names,
+            model_id,
+            model_params,
+        )
+
         # Create instance of compiled graph
-        return create_react_agent(chat, tools=TOOLS, prompt=system_prompt)
+        return graph_cache.get_or_create(
+            cache_key,
+            lambda: create_react_agent(chat, tools=TOOLS, prompt=system_prompt),
+        )
+
+    get_graph.cache_info = graph_cache.cache_info
+    get_graph.cache_clear = graph_cache.clear
 
     return get_graph
+
+
+def get_prompt_as_state_graph(client: APIClient, model_id: str) -> CompiledStateGraph:
+    """Get a single compiled graph reading the system prompt from the graph state.
+
+    The system prompt is passed in the `system_prompt` key of the graph input
+    and falls back to the default system prompt when it is not provided.
+    """
+
+    # Initialise ChatWatsonx
+    chat = ChatWatsonx(
+        model_id=model_id, watsonx_client=client, params={"temperature": 0.01}
+    )
+
+    def prompt_from_state(state: PromptAgentState) -> list[BaseMessage]:
+        """Prepend the system prompt of the current request to the messages"""
+        system_prompt = state.get("system_prompt") or DEFAULT_SYSTEM_PROMPT
+        return [SystemMessage(content=system_prompt), *state["messages"]]
+
+    # Create instance of compiled graph
+    return create_react_agent(
+        chat, tools=TOOLS, prompt=prompt_from_state, state_schema=PromptAgentState
+    )
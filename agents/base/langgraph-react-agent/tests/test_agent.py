@@ -0,0 +1,68 @@
+import itertools
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from langgraph_react_agent_base import agent
+from langgraph_react_agent_base.agent import CompiledGraphCache
+
+
+class RecordingChatModel(GenericFakeChatModel):
+    received: list = []
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, *args, **kwargs):
+        self.received.append(messages)
+        return super()._generate(messages, *args, **kwargs)
+
+
+class TestCompiledGraphCache:
+    def test_graph_is_compiled_once_per_key(self):
+        cache = CompiledGraphCache(maxsize=2)
+        compiled = []
+
+        def factory():
+            compiled.append(object())
+            return compiled[-1]
+
+        first = cache.get_or_create("prompt", factory)
+        second = cache.get_or_create("prompt", factory)
+
+        assert first is second
+        assert len(compiled) == 1
+        assert cache.cache_info() == (1, 1, 2, 1)
+
+    def test_least_recently_used_graph_is_evicted(self):
+        cache = CompiledGraphCache(maxsize=2)
+
+        cache.get_or_create("a", object)
+        cache.get_or_create("b", object)
+        cache.get_or_create("a", object)
+        cache.get_or_create("c", object)
+
+        assert cache.cache_info().currsize == 2
+        cache.get_or_create("a", object)
+        assert cache.cache_info().hits == 2
+        cache.get_or_create("b", object)
+        assert cache.cache_info().misses == 4
+
+    def test_zero_size_disables_caching(self):
+        cache = CompiledGraphCache(maxsize=0)
+
+        assert cache.get_or_create("a", object) is not cache.get_or_create("a", object)
+        assert cache.cache_info().currsize == 0
+
+
+class TestPromptAsStateGraph:
+    def test_system_prompt_is_read_from_state(self, monkeypatch):
+        chat = RecordingChatModel(messages=itertools.cycle([AIMessage("IBM")]))
+        monkeypatch.setattr(agent, "ChatWatsonx", lambda **kwargs: chat)
+        graph = agent.get_prompt_as_state_graph(None, "")
+
+        graph.invoke({"messages": [HumanMessage("Hi")], "system_prompt": "Be brief"})
+        graph.invoke({"messages": [HumanMessage("Hi")]})
+
+        assert chat.received[0][0].content == "Be brief"
+        assert chat.received[1][0].content == agent.DEFAULT_SYSTEM_PROMPT
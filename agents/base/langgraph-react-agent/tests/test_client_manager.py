@@ -0,0 +1,136 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict
+
+from ibm_watsonx_ai.utils.auth import TokenAuth
+from langgraph.graph import END, START, StateGraph
+
+from langgraph_react_agent_base import client_manager
+from langgraph_react_agent_base.client_manager import APIClientManager
+
+
+class FakeAPIClient:
+    def __init__(self, credentials, space_id, **kwargs):
+        self.credentials = credentials
+        self.space_id = space_id
+        self.kwargs = kwargs
+        self.set_token_calls = []
+        self._auth_method = TokenAuth(credentials.token)
+
+    @property
+    def token(self):
+        return self._auth_method.get_token()
+
+    def set_token(self, token):
+        self.set_token_calls.append(token)
+        self._auth_method.set_token(token)
+
+
+def get_manager(monkeypatch, url="https://us-south.ml.cloud.ibm.com", **kwargs):
+    monkeypatch.setattr(client_manager, "APIClient", FakeAPIClient)
+    return APIClientManager(url=url, space_id="space", token="initial", **kwargs)
+
+
+class TestAPIClientManager:
+    def test_client_is_shared_and_token_swapped_only_on_change(self, monkeypatch):
+        manager = get_manager(monkeypatch)
+
+        assert manager.set_token("initial") is manager.client
+        assert manager.set_token("t2") is manager.client
+        assert manager.set_token("t2") is manager.client
+        assert manager.client.set_token_calls == ["t2"]
+        assert manager.client.token == "t2"
+
+    def test_instance_id_and_connection_pool(self, monkeypatch):
+        manager = get_manager(
+            monkeypatch, url="https://cpd.example.com", max_connections=5
+        )
+
+        assert manager.client.credentials.instance_id == "openshift"
+        assert manager.client.kwargs["httpx_client"].limits.max_connections == 5
+
+    def test_fallback_token_outside_of_requests(self, monkeypatch):
+        manager = get_manager(monkeypatch)
+        seen = []
+
+        thread = threading.Thread(target=lambda: manager.set_token("request"))
+        thread.start()
+        thread.join()
+        thread = threading.Thread(target=lambda: seen.append(manager.client.token))
+        thread.start()
+        thread.join()
+
+        assert seen == ["request"]
+
+
+class TestRequestTokenIsolation:
+    """Concurrent requests sharing one client must always use their own token."""
+
+    n_requests = 64
+
+    def test_threads(self, monkeypatch):
+        manager = get_manager(monkeypatch)
+        barrier = threading.Barrier(self.n_requests)
+
+        def request(i: int) -> list[str]:
+            client = manager.set_token(f"token-{i}")
+            barrier.wait()
+            seen = []
+            for _ in range(20):
+                time.sleep(random.random() / 1000)
+                seen.append(client.token)
+            return seen
+
+        with ThreadPoolExecutor(self.n_requests) as executor:
+            results = list(executor.map(request, range(self.n_requests)))
+
+        for i, seen in enumerate(results):
+            assert set(seen) == {f"token-{i}"}
+
+    def test_graph_nodes(self, monkeypatch):
+        manager = get_manager(monkeypatch)
+
+        class State(TypedDict):
+            tokens: list[str]
+
+        def node(state: State) -> dict:
+            time.sleep(random.random() / 100)
+            return {"tokens": state["tokens"] + [manager.client.token]}
+
+        builder = StateGraph(State)
+        builder.add_node("first", node)
+        builder.add_node("second", node)
+        builder.add_edge(START, "first")
+        builder.add_edge("first", "second")
+        builder.add_edge("second", END)
+        graph = builder.compile()
+
+        def request(i: int) -> list[str]:
+            manager.set_token(f"token-{i}")
+            return graph.invoke({"tokens": []})["tokens"]
+
+        with ThreadPoolExecutor(16) as executor:
+            results = list(executor.map(request, range(self.n_requests)))
+
+        for i, tokens in enumerate(results):
+            assert tokens == [f"token-{i}"] * 2
+
+    def test_asyncio_tasks(self, monkeypatch):
+        manager = get_manager(monkeypatch)
+
+        async def request(i: int) -> list[str]:
+            client = manager.set_token(f"token-{i}")
+            seen = []
+            for _ in range(20):
+                await asyncio.sleep(random.random() / 1000)
+                seen.append(await client._auth_method.aget_token())
+            return seen
+
+        async def main() -> list[list[str]]:
+            return await asyncio.gather(*(request(i) for i in range(self.n_requests)))
+
+        for i, seen in enumerate(asyncio.run(main())):
+            assert set(seen) == {f"token-{i}"}
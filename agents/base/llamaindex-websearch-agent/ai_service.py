@@ -1,12 +1,13 @@
-def deployable_ai_service(context, url=None, model_id=None):
+def deployable_ai_service(
+    context, url=None, model_id=None, max_tool_workers=8, tool_timeout=60
+):
     import asyncio
     import threading
     import json
-    import urllib
     from typing import Generator, AsyncGenerator
-    from ibm_watsonx_ai import APIClient, Credentials
     from llama_index.core.base.llms.types import ChatMessage
     from llama_index_workflow_agent_base.agent import get_workflow_closure
+    from llama_index_workflow_agent_base.client_manager import APIClientManager
     from llama_index_workflow_agent_base.workflow import (
         ToolCallEvent,
         StopEvent,
@@ -24,9 +25,18 @@ def deployable_ai_service(context, url=None, model_id=None):
         target=start_loop, args=(persistent_loop,), daemon=True
     ).start()  # We run a persistent loop in a separate daemon thread
 
-    hostname = urllib.parse.urlparse(url).hostname or ""
-    is_cloud_url = hostname.lower().endswith("cloud.ibm.com")
-    instance_id = None if is_cloud_url else "openshift"
+    # One API client, with pooled HTTP connections, is shared by all requests
+    client_manager = APIClientManager(
+        url=url,
+        space_id=context.get_space_id(),
+        token=context.generate_token(),
+    )
+    workflow = get_workflow_closure(
+        client_manager.client,
+        model_id,
+        max_tool_workers=max_tool_workers,
+        tool_timeout=tool_timeout,
+    )
 
     def get_formatted_message(resp: ChatMessage) -> dict | None:
         role = resp.role
@@ -180,26 +190,19 @@ def deployable_ai_service(context, url=None, model_id=None):
         }
         Please note that the `system message` MUST be placed first in the list of messages!
         """
-        client = APIClient(
-            credentials=Credentials(
-                url=url,
-                token=context.get_token(),
-                instance_id=instance_id,
-            ),
-            space_id=context.get_space_id(),
-        )
-        workflow = get_workflow_closure(client, model_id)
+        client_manager.set_token(context.get_token())
 
         payload = context.get_json()
         messages = payload.get("messages", [])
 
+        system_prompt = None
         if messages and messages[0]["role"] == "system":
-            agent = workflow(messages[0]["content"])
+            system_prompt = messages[0]["content"]
             del messages[0]
-        else:
-            agent = workflow()
 
-        return await agent.run(input=messages)
+        agent = workflow()
+
+        return await agent.run(input=messages, system_prompt=system_prompt)
 
     async def generate_async_stream(context) -> AsyncGenerator:
         """
@@ -223,15 +226,7 @@ def deployable_ai_service(context, url=None, model_id=None):
         }
         Please note that the `system message` MUST be placed first in the list of messages!
         """
-        client = APIClient(
-            credentials=Credentials(
-                url=url,
-                token=context.get_token(),
-                instance_id=instance_id,
-            ),
-            space_id=context.get_space_id(),
-        )
-        workflow = get_workflow_closure(client, model_id)
+        client_manager.set_token(context.get_token())
 
         payload = context.get_json()
         headers = context.get_headers()
@@ -239,13 +234,14 @@ def deployable_ai_service(context, url=None, model_id=None):
 
         messages = payload.get("messages", [])
 
+        system_prompt = None
         if messages and messages[0]["role"] == "system":
-            agent = workflow(messages[0]["content"])
+            system_prompt = messages[0]["content"]
             del messages[0]
-        else:
-            agent = workflow()
 
-        handler = agent.run(input=messages)
+        agent = workflow()
+
+        handler = agent.run(input=messages, system_prompt=system_prompt)
 
         async for ev in handler.stream_events():
             if (messages := get_formatted_message_stream(ev, is_assistant)) is not None:
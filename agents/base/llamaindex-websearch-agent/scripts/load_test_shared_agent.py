@@ -0,0 +1,137 @@
+"""Load test of the `FunctionCallingAgent` instantiation strategies.
+
+Compares the throughput, latency and memory retained per request of:
+- creating a new `FunctionCallingAgent` for every request (previous behaviour),
+- a single `FunctionCallingAgent` shared by all requests, keeping the state
+  of each run in its workflow `Context`,
+with requests sent concurrently on one event loop.
+
+The watsonx.ai LLM is replaced with a fake LLM calling the web search tool once and
+then answering, so only the agent overhead is measured and no credentials are needed.
+
+Usage:
+    python scripts/load_test_shared_agent.py --requests 200 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from statistics import mean, quantiles
+from types import SimpleNamespace
+from typing import Callable
+
+from llama_index.core.llms import ChatMessage, ChatResponse
+from llama_index.core.tools import ToolSelection
+
+# Add src directory to Python path to import the agent package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from llama_index_workflow_agent_base import TOOLS  # noqa: E402
+from llama_index_workflow_agent_base.workflow import FunctionCallingAgent  # noqa: E402
+
+
+class FakeFunctionCallingLLM:
+    """Calls the web search tool once, then answers with its result."""
+
+    metadata = SimpleNamespace(context_window=128_000)
+
+    async def achat_with_tools(self, tools, chat_history) -> ChatResponse:
+        if chat_history[-1].role == "user":
+            message = ChatMessage(role="assistant", additional_kwargs={"search": True})
+        else:
+            message = ChatMessage(role="assistant", content=chat_history[-1].content)
+        return ChatResponse(message=message)
+
+    def get_tool_calls_from_response(self, response, error_on_no_tool_call=False):
+        if not response.message.additional_kwargs.get("search"):
+            return []
+        return [
+            ToolSelection(
+                tool_id="call_0",
+                tool_name="dummy_web_search",
+                tool_kwargs={"input_data": "IBM"},
+            )
+        ]
+
+
+def new_agent_per_request(llm: FakeFunctionCallingLLM) -> Callable:
+    def get_agent() -> FunctionCallingAgent:
+        return FunctionCallingAgent(llm=llm, tools=TOOLS, timeout=120, verbose=False)
+
+    return get_agent
+
+
+def shared_agent(llm: FakeFunctionCallingLLM) -> Callable:
+    agent = FunctionCallingAgent(llm=llm, tools=TOOLS, timeout=120, verbose=False)
+    return lambda: agent
+
+
+async def load_test(
+    get_agent: Callable, n_requests: int, concurrency: int
+) -> list[float]:
+    """Send the requests and return their latencies."""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            agent = get_agent()
+            await agent.run(
+                input=[{"role": "user", "content": "Search IBM"}],
+                system_prompt="You are a helpful AI assistant.",
+            )
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(request() for _ in range(n_requests)))
+    return latencies
+
+
+def retained_per_request(get_agent: Callable, n_requests: int, concurrency: int) -> int:
+    """Return the number of bytes per request still held after the requests completed."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    asyncio.run(load_test(get_agent, n_requests, concurrency))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(
+        stat.size_diff
+        for stat in after.compare_to(before, "filename")
+        if stat.size_diff > 0
+    )
+    return retained // n_requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    llm = FakeFunctionCallingLLM()
+    strategies = {
+        "new agent per request": new_agent_per_request(llm),
+        "shared agent": shared_agent(llm),
+    }
+
+    # Warm up imports and caches, so they are not attributed to the first strategy
+    asyncio.run(load_test(shared_agent(llm), 5, 5))
+
+    print(f"{'strategy':<24}{'req/s':>8}{'mean ms':>10}{'p95 ms':>10}{'KiB/req':>10}")
+    for name, get_agent in strategies.items():
+        start = time.perf_counter()
+        latencies = asyncio.run(load_test(get_agent, args.requests, args.concurrency))
+        throughput = args.requests / (time.perf_counter() - start)
+        p95 = quantiles(latencies, n=20)[-1]
+        retained = retained_per_request(get_agent, args.requests, args.concurrency)
+        print(
+            f"{name:<24}{throughput:>8.1f}{mean(latencies) * 1000:>10.1f}"
+            f"{p95 * 1000:>10.1f}{retained / 1024:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
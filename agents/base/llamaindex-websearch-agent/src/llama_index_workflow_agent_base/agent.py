@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 
 from ibm_watsonx_ai import APIClient
@@ -7,25 +8,40 @@ from llama_index_workflow_agent_base import TOOLS
 from llama_index_workflow_agent_base.workflow import FunctionCallingAgent
 
 
-def get_workflow_closure(client: APIClient, model_id: str) -> Callable:
+def get_workflow_closure(
+    client: APIClient,
+    model_id: str,
+    max_tool_workers: int = 8,
+    tool_timeout: float | None = 60.0,
+) -> Callable:
     """Workflow generator closure."""
 
     # Initialise WatsonxLLM
     chat = WatsonxLLM(model_id=model_id, api_client=client)
 
+    # Bounded thread pool shared by the synchronous tools of all requests
+    tool_executor = ThreadPoolExecutor(
+        max_workers=max_tool_workers, thread_name_prefix="tool"
+    )
+
     # Define system prompt
     default_system_prompt = "You are a helpful AI assistant, please respond to the user's query to the best of your ability!"
 
-    def get_agent(system_prompt: str = default_system_prompt) -> FunctionCallingAgent:
-        """Get compiled workflow with overwritten system prompt, if provided"""
-
-        # Create instance of compiled workflow
-        return FunctionCallingAgent(
-            llm=chat,
-            tools=TOOLS,
-            system_prompt=system_prompt,
-            timeout=120,
-            verbose=False,
-        )
+    # Create a single instance of compiled workflow, it keeps the state of each run
+    # in the run context, so it is safe to share between concurrent requests
+    agent = FunctionCallingAgent(
+        llm=chat,
+        tools=TOOLS,
+        system_prompt=default_system_prompt,
+        tool_executor=tool_executor,
+        tool_timeout=tool_timeout,
+        timeout=120,
+        verbose=False,
+    )
+
+    def get_agent() -> FunctionCallingAgent:
+        """Get compiled workflow, the system prompt can be overwritten with the
+        `system_prompt` argument of its `run` method"""
+        return agent
 
     return get_agent
@@ -1,9 +1,14 @@
+import asyncio
+import contextvars
+import inspect
+from concurrent.futures import Executor
 from typing import Any, List
 
 from llama_index.core.llms.function_calling import FunctionCallingLLM
 from llama_index.core.memory import ChatMemoryBuffer
-from llama_index.core.tools import ToolSelection
-from llama_index.core.tools.types import BaseTool
+from llama_index.core.memory.chat_memory_buffer import DEFAULT_TOKEN_LIMIT_RATIO
+from llama_index.core.tools import FunctionTool, ToolOutput, ToolSelection
+from llama_index.core.tools.types import AsyncBaseTool, BaseTool
 from llama_index.core.llms import ChatMessage
 from llama_index.core.workflow import (
     Workflow,
@@ -23,33 +28,73 @@ class ToolCallEvent(Event):
     tool_calls: list[ToolSelection]
 
 
+def has_async_implementation(tool: BaseTool) -> bool:
+    """Check if the tool can be awaited without blocking the event loop."""
+    if isinstance(tool, FunctionTool):
+        return inspect.iscoroutinefunction(tool.real_fn)
+    return isinstance(tool, AsyncBaseTool)
+
+
 class FunctionCallingAgent(Workflow):
+    """Function calling agent running the tool calls of a single turn concurrently.
+
+    The agent keeps no per-run state: the chat memory and the tool sources of a run
+    are stored in the workflow `Context`, so a single instance can serve concurrent
+    runs. The system prompt can be overwritten per run, with the `system_prompt`
+    argument of `run`.
+
+    Tools with an async implementation are awaited on the event loop, the other ones
+    run in `tool_executor` (a bounded thread pool), so the turn takes as long as
+    the slowest tool call. Tool results keep the order of the tool calls.
+
+    Args:
+        llm: Function calling LLM.
+        tools: Tools available to the agent.
+        system_prompt: Default system prompt put at the beginning of the chat history.
+        tool_executor: Executor running the tools without async implementation,
+            the default executor of the event loop is used if None.
+        tool_timeout: Default number of seconds after which a tool call fails.
+        tool_timeouts: Number of seconds after which a tool call fails, per tool name.
+    """
+
     def __init__(
         self,
         *args: Any,
         llm: FunctionCallingLLM | None = None,
         tools: List[BaseTool] | None = None,
         system_prompt: str | None = None,
+        tool_executor: Executor | None = None,
+        tool_timeout: float | None = None,
+        tool_timeouts: dict[str, float] | None = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(*args, **kwargs)
         self.tools = tools or []
+        self.tool_executor = tool_executor
+        self.tool_timeout = tool_timeout
+        self.tool_timeouts = tool_timeouts or {}
 
         self.llm = llm
-        self.memory = ChatMemoryBuffer.from_defaults(llm=self.llm)
+        self.system_prompt = system_prompt
 
-        if system_prompt:
-            system_msg = ChatMessage(role="system", content=system_prompt)
-            self.memory.put(system_msg)
-
-        self.sources = []
+        # Read the model metadata once, instead of once per run
+        self.memory_token_limit = None
+        if llm is not None:
+            self.memory_token_limit = int(
+                llm.metadata.context_window * DEFAULT_TOKEN_LIMIT_RATIO
+            )
 
     @step
     async def prepare_chat_history(self, ctx: Context, ev: StartEvent) -> InputEvent:
 
         ctx.write_event_to_stream(ev)
 
-        self.sources = []
+        memory = ChatMemoryBuffer.from_defaults(token_limit=self.memory_token_limit)
+        await ctx.store.set("memory", memory)
+        await ctx.store.set("sources", [])
+
+        if system_prompt := ev.get("system_prompt") or self.system_prompt:
+            memory.put(ChatMessage(role="system", content=system_prompt))
 
         user_input_messages = ev.input
 
@@ -59,9 +104,9 @@ class FunctionCallingAgent(Workflow):
                 if isinstance(user_input["content"], list)
                 else user_input["content"]
             )  # Ensures compatibility with UI payloads, which may send content as a list of dictionaries containing 'type' and 'text' keys.
-            self.memory.put(ChatMessage(role=user_input["role"], content=content))
+            memory.put(ChatMessage(role=user_input["role"], content=content))
 
-        chat_history = self.memory.get()
+        chat_history = memory.get()
         return InputEvent(input=chat_history)
 
     @step
@@ -75,7 +120,8 @@ class FunctionCallingAgent(Workflow):
         response = await self.llm.achat_with_tools(
             self.tools, chat_history=chat_history
         )
-        self.memory.put(response.message)
+        memory = await ctx.store.get("memory")
+        memory.put(response.message)
 
         tool_calls = self.llm.get_tool_calls_from_response(
             response, error_on_no_tool_call=False
@@ -84,7 +130,13 @@ class FunctionCallingAgent(Workflow):
         chat_history.append(response.message)
 
         if not tool_calls:
-            return StopEvent(result={"response": response, "messages": chat_history})
+            return StopEvent(
+                result={
+                    "response": response,
+                    "messages": chat_history,
+                    "sources": await ctx.store.get("sources"),
+                }
+            )
         else:
             return ToolCallEvent(tool_calls=tool_calls)
 
@@ -96,45 +148,65 @@ class FunctionCallingAgent(Workflow):
         tool_calls = ev.tool_calls
         tools_by_name = {tool.metadata.get_name(): tool for tool in self.tools}
 
-        tool_msgs = []
-
-        for tool_call in tool_calls:
-            tool = tools_by_name.get(tool_call.tool_name)
-            additional_kwargs = {
-                "tool_call_id": tool_call.tool_id,
-                "name": tool.metadata.get_name(),
-            }
-            if not tool:
-                tool_msgs.append(
-                    ChatMessage(
-                        role="tool",
-                        content=f"Tool {tool_call.tool_name} does not exist",
-                        additional_kwargs=additional_kwargs,
-                    )
-                )
-                continue
-
-            try:
-                tool_output = tool(**tool_call.tool_kwargs)
-                self.sources.append(tool_output)
-                tool_msgs.append(
-                    ChatMessage(
-                        role="tool",
-                        content=tool_output.content,
-                        additional_kwargs=additional_kwargs,
-                    )
-                )
-            except Exception as e:
-                tool_msgs.append(
-                    ChatMessage(
-                        role="tool",
-                        content=f"Encountered error in tool call: {e}",
-                        additional_kwargs=additional_kwargs,
-                    )
-                )
-
-        for msg in tool_msgs:
-            self.memory.put(msg)
-
-        chat_history = self.memory.get()
+        results = await asyncio.gather(
+            *(
+                self._call_tool(tools_by_name.get(tool_call.tool_name), tool_call)
+                for tool_call in tool_calls
+            )
+        )
+
+        memory = await ctx.store.get("memory")
+        sources = await ctx.store.get("sources")
+        for msg, tool_output in results:
+            if tool_output is not None:
+                sources.append(tool_output)
+            memory.put(msg)
+
+        chat_history = memory.get()
         return InputEvent(input=chat_history)
+
+    async def _call_tool(
+        self, tool: BaseTool | None, tool_call: ToolSelection
+    ) -> tuple[ChatMessage, ToolOutput | None]:
+        additional_kwargs = {
+            "tool_call_id": tool_call.tool_id,
+            "name": tool_call.tool_name,
+        }
+        if not tool:
+            return ChatMessage(
+                role="tool",
+                content=f"Tool {tool_call.tool_name} does not exist",
+                additional_kwargs=additional_kwargs,
+            ), None
+
+        if has_async_implementation(tool):
+            tool_run = tool.acall(**tool_call.tool_kwargs)
+        else:
+            # Run in the thread pool with the context of the request, e.g. its token
+            context = contextvars.copy_context()
+            tool_run = asyncio.get_running_loop().run_in_executor(
+                self.tool_executor,
+                lambda: context.run(tool, **tool_call.tool_kwargs),
+            )
+
+        timeout = self.tool_timeouts.get(tool_call.tool_name, self.tool_timeout)
+        try:
+            tool_output: ToolOutput = await asyncio.wait_for(tool_run, timeout)
+        except asyncio.TimeoutError:
+            return ChatMessage(
+                role="tool",
+                content=f"Tool {tool_call.tool_name} timed out after {timeout} seconds",
+                additional_kwargs=additional_kwargs,
+            ), None
+        except Exception as e:
+            return ChatMessage(
+                role="tool",
+                content=f"Encountered error in tool call: {e}",
+                additional_kwargs=additional_kwargs,
+            ), None
+
+        return ChatMessage(
+            role="tool",
+            content=tool_output.content,
+            additional_kwargs=additional_kwargs,
+        ), tool_output
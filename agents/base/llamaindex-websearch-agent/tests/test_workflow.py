@@ -0,0 +1,148 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from llama_index.core.llms import ChatMessage, ChatResponse
+from llama_index.core.tools import FunctionTool, ToolSelection
+
+from llama_index_workflow_agent_base.workflow import FunctionCallingAgent
+
+
+def slow_search(query: str) -> str:
+    """Search which takes a while."""
+    time.sleep(0.2)
+    return f"search: {query}"
+
+
+async def async_lookup(query: str) -> str:
+    """Lookup with an async implementation."""
+    await asyncio.sleep(0.2)
+    return f"lookup: {query}"
+
+
+def failing_tool(query: str) -> str:
+    """Tool raising an error."""
+    raise ValueError("boom")
+
+
+class FakeFunctionCallingLLM:
+    """Calls the tools listed in the user message, then answers with their results."""
+
+    metadata = SimpleNamespace(context_window=4096)
+
+    async def achat_with_tools(self, tools, chat_history) -> ChatResponse:
+        await asyncio.sleep(0)
+        if chat_history[-1].role == "user" and chat_history[-1].content:
+            tool_names = chat_history[-1].content.split()
+            return ChatResponse(
+                message=ChatMessage(
+                    role="assistant", additional_kwargs={"tool_names": tool_names}
+                )
+            )
+
+        results = [msg.content for msg in chat_history if msg.role == "tool"]
+        system_prompt = chat_history[0].content
+        return ChatResponse(
+            message=ChatMessage(
+                role="assistant", content=" | ".join([system_prompt, *results])
+            )
+        )
+
+    def get_tool_calls_from_response(self, response, error_on_no_tool_call=False):
+        tool_names = response.message.additional_kwargs.get("tool_names", [])
+        return [
+            ToolSelection(
+                tool_id=f"call_{i}", tool_name=name, tool_kwargs={"query": "IBM"}
+            )
+            for i, name in enumerate(tool_names)
+        ]
+
+
+def get_agent(**kwargs) -> FunctionCallingAgent:
+    tools = [
+        FunctionTool.from_defaults(slow_search),
+        FunctionTool.from_defaults(async_lookup),
+        FunctionTool.from_defaults(failing_tool),
+    ]
+    return FunctionCallingAgent(
+        llm=FakeFunctionCallingLLM(), tools=tools, system_prompt="default", **kwargs
+    )
+
+
+async def run(agent: FunctionCallingAgent, query: str, **kwargs) -> dict:
+    return await agent.run(input=[{"role": "user", "content": query}], **kwargs)
+
+
+def tool_messages(result: dict) -> list[ChatMessage]:
+    return [msg for msg in result["messages"] if msg.role == "tool"]
+
+
+class TestToolCalls:
+    def test_tool_calls_run_concurrently_in_stable_order(self):
+        agent = get_agent()
+        names = ["slow_search", "async_lookup", "slow_search", "async_lookup"]
+
+        async def timed_run() -> tuple[dict, float]:
+            await run(agent, "")  # warm up
+            start = time.perf_counter()
+            result = await run(agent, " ".join(names))
+            return result, time.perf_counter() - start
+
+        result, elapsed = asyncio.run(timed_run())
+
+        # Sequential tool calls would take 0.8 seconds
+        assert elapsed < 0.4
+        messages = tool_messages(result)
+        assert [msg.additional_kwargs["tool_call_id"] for msg in messages] == [
+            f"call_{i}" for i in range(len(names))
+        ]
+        assert [msg.content for msg in messages] == [
+            "search: IBM",
+            "lookup: IBM",
+            "search: IBM",
+            "lookup: IBM",
+        ]
+        assert [source.tool_name for source in result["sources"]] == names
+
+    def test_tool_errors_and_timeouts_are_reported_to_the_model(self):
+        agent = get_agent(tool_timeouts={"async_lookup": 0.05})
+
+        result = asyncio.run(
+            run(agent, "async_lookup failing_tool missing_tool slow_search")
+        )
+
+        messages = tool_messages(result)
+        assert "timed out" in messages[0].content
+        assert messages[1].content == "Encountered error in tool call: boom"
+        assert messages[2].content == "Tool missing_tool does not exist"
+        assert messages[3].content == "search: IBM"
+        assert len(result["sources"]) == 1
+
+
+class TestSharedAgent:
+    def test_concurrent_runs_do_not_share_state(self):
+        agent = get_agent()
+        queries = ["slow_search", "async_lookup", "slow_search async_lookup", ""] * 5
+
+        async def main() -> list[dict]:
+            return await asyncio.gather(
+                *(
+                    run(agent, query, system_prompt=f"prompt {i}")
+                    for i, query in enumerate(queries)
+                )
+            )
+
+        for i, (query, result) in enumerate(zip(queries, asyncio.run(main()))):
+            expected_results = [
+                {"slow_search": "search: IBM", "async_lookup": "lookup: IBM"}[name]
+                for name in query.split()
+            ]
+            assert result["response"].message.content == " | ".join(
+                [f"prompt {i}", *expected_results]
+            )
+            assert len(result["sources"]) == len(expected_results)
+
+    def test_default_system_prompt(self):
+        result = asyncio.run(run(get_agent(), ""))
+
+        assert result["messages"][0].content == "default"
@@ -6,12 +6,23 @@ def deployable_ai_service(
     tool_config_projectId,
     tool_config_vectorIndexId,
     base_knowledge_description=None,
+    rag_prompt_cache_path=None,
+    rag_prompt_refresh_interval=None,
+    graph_cache_size=16,
+    retrieval_cache_max_size=10000,
+    retrieval_cache_ttl=3600,
+    retrieval_cache_embedding_model_id=None,
+    retrieval_cache_similarity_threshold=0.95,
+    retrieval_timeout=None,
 ):
-    import urllib
-    from typing import Generator
+    import asyncio
+    import threading
+    from typing import AsyncGenerator, Generator
 
+    from langgraph_agentic_rag.client_manager import APIClientManager
     from langgraph_agentic_rag.agent import get_graph_closure
-    from ibm_watsonx_ai import APIClient, Credentials
+    from langgraph_agentic_rag.prompts import PromptCache
+    from langgraph_agentic_rag.retrieval_cache import RetrievalCache
     from langchain_core.messages import (
         BaseMessage,
         HumanMessage,
@@ -19,18 +30,24 @@ def deployable_ai_service(
         SystemMessage,
     )
 
-    hostname = urllib.parse.urlparse(url).hostname or ""
-    is_cloud_url = hostname.lower().endswith("cloud.ibm.com")
-    instance_id = None if is_cloud_url else "openshift"
+    persistent_loop = asyncio.new_event_loop()  # Create a persistent event loop that will be used by generate and generate_stream
 
-    client = APIClient(
-        credentials=Credentials(
-            url=url,
-            token=context.generate_token(),
-            instance_id=instance_id,
-        ),
+    def start_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    # Graphs run on a persistent loop in a separate daemon thread, so the retriever
+    # tool runs natively async, with coalescing and timeouts, instead of blocking a
+    # worker thread for each RAGQuery call
+    threading.Thread(target=start_loop, args=(persistent_loop,), daemon=True).start()
+
+    # One API client, with pooled HTTP connections, is shared by all requests
+    client_manager = APIClientManager(
+        url=url,
         space_id=context.get_space_id(),
+        token=context.generate_token(),
     )
+    client = client_manager.client
 
     tool_config = {"vectorIndexId": tool_config_vectorIndexId}
 
@@ -50,11 +67,41 @@ def deployable_ai_service(
     else:
         tool_config["projectId"] = tool_config_projectId
 
+    # RAG prompt is read from the vendored (or cached) copy, optionally refreshed
+    # from LangSmith in the background
+    prompt_cache = PromptCache(
+        cache_path=rag_prompt_cache_path,
+        refresh_interval=rag_prompt_refresh_interval,
+    )
+
+    # Retrieved chunks are cached per vector index, near-duplicate queries are
+    # matched by embedding if an embedding model is set
+    retrieval_cache = None
+    if retrieval_cache_max_size:
+        embeddings = None
+        if retrieval_cache_embedding_model_id:
+            from langchain_ibm import WatsonxEmbeddings
+
+            embeddings = WatsonxEmbeddings(
+                model_id=retrieval_cache_embedding_model_id, watsonx_client=client
+            )
+
+        retrieval_cache = RetrievalCache(
+            max_size=retrieval_cache_max_size,
+            ttl=retrieval_cache_ttl,
+            embeddings=embeddings,
+            similarity_threshold=retrieval_cache_similarity_threshold,
+        )
+
     graph = get_graph_closure(
         client,
         model_id,
         tool_config=tool_config,
         base_knowledge_description=base_knowledge_description,
+        prompt_cache=prompt_cache,
+        graph_cache_size=graph_cache_size,
+        retrieval_cache=retrieval_cache,
+        retrieval_timeout=retrieval_timeout,
     )
 
     def get_formatted_message(
@@ -127,7 +174,7 @@ def deployable_ai_service(
         else:
             return HumanMessage(content=_dict["content"])
 
-    def generate(context) -> dict:
+    async def generate_async(context) -> dict:
         """
         The `generate` function handles the REST call to the inference endpoint
         POST /ml/v4/deployments/{id_or_name}/ai_service
@@ -150,7 +197,7 @@ def deployable_ai_service(
         Please note that the `system message` MUST be placed first in the list of messages!
         """
 
-        client.set_token(context.get_token())
+        client_manager.set_token(context.get_token())
 
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
@@ -163,7 +210,7 @@ def deployable_ai_service(
             agent = graph()
 
         # Invoke agent
-        generated_response = agent.invoke({"messages": messages})
+        generated_response = await agent.ainvoke({"messages": messages})
 
         choices = []
         execute_response = {
@@ -180,7 +227,7 @@ def deployable_ai_service(
 
         return execute_response
 
-    def generate_stream(context) -> Generator[dict, ..., ...]:
+    async def generate_async_stream(context) -> AsyncGenerator:
         """
         The `generate_stream` function handles the REST call to the Server-Sent Events (SSE) inference endpoint
         POST /ml/v4/deployments/{id_or_name}/ai_service_stream
@@ -205,7 +252,7 @@ def deployable_ai_service(
         headers = context.get_headers()
         is_assistant = headers.get("X-Ai-Interface") == "assistant"
 
-        client.set_token(context.get_token())
+        client_manager.set_token(context.get_token())
 
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
@@ -217,11 +264,11 @@ def deployable_ai_service(
         else:
             agent = graph()
 
-        response_stream = agent.stream(
+        response_stream = agent.astream(
             {"messages": messages}, stream_mode=["updates", "messages"]
         )
 
-        for chunk_type, data in response_stream:
+        async for chunk_type, data in response_stream:
             if chunk_type == "messages":
                 msg_obj = data[0]
             elif chunk_type == "updates":
@@ -252,4 +299,35 @@ def deployable_ai_service(
                 }
                 yield chunk_response
 
+    def generate(context) -> dict:
+        """
+        A synchronous wrapper for the asynchronous `generate_async` method.
+        """
+
+        future = asyncio.run_coroutine_threadsafe(
+            generate_async(context), persistent_loop
+        )
+        return future.result()
+
+    def generate_stream(context) -> Generator[dict, ..., ...]:
+        """
+        A synchronous wrapper for the asynchronous `generate_async_stream` method.
+        """
+
+        gen = generate_async_stream(context)
+
+        try:
+            while True:
+                try:
+                    future = asyncio.run_coroutine_threadsafe(
+                        gen.__anext__(), persistent_loop
+                    )
+                    value = future.result()
+                except StopAsyncIteration:
+                    break
+                yield value
+        finally:
+            # Stop the graph run, e.g. when the client disconnected
+            asyncio.run_coroutine_threadsafe(gen.aclose(), persistent_loop).result()
+
     return generate, generate_stream
@@ -0,0 +1,111 @@
+"""Micro-benchmark of the per-turn overhead removed by caching in `agent.py`.
+
+Measures, per request:
+- binding the tools to the chat model (tool JSON schema generation), previously
+  done on every agent node execution,
+- building and compiling the `StateGraph`, previously done on every request,
+  against a compiled graph cache hit,
+- a full agent turn with a compiled graph built per request vs. a cached one.
+
+The watsonx.ai chat model and the RAGQuery tool are replaced with local stand-ins
+(the stand-in formats the tools the way `ChatWatsonx.bind_tools` does), so only the
+agent overhead is measured and no credentials are needed.
+
+Usage:
+    python scripts/benchmark_graph_cache.py --iterations 500
+"""
+
+import argparse
+import itertools
+import sys
+import timeit
+from pathlib import Path
+from unittest import mock
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# Add src directory to Python path to import the agent package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from langgraph_agentic_rag import agent  # noqa: E402
+
+
+class ChatModelStandIn(GenericFakeChatModel):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(messages=itertools.cycle([AIMessage("IBM")]))
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools])
+
+
+def retriever_tool_stand_in(api_client, tool_config, **kwargs):
+    @tool("retriever", parse_docstring=True)
+    def retriever_tool(query: str) -> str:
+        """
+        Vector Store Index retriever tool.
+
+        Args:
+            query: User query related to information stored in Vector Index.
+
+        Returns:
+            Retrieved chunk.
+        """
+        return "IBM"
+
+    return retriever_tool
+
+
+def per_call_ms(statement, iterations: int) -> float:
+    return (
+        min(timeit.repeat(statement, number=iterations, repeat=3)) / iterations * 1000
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    with (
+        mock.patch.object(agent, "ChatWatsonx", ChatModelStandIn),
+        mock.patch.object(agent, "retriever_tool_watsonx", retriever_tool_stand_in),
+    ):
+        get_graph_per_request = agent.get_graph_closure(
+            None, "model", {}, graph_cache_size=0
+        )
+        get_graph_cached = agent.get_graph_closure(None, "model", {})
+
+    chat = ChatModelStandIn()
+    tools = [retriever_tool_stand_in(None, {})]
+    instruction = SystemMessage("Answer in one sentence.")
+    turn_input = {"messages": [HumanMessage("What is IBM?")]}
+
+    results = {
+        "bind_tools per agent node execution": per_call_ms(
+            lambda: chat.bind_tools(tools), args.iterations
+        ),
+        "get_graph, compiled per request": per_call_ms(
+            lambda: get_graph_per_request(instruction), args.iterations
+        ),
+        "get_graph, cached": per_call_ms(
+            lambda: get_graph_cached(instruction), args.iterations
+        ),
+        "agent turn, compiled per request": per_call_ms(
+            lambda: get_graph_per_request(instruction).invoke(turn_input),
+            args.iterations // 5,
+        ),
+        "agent turn, cached": per_call_ms(
+            lambda: get_graph_cached(instruction).invoke(turn_input),
+            args.iterations // 5,
+        ),
+    }
+
+    for name, ms in results.items():
+        print(f"{name:<40}{ms:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
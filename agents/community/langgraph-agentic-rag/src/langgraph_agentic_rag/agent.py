@@ -1,4 +1,7 @@
-from typing import Callable, Annotated, Sequence
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Annotated, Hashable, NamedTuple, Sequence
 
 from typing_extensions import TypedDict
 
@@ -13,9 +16,66 @@ from langgraph.prebuilt import ToolNode, tools_condition
 
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.messages import BaseMessage, SystemMessage, AIMessage
-from langsmith import Client as LangSmithClient
 
 from langgraph_agentic_rag import retriever_tool_watsonx
+from langgraph_agentic_rag.prompts import PromptCache
+from langgraph_agentic_rag.retrieval_cache import RetrievalCache
+
+
+class GraphCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class CompiledGraphCache:
+    """Bounded, thread-safe LRU cache of compiled graphs."""
+
+    def __init__(self, maxsize: int = 16) -> None:
+        self.maxsize = max(int(maxsize), 0)
+        self._graphs: OrderedDict[Hashable, CompiledStateGraph] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_create(
+        self, key: Hashable, factory: Callable[[], CompiledStateGraph]
+    ) -> CompiledStateGraph:
+        """Return the graph stored under `key`, compiling it with `factory` on a miss."""
+        with self._lock:
+            if (graph := self._graphs.get(key)) is not None:
+                self._graphs.move_to_end(key)
+                self._hits += 1
+                return graph
+            self._misses += 1
+
+        # Compile outside the lock, so that a slow build does not block cache hits
+        graph = factory()
+
+        if self.maxsize == 0:
+            return graph
+
+        with self._lock:
+            # Another thread might have compiled the same graph in the meantime
+            graph = self._graphs.setdefault(key, graph)
+            self._graphs.move_to_end(key)
+            while len(self._graphs) > self.maxsize:
+                self._graphs.popitem(last=False)
+
+        return graph
+
+    def cache_info(self) -> GraphCacheInfo:
+        with self._lock:
+            return GraphCacheInfo(
+                self._hits, self._misses, self.maxsize, len(self._graphs)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+            self._hits = 0
+            self._misses = 0
 
 
 def get_graph_closure(
@@ -23,8 +83,21 @@ def get_graph_closure(
     model_id: str,
     tool_config: dict,
     base_knowledge_description: str | None = None,
+    prompt_cache: PromptCache | None = None,
+    graph_cache_size: int = 16,
+    retrieval_cache: RetrievalCache | None = None,
+    retrieval_timeout: float | None = None,
 ) -> Callable:
-    """Graph generator closure."""
+    """Graph generator closure.
+
+    Graphs run with `ainvoke` or `astream` call the retriever tool natively async,
+    with concurrent identical queries coalesced and each call bounded by
+    `retrieval_timeout` seconds.
+    """
+
+    # RAG prompt is resolved once, without network access on the request path
+    if prompt_cache is None:
+        prompt_cache = PromptCache()
 
     # Initialise ChatWatsonx
     chat = ChatWatsonx(model_id=model_id, watsonx_client=client)
@@ -33,9 +106,14 @@ def get_graph_closure(
         retriever_tool_watsonx(
             api_client=client,
             tool_config=tool_config,
+            retrieval_cache=retrieval_cache,
+            retrieval_timeout=retrieval_timeout,
         )
     ]
 
+    # Tool JSON schemas are computed once, when the tools are bound
+    model = chat.bind_tools(TOOLS)
+
     # Define system prompt
     default_system_prompt = (
         f"You are a helpful AI assistant, please respond to the user's query to the best of your ability!"
@@ -53,6 +131,10 @@ def get_graph_closure(
     def agent_with_instruction(instruction_prompt: str | None) -> Callable:
         """System prompt will be updated by instruction prompt."""
 
+        system_prompt = SystemMessage(
+            default_system_prompt + "\n" + (instruction_prompt or "")
+        )
+
         def agent(state: AgentState) -> dict:
             """
             Invokes the agent model to generate a response based on the current state. Given
@@ -66,10 +148,6 @@ def get_graph_closure(
             """
             messages = state["messages"]
 
-            model = chat.bind_tools(TOOLS)
-            system_prompt = SystemMessage(
-                default_system_prompt + "\n" + (instruction_prompt or "")
-            )
             response = model.invoke([system_prompt] + list(messages))
             # We return a list, because this will get added to the existing list
             return {"messages": [response]}
@@ -96,10 +174,7 @@ def get_graph_closure(
         docs = last_message.content
 
         # Prompt
-        langsmith_client = LangSmithClient()
-        prompt = langsmith_client.pull_prompt(
-            "rlm/rag-prompt:50442af1", dangerously_pull_public_prompt=True
-        )
+        prompt = prompt_cache.get()
 
         # Chain
         rag_chain = prompt | chat | StrOutputParser()
@@ -108,18 +183,30 @@ def get_graph_closure(
         response = rag_chain.invoke({"context": docs, "question": question})
         return {"messages": [AIMessage(response)]}
 
+    # Compiled graphs are reused between requests sharing the same instruction prompt
+    graph_cache = CompiledGraphCache(maxsize=graph_cache_size)
+
     def get_graph(
         instruction_prompt: SystemMessage | None = None,
     ) -> CompiledStateGraph:
         """Get compiled graph with overwritten system prompt, if provided"""
 
+        instruction = None if instruction_prompt is None else instruction_prompt.content
+        cache_key = (
+            None
+            if instruction is None
+            else hashlib.sha256(str(instruction).encode("utf-8")).hexdigest()
+        )
+
+        return graph_cache.get_or_create(cache_key, lambda: build_graph(instruction))
+
+    def build_graph(instruction_prompt: str | None) -> CompiledStateGraph:
+        """Build and compile the graph for the instruction prompt"""
+
         # Define a new graph
         workflow = StateGraph(AgentState)
 
-        if instruction_prompt is None:
-            agent = agent_with_instruction(instruction_prompt)
-        else:
-            agent = agent_with_instruction(instruction_prompt.content)
+        agent = agent_with_instruction(instruction_prompt)
 
         # Define the nodes
         workflow.add_node("agent", agent)  # agent
@@ -151,4 +238,7 @@ def get_graph_closure(
 
         return graph
 
+    get_graph.cache_info = graph_cache.cache_info
+    get_graph.cache_clear = graph_cache.clear
+
     return get_graph
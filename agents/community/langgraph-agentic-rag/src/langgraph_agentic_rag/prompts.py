@@ -0,0 +1,118 @@
+import os
+import tempfile
+import threading
+from typing import Callable
+
+from langchain_core.load import dumps, loads
+from langchain_core.prompts import BasePromptTemplate, ChatPromptTemplate
+
+# LangSmith Hub prompt used to generate the answer from the retrieved context
+RAG_PROMPT_ID = "rlm/rag-prompt:50442af1"
+
+# Vendored copy of the RAG_PROMPT_ID prompt, used when no cached copy is available
+RAG_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "human",
+            "You are an assistant for question-answering tasks. "
+            "Use the following pieces of retrieved context to answer the question. "
+            "If you don't know the answer, just say that you don't know. "
+            "Use three sentences maximum and keep the answer concise.\n"
+            "Question: {question} \n"
+            "Context: {context} \n"
+            "Answer:",
+        )
+    ]
+)
+
+
+def langsmith_prompt_puller(prompt_id: str) -> BasePromptTemplate:
+    """Pull the prompt from LangSmith Hub."""
+    from langsmith import Client as LangSmithClient
+
+    return LangSmithClient().pull_prompt(prompt_id, dangerously_pull_public_prompt=True)
+
+
+class PromptCache:
+    """Prompt resolved once at startup, without network access.
+
+    The prompt is read from the on-disk copy at `cache_path`, if any, and falls back
+    to the vendored `fallback` prompt otherwise. If `refresh_interval` is set, the
+    prompt is pulled from LangSmith in a background thread every `refresh_interval`
+    seconds and saved to `cache_path`. Failed pulls are ignored, the current prompt
+    keeps being served.
+
+    Args:
+        prompt_id: ID of the prompt in LangSmith Hub.
+        fallback: Vendored copy of the prompt.
+        cache_path: Path of the on-disk copy of the prompt, not used if None.
+        refresh_interval: Number of seconds between background refreshes,
+            the prompt is never pulled if None.
+        pull_prompt: Function pulling the prompt for a given prompt id.
+    """
+
+    def __init__(
+        self,
+        prompt_id: str = RAG_PROMPT_ID,
+        fallback: BasePromptTemplate = RAG_PROMPT,
+        cache_path: str | None = None,
+        refresh_interval: float | None = None,
+        pull_prompt: Callable[[str], BasePromptTemplate] = langsmith_prompt_puller,
+    ) -> None:
+        self.prompt_id = prompt_id
+        self.cache_path = cache_path
+        self.refresh_interval = refresh_interval
+        self.pull_prompt = pull_prompt
+
+        self._prompt = self._load() or fallback
+        self._stop = threading.Event()
+
+        if refresh_interval:
+            threading.Thread(target=self._refresh_periodically, daemon=True).start()
+
+    def get(self) -> BasePromptTemplate:
+        """Get the current prompt."""
+        return self._prompt
+
+    def _load(self) -> BasePromptTemplate | None:
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path) as file:
+                return loads(file.read())
+        except Exception:
+            return None
+
+    def _save(self, prompt: BasePromptTemplate) -> None:
+        # Write to a temporary file first, so a crash never leaves a partial copy
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, delete=False, suffix=".tmp"
+        ) as file:
+            file.write(dumps(prompt))
+        os.replace(file.name, self.cache_path)
+
+    def refresh(self) -> bool:
+        """Pull the prompt from LangSmith, return whether it succeeded."""
+        try:
+            prompt = self.pull_prompt(self.prompt_id)
+        except Exception:
+            return False
+
+        self._prompt = prompt
+        if self.cache_path is not None:
+            try:
+                self._save(prompt)
+            except OSError:
+                pass
+        return True
+
+    def _refresh_periodically(self) -> None:
+        while True:
+            self.refresh()
+            if self._stop.wait(self.refresh_interval):
+                return
+
+    def close(self) -> None:
+        """Stop the background refresh."""
+        self._stop.set()
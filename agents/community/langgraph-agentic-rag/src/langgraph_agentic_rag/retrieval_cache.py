@@ -0,0 +1,260 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Awaitable, Callable, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+
+
+def normalize_query(query: str) -> str:
+    """Normalize case and whitespace of the query."""
+    return " ".join(query.lower().split())
+
+
+class _EmbeddingMatrix:
+    """Unit embeddings of cached queries, stored in the rows of a preallocated matrix.
+
+    Adding or removing an embedding updates a single row, the matrix doubles in size
+    when full. Rows of removed embeddings are zeroed and reused.
+    """
+
+    def __init__(self, initial_rows: int = 64) -> None:
+        self.initial_rows = initial_rows
+        self.matrix: np.ndarray | None = None
+        self.size = 0
+        self._keys: list[Any] = []
+        self._rows: dict[Any, int] = {}
+        self._free_rows: list[int] = []
+
+    def add(self, key: Any, embedding: np.ndarray) -> None:
+        if self.matrix is None:
+            self.matrix = np.zeros((self.initial_rows, len(embedding)), np.float32)
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._keys[row] = key
+        else:
+            row = self.size
+            if row == len(self.matrix):
+                # Earlier snapshots keep the previous matrix
+                self.matrix = np.concatenate([self.matrix, np.zeros_like(self.matrix)])
+            self._keys.append(key)
+            self.size += 1
+
+        self.matrix[row] = embedding
+        self._rows[key] = row
+
+    def remove(self, key: Any) -> None:
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self.matrix[row] = 0.0
+            self._keys[row] = None
+            self._free_rows.append(row)
+
+    def key(self, row: int) -> Any | None:
+        """Get the key of the embedding in the row, None if the row is not in use."""
+        return self._keys[row] if row < self.size else None
+
+    def snapshot(self) -> np.ndarray | None:
+        """Get the rows in use, to be multiplied outside of the cache lock."""
+        if not self._rows:
+            return None
+        return self.matrix[: self.size]
+
+
+@dataclass
+class _CachedRetrieval:
+    result: str
+    expires_at: float
+    embedding: np.ndarray | None = None
+
+
+class RetrievalCache:
+    """Bounded in-memory LRU cache of retrieval results, with TTL.
+
+    Results are namespaced, e.g. by vector index ID, and keyed by the normalized
+    query text. If `embeddings` is provided, a query missing from the cache is also
+    looked up by embedding: the result of a cached query of the same namespace whose
+    embedding has a cosine similarity of at least `similarity_threshold` is returned.
+
+    Any object with the same `get_or_retrieve` and `aget_or_retrieve` methods can be
+    used instead, e.g. to share the cache between replicas.
+
+    Args:
+        max_size: Maximum number of cached results, the least recently used are evicted.
+        ttl: Number of seconds after which a cached result expires.
+        embeddings: Embedding model used for the similarity lookup, disabled if None.
+        similarity_threshold: Minimum cosine similarity of near-duplicate queries.
+        clock: Monotonic clock used to measure the age of cached results.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 3600.0,
+        embeddings: "Embeddings | None" = None,
+        similarity_threshold: float = 0.95,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self.clock = clock
+
+        self._results: OrderedDict[tuple[str, str], _CachedRetrieval] = OrderedDict()
+        # Embeddings of the cached queries of each namespace, updated with each change
+        self._embeddings: dict[str, _EmbeddingMatrix] = {}
+        self._stats = {
+            "hits": 0,
+            "similarity_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+        self._lock = Lock()
+
+    def get_or_retrieve(
+        self, namespace: str, query: str, retrieve: Callable[[str], str]
+    ) -> str:
+        """Get the cached result of the query, calling `retrieve` on a miss."""
+        key = (namespace, normalize_query(query))
+        with self._lock:
+            if (cached := self._get(key)) is not None:
+                self._stats["hits"] += 1
+                return cached.result
+
+        embedding = None
+        if self.embeddings is not None:
+            embedding = self._unit(self.embeddings.embed_query(key[1]))
+            if (cached := self._get_similar(namespace, embedding)) is not None:
+                return cached.result
+
+        with self._lock:
+            self._stats["misses"] += 1
+
+        result = retrieve(query)
+        if self.max_size > 0:
+            with self._lock:
+                self._put(key, result, embedding)
+        return result
+
+    async def aget_or_retrieve(
+        self,
+        namespace: str,
+        query: str,
+        aretrieve: Callable[[str], Awaitable[str]],
+    ) -> str:
+        """Get the cached result of the query, awaiting `aretrieve` on a miss."""
+        key = (namespace, normalize_query(query))
+        with self._lock:
+            if (cached := self._get(key)) is not None:
+                self._stats["hits"] += 1
+                return cached.result
+
+        embedding = None
+        if self.embeddings is not None:
+            embedding = self._unit(await self.embeddings.aembed_query(key[1]))
+            if (cached := self._get_similar(namespace, embedding)) is not None:
+                return cached.result
+
+        with self._lock:
+            self._stats["misses"] += 1
+
+        result = await aretrieve(query)
+        if self.max_size > 0:
+            with self._lock:
+                self._put(key, result, embedding)
+        return result
+
+    def _get(self, key: tuple[str, str]) -> _CachedRetrieval | None:
+        cached = self._results.get(key)
+        if cached is None:
+            return None
+        if self.clock() >= cached.expires_at:
+            self._remove(key)
+            self._stats["expirations"] += 1
+            return None
+
+        self._results.move_to_end(key)
+        return cached
+
+    def _get_similar(
+        self, namespace: str, embedding: np.ndarray
+    ) -> _CachedRetrieval | None:
+        with self._lock:
+            matrix = None
+            if namespace in self._embeddings:
+                matrix = self._embeddings[namespace].snapshot()
+        if matrix is None:
+            return None
+
+        # The similarities are computed outside the lock, which is also taken on the
+        # event loop by `aget_or_retrieve`. The best match is checked again under the
+        # lock, as its row may have been reused meanwhile
+        best = int((matrix @ embedding).argmax())
+        with self._lock:
+            if (embeddings := self._embeddings.get(namespace)) is None:
+                return None
+            key = embeddings.key(best)
+            cached = self._results.get(key)
+            if (
+                cached is None
+                or cached.embedding is None
+                or float(cached.embedding @ embedding) < self.similarity_threshold
+                or (cached := self._get(key)) is None
+            ):
+                return None
+
+            self._stats["similarity_hits"] += 1
+            return cached
+
+    def _put(
+        self, key: tuple[str, str], result: str, embedding: np.ndarray | None
+    ) -> None:
+        self._remove(key)
+        self._results[key] = _CachedRetrieval(
+            result=result, expires_at=self.clock() + self.ttl, embedding=embedding
+        )
+        if embedding is not None:
+            self._embeddings.setdefault(key[0], _EmbeddingMatrix()).add(key, embedding)
+
+        while len(self._results) > self.max_size:
+            self._remove(next(iter(self._results)))
+            self._stats["evictions"] += 1
+
+    @staticmethod
+    def _unit(embedding: list[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        cached = self._results.pop(key, None)
+        if cached is not None and cached.embedding is not None:
+            self._embeddings[key[0]].remove(key)
+
+    def invalidate(self, namespace: str | None = None) -> None:
+        """Drop the cached results of the namespace, or all cached results."""
+        with self._lock:
+            for key in list(self._results):
+                if namespace is None or key[0] == namespace:
+                    self._remove(key)
+            if namespace is None:
+                self._embeddings.clear()
+            else:
+                self._embeddings.pop(namespace, None)
+
+    def stats(self) -> dict:
+        """Get the number of cached results, hits, misses, evictions and the hit ratio."""
+        with self._lock:
+            hits = self._stats["hits"] + self._stats["similarity_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                "size": len(self._results),
+                **self._stats,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+            }
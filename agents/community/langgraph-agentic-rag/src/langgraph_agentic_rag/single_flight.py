@@ -0,0 +1,59 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent identical async calls into a single in-flight call.
+
+    The first caller of a key starts the call in a task, callers of the same key
+    arriving before it completes await that task instead of starting their own.
+    A caller timing out or being cancelled only stops waiting, the call is cancelled
+    once no caller is waiting for it anymore.
+    """
+
+    def __init__(self) -> None:
+        # In-flight calls and their number of waiting callers, per event loop
+        self._calls: dict[tuple[int, Hashable], tuple[asyncio.Task, list[int]]] = {}
+        self._coalesced = 0
+
+    async def run(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Any]],
+        timeout: float | None = None,
+    ) -> Any:
+        """Await the in-flight call of the key, or start it with `call`.
+
+        Raises:
+            TimeoutError: If the call does not complete within `timeout` seconds.
+        """
+        # Tasks are bound to their event loop, so calls are not shared across loops
+        flight_key = (id(asyncio.get_running_loop()), key)
+
+        if flight_key in self._calls:
+            task, waiters = self._calls[flight_key]
+            self._coalesced += 1
+        else:
+            task = asyncio.ensure_future(call())
+            waiters = [0]
+            self._calls[flight_key] = task, waiters
+            task.add_done_callback(lambda _: self._forget(flight_key, task))
+
+        waiters[0] += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        finally:
+            waiters[0] -= 1
+            if waiters[0] == 0 and not task.done():
+                task.cancel()
+
+    def _forget(self, flight_key: tuple[int, Hashable], task: asyncio.Task) -> None:
+        if self._calls.get(flight_key, (None,))[0] is task:
+            del self._calls[flight_key]
+        # Retrieve the exception of calls nobody waits for, so it is not logged
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """Get the number of in-flight and coalesced calls."""
+        return {"in_flight": len(self._calls), "coalesced": self._coalesced}
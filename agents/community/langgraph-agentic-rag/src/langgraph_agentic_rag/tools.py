@@ -1,14 +1,70 @@
+import asyncio
 from typing import Callable, TYPE_CHECKING
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
+
+from langgraph_agentic_rag.retrieval_cache import normalize_query
+from langgraph_agentic_rag.single_flight import SingleFlight
 
 if TYPE_CHECKING:
     from ibm_watsonx_ai import APIClient
+    from langchain_ibm.agent_toolkits.utility import WatsonxTool
+    from langgraph_agentic_rag.retrieval_cache import RetrievalCache
+
+# Private helpers of ibm-watsonx-ai 1.5 used to run tools with the async HTTP client
+_ASYNC_RUN_CLIENT_ATTRIBUTES = (
+    "async_httpx_client",
+    "_href_definitions",
+    "_aget_headers",
+)
+_ASYNC_RUN_TOOL_ATTRIBUTES = ("_validate_tool_input", "_handle_response")
+
+
+def _supports_async_run(api_client: "APIClient", watsonx_tool: "WatsonxTool") -> bool:
+    """Whether `arun_watsonx_tool` can call the tools endpoint with the SDK helpers."""
+    from ibm_watsonx_ai.foundation_models.utils import Tool
+
+    sdk_tool = getattr(watsonx_tool, "_watsonx_tool", None)
+    # Subclasses, e.g. the SDK implementation of RAGQuery, do not call the endpoint
+    return (
+        type(sdk_tool) is Tool
+        and all(hasattr(api_client, name) for name in _ASYNC_RUN_CLIENT_ATTRIBUTES)
+        and all(hasattr(sdk_tool, name) for name in _ASYNC_RUN_TOOL_ATTRIBUTES)
+    )
+
+
+async def arun_watsonx_tool(
+    api_client: "APIClient", watsonx_tool: "WatsonxTool", input: str
+) -> dict:
+    """Run the utility agent tool with the async HTTP client of the API client.
+
+    Sends the same request as `ibm_watsonx_ai.foundation_models.utils.Tool.run`,
+    which only has a sync implementation. If the SDK does not provide the private
+    helpers this relies on, the sync tool is run in a worker thread instead.
+    """
+    if not _supports_async_run(api_client, watsonx_tool):
+        return await asyncio.to_thread(watsonx_tool.invoke, {"input": input})
+
+    sdk_tool = watsonx_tool._watsonx_tool
+    sdk_tool._validate_tool_input(input)
+
+    payload = {"input": input, "tool_name": watsonx_tool.name}
+    if watsonx_tool.tool_config and watsonx_tool.tool_config_schema:
+        payload["config"] = watsonx_tool.tool_config
+
+    response = await api_client.async_httpx_client.post(
+        url=api_client._href_definitions.get_utility_agent_tools_run_href(),
+        json=payload,
+        headers=await api_client._aget_headers(),
+    )
+    return sdk_tool._handle_response(200, "run tool", response)
 
 
 def retriever_tool_watsonx(
     api_client: "APIClient",
     tool_config: dict,
+    retrieval_cache: "RetrievalCache | None" = None,
+    retrieval_timeout: float | None = None,
 ) -> Callable:
     from langchain_ibm.agent_toolkits.utility import WatsonxToolkit
 
@@ -17,7 +73,18 @@ def retriever_tool_watsonx(
     rag_tool = toolkit.get_tool("RAGQuery")
     rag_tool.set_tool_config(tool_config)
 
-    @tool("retriever", parse_docstring=True)
+    def retrieve(query: str) -> str:
+        return rag_tool.invoke({"input": query})["output"]
+
+    async def aretrieve(query: str) -> str:
+        return (await arun_watsonx_tool(api_client, rag_tool, query))["output"]
+
+    # Results are cached per vector index, so indexes never share cached chunks
+    namespace = tool_config.get("vectorIndexId", "")
+
+    # Concurrent identical queries share a single RAGQuery call
+    single_flight = SingleFlight()
+
     def retriever_tool(query: str) -> str:
         """
         Vector Store Index retriever tool.
@@ -28,6 +95,23 @@ def retriever_tool_watsonx(
         Returns:
             Retrieved chunk.
         """
-        return rag_tool.invoke({"input": query})["output"]
+        if retrieval_cache is None:
+            return retrieve(query)
+        return retrieval_cache.get_or_retrieve(namespace, query, retrieve)
+
+    async def aretriever_tool(query: str) -> str:
+        async def call() -> str:
+            if retrieval_cache is None:
+                return await aretrieve(query)
+            return await retrieval_cache.aget_or_retrieve(namespace, query, aretrieve)
+
+        return await single_flight.run(
+            (namespace, normalize_query(query)), call, timeout=retrieval_timeout
+        )
 
-    return retriever_tool
+    return StructuredTool.from_function(
+        func=retriever_tool,
+        coroutine=aretriever_tool,
+        name="retriever",
+        parse_docstring=True,
+    )
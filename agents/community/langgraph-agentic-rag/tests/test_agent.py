@@ -0,0 +1,89 @@
+import itertools
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.tools import tool
+
+from langgraph_agentic_rag import agent
+
+
+# Messages received by, and tools bound to, the chat models
+received = []
+bound_tools = []
+
+
+class RecordingChatModel(GenericFakeChatModel):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(messages=itertools.cycle([AIMessage("IBM")]))
+
+    def bind_tools(self, tools, **kwargs):
+        bound_tools.append(tools)
+        return self
+
+    def _generate(self, messages, *args, **kwargs):
+        received.append(messages)
+        return super()._generate(messages, *args, **kwargs)
+
+
+def fake_retriever_tool(api_client, tool_config, **kwargs):
+    @tool
+    def retriever(query: str) -> str:
+        """Vector Store Index retriever tool."""
+        return "IBM"
+
+    return retriever
+
+
+def get_graph_closure(monkeypatch, **kwargs):
+    received.clear()
+    bound_tools.clear()
+    monkeypatch.setattr(agent, "ChatWatsonx", RecordingChatModel)
+    monkeypatch.setattr(agent, "retriever_tool_watsonx", fake_retriever_tool)
+    return agent.get_graph_closure(None, "model", {}, **kwargs)
+
+
+class TestGraphCache:
+    def test_graph_is_compiled_once_per_instruction_prompt(self, monkeypatch):
+        get_graph = get_graph_closure(monkeypatch)
+
+        first = get_graph(SystemMessage("Be brief."))
+        second = get_graph(SystemMessage("Be brief."))
+        other = get_graph(SystemMessage("Be detailed."))
+
+        assert first is second
+        assert other is not first
+        assert get_graph() is get_graph()
+        assert get_graph.cache_info() == (2, 3, 16, 3)
+
+    def test_tools_are_bound_once(self, monkeypatch):
+        get_graph = get_graph_closure(monkeypatch)
+
+        for instruction in ["Be brief.", "Be detailed.", "Be brief."]:
+            get_graph(SystemMessage(instruction)).invoke(
+                {"messages": [HumanMessage("What is IBM?")]}
+            )
+
+        assert len(bound_tools) == 1
+        assert len(received) == 3
+
+    def test_instruction_prompt_is_appended_to_system_prompt(self, monkeypatch):
+        get_graph = get_graph_closure(monkeypatch, base_knowledge_description="IBM")
+
+        get_graph(SystemMessage("Be brief.")).invoke(
+            {"messages": [HumanMessage("What is IBM?")]}
+        )
+        get_graph().invoke({"messages": [HumanMessage("What is IBM?")]})
+
+        brief, default = (messages[0] for messages in received)
+        assert brief.content.endswith(
+            "Vector Store Index knowledge description: IBM\nBe brief."
+        )
+        assert default.content.endswith(
+            "Vector Store Index knowledge description: IBM\n"
+        )
+
+    def test_zero_size_disables_caching(self, monkeypatch):
+        get_graph = get_graph_closure(monkeypatch, graph_cache_size=0)
+
+        assert get_graph() is not get_graph()
+        assert get_graph.cache_info().currsize == 0
@@ -0,0 +1,70 @@
+import time
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from langgraph_agentic_rag.prompts import RAG_PROMPT, PromptCache
+
+
+def pulled_prompt(prompt_id: str) -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages(
+        [("human", f"Pulled {prompt_id}: {{question}} {{context}}")]
+    )
+
+
+def failing_pull(prompt_id: str) -> ChatPromptTemplate:
+    raise ConnectionError("No network")
+
+
+class TestPromptCache:
+    def test_vendored_prompt_without_network(self):
+        prompt_cache = PromptCache(pull_prompt=failing_pull)
+
+        assert prompt_cache.get() is RAG_PROMPT
+        messages = prompt_cache.get().format_messages(question="Q?", context="C.")
+        assert "Question: Q?" in messages[0].content
+        assert "Context: C." in messages[0].content
+
+    def test_refresh_saves_prompt_to_disk(self, tmp_path):
+        cache_path = str(tmp_path / "prompt.json")
+        prompt_cache = PromptCache(cache_path=cache_path, pull_prompt=pulled_prompt)
+
+        assert prompt_cache.refresh()
+        assert prompt_cache.get() == pulled_prompt(prompt_cache.prompt_id)
+
+        # A new deployment reads the on-disk copy, without pulling
+        restarted = PromptCache(cache_path=cache_path, pull_prompt=failing_pull)
+        assert restarted.get() == pulled_prompt(prompt_cache.prompt_id)
+
+    def test_failed_refresh_keeps_current_prompt(self, tmp_path):
+        cache_path = str(tmp_path / "prompt.json")
+        prompt_cache = PromptCache(cache_path=cache_path, pull_prompt=failing_pull)
+
+        assert not prompt_cache.refresh()
+        assert prompt_cache.get() is RAG_PROMPT
+        assert not (tmp_path / "prompt.json").exists()
+
+    def test_corrupted_disk_copy_falls_back_to_vendored_prompt(self, tmp_path):
+        cache_path = tmp_path / "prompt.json"
+        cache_path.write_text("{not json")
+
+        prompt_cache = PromptCache(cache_path=str(cache_path), pull_prompt=failing_pull)
+
+        assert prompt_cache.get() is RAG_PROMPT
+
+    def test_background_refresh(self, tmp_path):
+        pulls = []
+
+        def pull_prompt(prompt_id: str) -> ChatPromptTemplate:
+            pulls.append(prompt_id)
+            return pulled_prompt(prompt_id)
+
+        prompt_cache = PromptCache(refresh_interval=0.01, pull_prompt=pull_prompt)
+        try:
+            deadline = time.monotonic() + 5
+            while len(pulls) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            prompt_cache.close()
+
+        assert len(pulls) >= 2
+        assert prompt_cache.get() == pulled_prompt(prompt_cache.prompt_id)
@@ -0,0 +1,130 @@
+import asyncio
+
+from langchain_core.embeddings import Embeddings
+
+from langgraph_agentic_rag.retrieval_cache import RetrievalCache
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds texts by the keywords they contain."""
+
+    keywords = ["ibm", "founded", "headquarters", "revenue"]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [float(keyword in text) for keyword in self.keywords]
+
+
+class Retriever:
+    def __init__(self) -> None:
+        self.queries = []
+
+    def __call__(self, query: str) -> str:
+        self.queries.append(query)
+        return f"Chunks for {query}"
+
+
+class TestRetrievalCache:
+    def test_normalized_query_is_retrieved_once(self):
+        cache = RetrievalCache()
+        retrieve = Retriever()
+
+        first = cache.get_or_retrieve("index", "When was IBM founded?", retrieve)
+        second = cache.get_or_retrieve("index", "  when was ibm   FOUNDED? ", retrieve)
+
+        assert first == second == "Chunks for When was IBM founded?"
+        assert retrieve.queries == ["When was IBM founded?"]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    def test_namespaces_are_isolated(self):
+        cache = RetrievalCache(embeddings=KeywordEmbeddings())
+        retrieve = Retriever()
+
+        cache.get_or_retrieve("index-1", "When was IBM founded?", retrieve)
+        cache.get_or_retrieve("index-2", "When was IBM founded?", retrieve)
+
+        assert len(retrieve.queries) == 2
+
+        cache.invalidate("index-1")
+        cache.get_or_retrieve("index-1", "When was IBM founded?", retrieve)
+        cache.get_or_retrieve("index-2", "When was IBM founded?", retrieve)
+
+        assert len(retrieve.queries) == 3
+
+    def test_similar_query_hits_cache(self):
+        cache = RetrievalCache(embeddings=KeywordEmbeddings())
+        retrieve = Retriever()
+
+        cache.get_or_retrieve("index", "When was IBM founded?", retrieve)
+        similar = cache.get_or_retrieve("index", "IBM was founded when?", retrieve)
+        other = cache.get_or_retrieve("index", "IBM revenue", retrieve)
+
+        assert similar == "Chunks for When was IBM founded?"
+        assert other == "Chunks for IBM revenue"
+        assert cache.stats()["similarity_hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+    def test_expired_and_evicted_results_are_retrieved_again(self, clock):
+        cache = RetrievalCache(max_size=2, ttl=10, clock=clock)
+        retrieve = Retriever()
+
+        for query in ["a", "b", "a", "c"]:
+            cache.get_or_retrieve("index", query, retrieve)
+        # "b" was the least recently used
+        cache.get_or_retrieve("index", "b", retrieve)
+
+        clock.now = 10
+        cache.get_or_retrieve("index", "b", retrieve)
+
+        assert retrieve.queries == ["a", "b", "c", "b", "b"]
+        stats = cache.stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 2
+        assert stats["expirations"] == 1
+
+    def test_evicted_queries_are_not_similarity_hits(self):
+        cache = RetrievalCache(max_size=2, embeddings=KeywordEmbeddings())
+        retrieve = Retriever()
+
+        for query in ["ibm", "founded", "headquarters", "revenue"]:
+            cache.get_or_retrieve("index", query, retrieve)
+        similar = cache.get_or_retrieve("index", "revenue?", retrieve)
+        evicted = cache.get_or_retrieve("index", "ibm?", retrieve)
+
+        assert similar == "Chunks for revenue"
+        assert evicted == "Chunks for ibm?"
+        assert cache.stats()["similarity_hits"] == 1
+        assert cache.stats()["evictions"] == 3
+
+    def test_zero_size_disables_caching(self):
+        cache = RetrievalCache(max_size=0)
+        retrieve = Retriever()
+
+        cache.get_or_retrieve("index", "a", retrieve)
+        cache.get_or_retrieve("index", "a", retrieve)
+
+        assert retrieve.queries == ["a", "a"]
+        assert cache.stats()["size"] == 0
+
+    def test_async_retrieval(self):
+        cache = RetrievalCache(embeddings=KeywordEmbeddings())
+        retrieve = Retriever()
+
+        async def aretrieve(query: str) -> str:
+            return retrieve(query)
+
+        async def main():
+            return [
+                await cache.aget_or_retrieve("index", query, aretrieve)
+                for query in ["When was IBM founded?", "IBM was founded when?"]
+            ]
+
+        first, similar = asyncio.run(main())
+
+        assert first == similar == "Chunks for When was IBM founded?"
+        assert retrieve.queries == ["When was IBM founded?"]
+        assert cache.stats()["similarity_hits"] == 1
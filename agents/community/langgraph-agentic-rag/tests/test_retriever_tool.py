@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any, Callable
+
+import httpx
+import pytest
+from ibm_watsonx_ai import APIClient, Credentials
+from ibm_watsonx_ai.wml_client_error import WMLClientError
+from langchain_ibm.agent_toolkits import utility
+from langchain_ibm.agent_toolkits.utility import WatsonxTool
+
+from langgraph_agentic_rag import retriever_tool_watsonx
+from langgraph_agentic_rag.retrieval_cache import RetrievalCache
+from langgraph_agentic_rag.tools import arun_watsonx_tool
+
+TOOLS_RUN_URL = "https://us-south.ml.cloud.ibm.com/v1-beta/utility_agent_tools/run"
+
+
+class FakeRAGQueryTool:
+    """Stand-in of the RAGQuery tool, recording its inputs."""
+
+    def __init__(self) -> None:
+        self.tool_config = None
+        self.inputs = []
+
+    def set_tool_config(self, tool_config: dict) -> None:
+        self.tool_config = tool_config
+
+    def invoke(self, tool_input: dict) -> dict:
+        self.inputs.append(tool_input["input"])
+        return {"output": f"Chunks for {tool_input['input']}"}
+
+
+class FakeAsyncClient:
+    """Stand-in of the async HTTP client, answering the tools endpoint after a delay."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.requests = []
+
+    async def post(self, url: str, json: dict, headers: dict) -> httpx.Response:
+        self.requests.append((url, json, headers))
+        await asyncio.sleep(self.delay)
+        return httpx.Response(
+            200,
+            json={"output": f"Chunks for {json['input']}"},
+            request=httpx.Request("POST", url),
+        )
+
+
+class FakeHrefDefinitions:
+    def get_utility_agent_tools_run_href(self) -> str:
+        return TOOLS_RUN_URL
+
+
+class FakeAPIClient(APIClient):
+    """API client sending the tool requests to a `FakeAsyncClient`."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.credentials = Credentials(
+            url="https://us-south.ml.cloud.ibm.com", token="token"
+        )
+        self._async_httpx_client = FakeAsyncClient(delay)
+        self._href_definitions = FakeHrefDefinitions()
+
+    async def _aget_headers(self) -> dict:
+        return {"Authorization": "Bearer token"}
+
+
+def patch_toolkit(monkeypatch, get_tool: Callable[[Any], Any]) -> None:
+    class FakeToolkit:
+        def __init__(self, watsonx_client) -> None:
+            self.watsonx_client = watsonx_client
+
+        def get_tool(self, tool_name: str):
+            assert tool_name == "RAGQuery"
+            return get_tool(self.watsonx_client)
+
+    monkeypatch.setattr(utility, "WatsonxToolkit", FakeToolkit)
+
+
+@pytest.fixture
+def rag_tool(monkeypatch) -> FakeRAGQueryTool:
+    rag_tool = FakeRAGQueryTool()
+    patch_toolkit(monkeypatch, lambda watsonx_client: rag_tool)
+    return rag_tool
+
+
+@pytest.fixture
+def watsonx_rag_tool(monkeypatch) -> None:
+    patch_toolkit(
+        monkeypatch,
+        lambda watsonx_client: WatsonxTool(
+            name="RAGQuery",
+            description="Search the vector index",
+            tool_config_schema={"type": "object"},
+            watsonx_client=watsonx_client,
+        ),
+    )
+
+
+class TestRetrieverTool:
+    def test_retrieves_without_cache(self, rag_tool):
+        tool_config = {"vectorIndexId": "index", "spaceId": "space"}
+        retriever = retriever_tool_watsonx(None, tool_config)
+
+        assert retriever.invoke({"query": "IBM"}) == "Chunks for IBM"
+        assert retriever.invoke({"query": "IBM"}) == "Chunks for IBM"
+        assert rag_tool.inputs == ["IBM", "IBM"]
+        assert rag_tool.tool_config == tool_config
+
+    def test_retrieves_through_cache(self, rag_tool):
+        retrieval_cache = RetrievalCache()
+        retriever = retriever_tool_watsonx(
+            None, {"vectorIndexId": "index"}, retrieval_cache=retrieval_cache
+        )
+
+        assert retriever.invoke({"query": "What is IBM?"}) == "Chunks for What is IBM?"
+        assert retriever.invoke({"query": "what is  IBM?"}) == "Chunks for What is IBM?"
+        assert rag_tool.inputs == ["What is IBM?"]
+        assert retrieval_cache.stats()["hits"] == 1
+
+
+class TestAsyncRetrieverTool:
+    def test_request_payload(self, watsonx_rag_tool):
+        api_client = FakeAPIClient()
+        tool_config = {"vectorIndexId": "index", "spaceId": "space"}
+        retriever = retriever_tool_watsonx(api_client, tool_config)
+
+        result = asyncio.run(retriever.ainvoke({"query": "IBM"}))
+
+        assert result == "Chunks for IBM"
+        assert api_client.async_httpx_client.requests == [
+            (
+                TOOLS_RUN_URL,
+                {"input": "IBM", "tool_name": "RAGQuery", "config": tool_config},
+                {"Authorization": "Bearer token"},
+            )
+        ]
+
+    def test_input_is_validated(self, watsonx_rag_tool):
+        api_client = FakeAPIClient()
+        rag_tool = utility.WatsonxToolkit(api_client).get_tool("RAGQuery")
+
+        with pytest.raises(WMLClientError):
+            asyncio.run(arun_watsonx_tool(api_client, rag_tool, {"query": "IBM"}))
+        assert api_client.async_httpx_client.requests == []
+
+    def test_concurrent_queries_are_coalesced(self, watsonx_rag_tool):
+        api_client = FakeAPIClient(delay=0.05)
+        retriever = retriever_tool_watsonx(api_client, {"vectorIndexId": "index"})
+
+        async def main():
+            return await asyncio.gather(
+                retriever.ainvoke({"query": "What is IBM?"}),
+                retriever.ainvoke({"query": "what is  ibm?"}),
+                retriever.ainvoke({"query": "Who founded IBM?"}),
+            )
+
+        results = asyncio.run(main())
+
+        assert results[0] == results[1] == "Chunks for What is IBM?"
+        assert results[2] == "Chunks for Who founded IBM?"
+        assert len(api_client.async_httpx_client.requests) == 2
+
+    def test_retrieval_timeout(self, watsonx_rag_tool):
+        api_client = FakeAPIClient(delay=1.0)
+        retriever = retriever_tool_watsonx(
+            api_client, {"vectorIndexId": "index"}, retrieval_timeout=0.01
+        )
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(retriever.ainvoke({"query": "IBM"}))
+
+    def test_falls_back_to_sync_tool(self, rag_tool):
+        retriever = retriever_tool_watsonx(None, {"vectorIndexId": "index"})
+
+        assert asyncio.run(retriever.ainvoke({"query": "IBM"})) == "Chunks for IBM"
+        assert rag_tool.inputs == ["IBM"]
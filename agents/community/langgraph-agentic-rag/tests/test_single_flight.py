@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from langgraph_agentic_rag.single_flight import SingleFlight
+
+
+class SlowCall:
+    def __init__(self, result: str = "chunks", delay: float = 0.05) -> None:
+        self.result = result
+        self.delay = delay
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self) -> str:
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self.result
+
+
+class TestSingleFlight:
+    def test_concurrent_identical_calls_are_coalesced(self):
+        single_flight = SingleFlight()
+        call = SlowCall()
+
+        async def main():
+            return await asyncio.gather(
+                *(single_flight.run("IBM", call) for _ in range(10)),
+                single_flight.run("watsonx", call),
+            )
+
+        results = asyncio.run(main())
+
+        assert results == ["chunks"] * 11
+        assert call.started == 2
+        assert single_flight.stats() == {"in_flight": 0, "coalesced": 9}
+
+    def test_completed_calls_are_not_reused(self):
+        single_flight = SingleFlight()
+        call = SlowCall(delay=0)
+
+        async def main():
+            await single_flight.run("IBM", call)
+            await single_flight.run("IBM", call)
+
+        asyncio.run(main())
+
+        assert call.started == 2
+
+    def test_errors_are_shared(self):
+        single_flight = SingleFlight()
+
+        async def failing_call():
+            await asyncio.sleep(0.01)
+            raise ConnectionError("RAGQuery unavailable")
+
+        async def main():
+            return await asyncio.gather(
+                single_flight.run("IBM", failing_call),
+                single_flight.run("IBM", failing_call),
+                return_exceptions=True,
+            )
+
+        first, second = asyncio.run(main())
+
+        assert isinstance(first, ConnectionError)
+        assert first is second
+
+    def test_timeout_of_one_caller_keeps_the_call_for_others(self):
+        single_flight = SingleFlight()
+        call = SlowCall(delay=0.1)
+
+        async def main():
+            impatient = single_flight.run("IBM", call, timeout=0.01)
+            patient = single_flight.run("IBM", call)
+            return await asyncio.gather(impatient, patient, return_exceptions=True)
+
+        impatient, patient = asyncio.run(main())
+
+        assert isinstance(impatient, TimeoutError)
+        assert patient == "chunks"
+        assert call.cancelled == 0
+
+    def test_call_is_cancelled_when_no_caller_waits(self):
+        single_flight = SingleFlight()
+        call = SlowCall(delay=10)
+
+        async def main():
+            with pytest.raises(TimeoutError):
+                await single_flight.run("IBM", call, timeout=0.01)
+            # Let the cancellation propagate to the call
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+
+        assert call.cancelled == 1
+        assert single_flight.stats()["in_flight"] == 0
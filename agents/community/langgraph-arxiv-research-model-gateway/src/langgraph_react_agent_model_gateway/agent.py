@@ -1,12 +1,29 @@
 from typing import Callable
 
+from typing_extensions import NotRequired
+
 from ibm_watsonx_ai import APIClient
+from langchain_core.messages import BaseMessage, SystemMessage
 from langchain_ibm import ChatWatsonx
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import create_react_agent
+from langgraph.prebuilt.chat_agent_executor import AgentState
 
 from langgraph_react_agent_model_gateway import TOOLS
 
+DEFAULT_SYSTEM_PROMPT = (
+    "You are a helpful AI Research assistant, please respond to the user's query "
+    "to the best of your ability! Execute a tool call whenever you see fit. "
+    "When using tools, make sure to format the URL to an arXiv research paper "
+    "like 'https://arxiv.org/html/2501.12948v1'"
+)
+
+
+class PromptAgentState(AgentState):
+    """ReAct agent state carrying the system prompt of the current request."""
+
+    system_prompt: NotRequired[str]
+
 
 def get_graph_closure(client: APIClient, model: str) -> Callable:
     """Graph generator closure."""
@@ -14,18 +31,31 @@ def get_graph_closure(client: APIClient, model: str) -> Callable:
     # Initialise ChatWatsonx
     chat = ChatWatsonx(model=model, watsonx_client=client)
 
-    # Define system prompt
-    default_system_prompt = (
-        "You are a helpful AI Research assistant, please respond to the user's query "
-        "to the best of your ability! Execute a tool call whenever you see fit. "
-        "When using tools, make sure to format the URL to an arXiv research paper "
-        "like 'https://arxiv.org/html/2501.12948v1'"
-    )
-
-    def get_graph(system_prompt=default_system_prompt) -> CompiledStateGraph:
+    def get_graph(system_prompt=DEFAULT_SYSTEM_PROMPT) -> CompiledStateGraph:
         """Get compiled graph with overwritten system prompt, if provided"""
 
         # Create instance of compiled graph
         return create_react_agent(chat, tools=TOOLS, prompt=system_prompt)
 
     return get_graph
+
+
+def get_prompt_as_state_graph(client: APIClient, model: str) -> CompiledStateGraph:
+    """Get a single compiled graph reading the system prompt from the graph state.
+
+    The system prompt is passed in the `system_prompt` key of the graph input
+    and falls back to the default system prompt when it is not provided.
+    """
+
+    # Initialise ChatWatsonx
+    chat = ChatWatsonx(model=model, watsonx_client=client)
+
+    def prompt_from_state(state: PromptAgentState) -> list[BaseMessage]:
+        """Prepend the system prompt of the current request to the messages"""
+        system_prompt = state.get("system_prompt") or DEFAULT_SYSTEM_PROMPT
+        return [SystemMessage(content=system_prompt), *state["messages"]]
+
+    # Create instance of compiled graph
+    return create_react_agent(
+        chat, tools=TOOLS, prompt=prompt_from_state, state_schema=PromptAgentState
+    )
@@ -1,9 +1,9 @@
-def deployable_ai_service(context, url=None, model_id=None):
-    import urllib
+def deployable_ai_service(context, url=None, model_id=None, prompt_as_state=False):
     from typing import Generator
 
-    from langgraph_react_agent.agent import get_graph_closure
-    from ibm_watsonx_ai import APIClient, Credentials
+    from langgraph_react_agent.client_manager import APIClientManager
+    from langgraph_react_agent.agent import get_graph_closure, get_prompt_as_state_graph
+    from langgraph.graph.state import CompiledStateGraph
     from langchain_core.messages import (
         BaseMessage,
         HumanMessage,
@@ -11,20 +11,19 @@ def deployable_ai_service(context, url=None, model_id=None):
         SystemMessage,
     )
 
-    hostname = urllib.parse.urlparse(url).hostname or ""
-    is_cloud_url = hostname.lower().endswith("cloud.ibm.com")
-    instance_id = None if is_cloud_url else "openshift"
-
-    client = APIClient(
-        credentials=Credentials(
-            url=url,
-            token=context.generate_token(),
-            instance_id=instance_id,
-        ),
+    # One API client, with pooled HTTP connections, is shared by all requests
+    client_manager = APIClientManager(
+        url=url,
         space_id=context.get_space_id(),
+        token=context.generate_token(),
     )
+    client = client_manager.client
 
-    graph = get_graph_closure(client, model_id)
+    if prompt_as_state:
+        # One graph serves all requests, the system prompt is passed in the graph state
+        shared_graph = get_prompt_as_state_graph(client, model_id)
+    else:
+        graph = get_graph_closure(client, model_id)
 
     def get_formatted_message(
         resp: BaseMessage, is_assistant: bool = False
@@ -96,6 +95,25 @@ def deployable_ai_service(context, url=None, model_id=None):
         else:
             return HumanMessage(content=_dict["content"])
 
+    def get_agent_with_input(
+        messages: list[BaseMessage],
+    ) -> tuple[CompiledStateGraph, dict]:
+        """Select the graph serving the request and build its input"""
+
+        if messages and messages[0].type == "system":
+            system_message, messages = messages[0], messages[1:]
+        else:
+            system_message = None
+
+        if prompt_as_state:
+            agent_input = {"messages": messages}
+            if system_message is not None:
+                agent_input["system_prompt"] = system_message.content
+            return shared_graph, agent_input
+
+        agent = graph() if system_message is None else graph(system_message)
+        return agent, {"messages": messages}
+
     def generate(context) -> dict:
         """
         The `generate` function handles the REST call to the inference endpoint
@@ -119,20 +137,16 @@ def deployable_ai_service(context, url=None, model_id=None):
         Please note that the `system message` MUST be placed first in the list of messages!
         """
 
-        client.set_token(context.get_token())
+        client_manager.set_token(context.get_token())
 
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
         messages = [convert_dict_to_message(_dict) for _dict in raw_messages]
 
-        if messages and messages[0].type == "system":
-            agent = graph(messages[0])
-            del messages[0]
-        else:
-            agent = graph()
+        agent, agent_input = get_agent_with_input(messages)
 
         # Invoke agent
-        generated_response = agent.invoke({"messages": messages})
+        generated_response = agent.invoke(agent_input)
 
         choices = []
         execute_response = {
@@ -174,20 +188,14 @@ def deployable_ai_service(context, url=None, model_id=None):
         headers = context.get_headers()
         is_assistant = headers.get("X-Ai-Interface") == "assistant"
 
-        client.set_token(context.get_token())
+        client_manager.set_token(context.get_token())
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
         messages = [convert_dict_to_message(_dict) for _dict in raw_messages]
 
-        if messages and messages[0].type == "system":
-            agent = graph(messages[0])
-            del messages[0]
-        else:
-            agent = graph()
+        agent, agent_input = get_agent_with_input(messages)
 
-        response_stream = agent.stream(
-            {"messages": messages}, stream_mode=["updates", "messages"]
-        )
+        response_stream = agent.stream(agent_input, stream_mode=["updates", "messages"])
 
         for chunk_type, data in response_stream:
             if chunk_type == "messages":
@@ -6,12 +6,22 @@ def deployable_ai_service(
     knowledge_graph_description,
     service_manager_service_url,
     secret_id,
+    neo4j_health_check_interval=30.0,
+    neo4j_max_connection_pool_size=100,
+    entity_extraction_mode="combined",
+    entity_fulltext_min_score=1.0,
+    query_cache_max_size=10000,
+    query_cache_ttl=600.0,
+    query_cache_similarity_threshold=0.97,
+    query_cache_version_check_interval=30.0,
+    embedding_cache_max_size=100000,
+    embedding_cache_path=None,
 ):
-    import urllib
     from typing import Generator
 
+    from langgraph_graph_rag.client_manager import APIClientManager
     from langgraph_graph_rag.agent import get_graph_closure
-    from ibm_watsonx_ai import APIClient, Credentials
+    from langgraph_graph_rag.query_cache import KnowledgeGraphCache
     from langchain_core.messages import (
         BaseMessage,
         HumanMessage,
@@ -19,17 +29,21 @@ def deployable_ai_service(
         SystemMessage,
     )
 
-    hostname = urllib.parse.urlparse(url).hostname or ""
-    is_cloud_url = hostname.lower().endswith("cloud.ibm.com")
-    instance_id = None if is_cloud_url else "openshift"
-
-    client = APIClient(
-        credentials=Credentials(
-            url=url,
-            token=context.generate_token(),
-            instance_id=instance_id,
-        ),
+    # One API client, with pooled HTTP connections, is shared by all requests
+    client_manager = APIClientManager(
+        url=url,
         space_id=context.get_space_id(),
+        token=context.generate_token(),
+    )
+    client = client_manager.client
+
+    # Results of repeated graph searches and vector retrievals are shared by all requests,
+    # see `query_cache.stats()` for the hit ratios
+    query_cache = KnowledgeGraphCache(
+        max_size=query_cache_max_size,
+        ttl=query_cache_ttl,
+        similarity_threshold=query_cache_similarity_threshold,
+        version_check_interval=query_cache_version_check_interval,
     )
 
     graph = get_graph_closure(
@@ -39,6 +53,13 @@ def deployable_ai_service(
         knowledge_graph_description=knowledge_graph_description,
         service_manager_service_url=service_manager_service_url,
         secret_id=secret_id,
+        neo4j_health_check_interval=neo4j_health_check_interval,
+        neo4j_max_connection_pool_size=neo4j_max_connection_pool_size,
+        entity_extraction_mode=entity_extraction_mode,
+        entity_fulltext_min_score=entity_fulltext_min_score,
+        query_cache=query_cache,
+        embedding_cache_max_size=embedding_cache_max_size,
+        embedding_cache_path=embedding_cache_path,
     )
 
     def get_formatted_message(
@@ -134,7 +155,7 @@ def deployable_ai_service(
         Please note that the `system message` MUST be placed first in the list of messages!
         """
 
-        client.set_token(context.get_token())
+        client_manager.set_token(context.get_token())
 
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
@@ -189,7 +210,7 @@ def deployable_ai_service(
         headers = context.get_headers()
         is_assistant = headers.get("X-Ai-Interface") == "assistant"
 
-        client.set_token(context.get_token())
+        client_manager.set_token(context.get_token())
 
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
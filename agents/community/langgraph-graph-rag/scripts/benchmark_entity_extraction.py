@@ -0,0 +1,251 @@
+"""Benchmark of the entity extraction modes of the graph search.
+
+Compares the end-to-end latency, the number of LLM calls and the retrieval recall of:
+- "separate": routing LLM call, then a second LLM call extracting the entities,
+- "combined": the routing LLM call also extracts the entities,
+- "fulltext": the question is matched against the `entity` full-text index, no LLM call,
+on a fixed question set.
+
+No credentials are needed. Neo4j is replaced with an in-memory stand-in of the knowledge
+graph, answering the `entity` full-text index queries with fuzzy term matching, and the
+LLM with an oracle answering with the gold entities of each question after a fixed
+latency. The recall of the LLM modes is therefore an upper bound, while the recall of
+the "fulltext" mode is what the lexical matcher achieves on its own. The recall is the
+fraction of the relationships of the gold entities found in the structured data.
+
+Usage:
+    python scripts/benchmark_entity_extraction.py --llm-latency 0.3 --neo4j-latency 0.005
+"""
+
+import argparse
+import re
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from statistics import mean
+from unittest import mock
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+# Add src directory to Python path to import the agent package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from langgraph_graph_rag import agent, nodes  # noqa: E402
+
+RELATIONSHIPS = [
+    ("IBM", "ACQUIRED", "Red Hat"),
+    ("IBM", "ACQUIRED", "HashiCorp"),
+    ("Arvind Krishna", "CEO_OF", "IBM"),
+    ("Jim Whitehurst", "CEO_OF", "Red Hat"),
+    ("IBM", "HEADQUARTERED_IN", "Armonk"),
+    ("Red Hat", "HEADQUARTERED_IN", "Raleigh"),
+    ("Red Hat", "DEVELOPS", "Linux"),
+    ("IBM", "DEVELOPS", "Watson"),
+    ("HashiCorp", "DEVELOPS", "Terraform"),
+]
+
+# Questions with their gold entities
+QUESTIONS = {
+    "Who is the CEO of IBM?": ["IBM"],
+    "Where is Red Hat headquartered?": ["Red Hat"],
+    "Which company did IBM acquire in 2019, Red Hat or HashiCorp?": [
+        "IBM",
+        "Red Hat",
+        "HashiCorp",
+    ],
+    "What does HashiCorp develop?": ["HashiCorp"],
+    "Which company is led by Arvind Krishna?": ["Arvind Krishna"],
+    "Tell me about Jim Whitehurst's career.": ["Jim Whitehurst"],
+    "What is Watson?": ["Watson"],
+    "Is Terraform developed by hashicorp?": ["Terraform", "HashiCorp"],
+    "Which city hosts the headquarters of Red Hat and IBM?": ["Red Hat", "IBM"],
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return re.findall(r"[\w']+", text.lower())
+
+
+def edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+class Neo4jStandIn:
+    """In-memory stand-in of the knowledge graph, answering the graph search queries."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.entities = sorted({e for s, _, o in RELATIONSHIPS for e in (s, o)})
+
+    def _search(self, query: str) -> list[tuple[str, float]]:
+        """Score the entities against a Lucene query made of `word~N` terms."""
+        operator = " AND " if " AND " in query else " OR "
+        terms = [term.rsplit("~", 1) for term in query.split(operator)]
+        results = []
+        for entity in self.entities:
+            tokens = tokenize(entity)
+            score, matched = 0.0, 0
+            for word, max_edits in terms:
+                edits = min(edit_distance(word.lower(), token) for token in tokens)
+                if edits <= int(max_edits):
+                    score += 1.0 if edits == 0 else 0.5
+                    matched += 1
+            if matched == len(terms) or (operator == " OR " and matched):
+                results.append((entity, score))
+        return sorted(results, key=lambda result: -result[1])
+
+    def _neighbourhood(self, entity: str) -> list[str]:
+        return [f"{s} - {r} -> {o}" for s, r, o in RELATIONSHIPS if entity in (s, o)]
+
+    def query(self, query: str, params: dict) -> list[dict]:
+        time.sleep(self.latency)
+        if "queries" in params:
+            results = [
+                {
+                    "i": i,
+                    "outputs": [
+                        output
+                        for entity, _ in self._search(full_text_query)[:2]
+                        for output in self._neighbourhood(entity)
+                    ][:20],
+                }
+                for i, full_text_query in enumerate(params["queries"])
+            ]
+            # Queries not matching any entity have no row
+            return [result for result in results if result["outputs"]]
+        return [
+            {"id": entity}
+            for entity, score in self._search(params["query"])[:10]
+            if score >= params["min_score"]
+        ]
+
+
+class VectorIndexStandIn:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def similarity_search(self, question: str) -> list:
+        time.sleep(self.latency)
+        return [mock.Mock(page_content="document")]
+
+
+class OracleLLM:
+    """Fake ChatWatsonx answering with the gold entities of the question."""
+
+    calls = 0
+    latency = 0.3
+    _lock = threading.Lock()
+
+    def __init__(self, **kwargs) -> None:
+        self.tools = []
+
+    @classmethod
+    def _call(cls) -> None:
+        with cls._lock:
+            cls.calls += 1
+        time.sleep(cls.latency)
+
+    @staticmethod
+    def _gold_entities(text: str) -> list[str]:
+        return next(gold for question, gold in QUESTIONS.items() if question in text)
+
+    def bind_tools(self, tools: list, **kwargs) -> "OracleLLM":
+        bound = OracleLLM()
+        bound.tools = tools
+        return bound
+
+    def with_structured_output(self, schema: type) -> RunnableLambda:
+        def extract(prompt_value):
+            self._call()
+            return schema(names=self._gold_entities(prompt_value.to_string()))
+
+        return RunnableLambda(extract)
+
+    def invoke(self, messages: list) -> AIMessage:
+        self._call()
+        if not self.tools:
+            return AIMessage(content="answer")
+
+        args = {"route": "graph_knowledge_base"}
+        if "entities" in self.tools[0].model_fields:
+            args["entities"] = self._gold_entities(messages[-1].content)
+        return AIMessage(
+            content="", tool_calls=[{"name": "Router", "args": args, "id": "call_0"}]
+        )
+
+
+def run(mode: str, neo4j_latency: float, vector_latency: float) -> tuple:
+    """Answer the question set and return the latencies, LLM calls and recalls."""
+    neo4j_pool = mock.Mock()
+    neo4j_pool.return_value.get.return_value = (
+        Neo4jStandIn(neo4j_latency),
+        VectorIndexStandIn(vector_latency),
+    )
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(agent, "Neo4jConnectionPool", neo4j_pool))
+        stack.enter_context(mock.patch.object(agent, "SecretCache"))
+        stack.enter_context(mock.patch.object(nodes, "ChatWatsonx", OracleLLM))
+        get_graph = agent.get_graph_closure(
+            None,
+            "model",
+            "embedding_model",
+            "IBM and its subsidiaries",
+            "",
+            "",
+            entity_extraction_mode=mode,
+        )
+
+        latencies, recalls = [], []
+        OracleLLM.calls = 0
+        for question, gold_entities in QUESTIONS.items():
+            start = time.perf_counter()
+            state = get_graph().invoke({"messages": [HumanMessage(question)]})
+            latencies.append(time.perf_counter() - start)
+
+            expected = {
+                output
+                for entity in gold_entities
+                for output in Neo4jStandIn(0)._neighbourhood(entity)
+            }
+            found = set(state["structured_data"].splitlines())
+            recalls.append(len(expected & found) / len(expected))
+
+    return latencies, OracleLLM.calls / len(QUESTIONS), recalls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--neo4j-latency", type=float, default=0.005)
+    parser.add_argument("--vector-latency", type=float, default=0.02)
+    args = parser.parse_args()
+    OracleLLM.latency = args.llm_latency
+
+    print(f"{'mode':<12}{'mean ms':>10}{'max ms':>10}{'LLM calls':>12}{'recall':>10}")
+    for mode in ("separate", "combined", "fulltext"):
+        latencies, llm_calls, recalls = run(
+            mode, args.neo4j_latency, args.vector_latency
+        )
+        print(
+            f"{mode:<12}{mean(latencies) * 1000:>10.1f}{max(latencies) * 1000:>10.1f}"
+            f"{llm_calls:>12.1f}{mean(recalls):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,13 @@
 """Scripts for creating knowledge graph with vector representation from the provided text."""
 
+import argparse
 import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from hashlib import md5
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
 
 from langchain_experimental.graph_transformers import LLMGraphTransformer
 from langchain_neo4j.graphs.graph_document import GraphDocument
@@ -13,6 +20,9 @@ from ibm_watsonx_ai import APIClient, Credentials
 
 from dotenv import load_dotenv
 
+from langgraph_graph_rag.embedding_cache import cache_embeddings
+from langgraph_graph_rag.query_cache import bump_knowledge_graph_version
+
 load_dotenv()
 
 # Model ids
@@ -33,24 +43,371 @@ api_client = APIClient(
 
 # Define llm and embedding models
 llm = ChatWatsonx(model_id=WATSONX_MODEL_ID, watsonx_client=api_client, temperature=0)
-embedding_func = WatsonxEmbeddings(
+# Texts already embedded by previous runs are read from the embedding cache
+embedding_func = cache_embeddings(
+    WatsonxEmbeddings(
+        model_id=WATSONX_EMBEDDING_MODEL_ID,
+        watsonx_client=api_client,
+        params={"truncate_input_tokens": 512},
+    ),
     model_id=WATSONX_EMBEDDING_MODEL_ID,
-    watsonx_client=api_client,
-    params={"truncate_input_tokens": 512},
+    path=os.environ.get("EMBEDDING_CACHE_PATH"),
 )
 
 
-def prepare_documents(documents: list[Document]) -> list[Document]:
+EXAMPLE_TEXT = """
+Marie Curie, born in 1867, was a Polish and naturalised-French physicist and chemist who conducted pioneering research on radioactivity.
+She was the first woman to win a Nobel Prize, the first person to win a Nobel Prize twice, and the only person to win a Nobel Prize in two scientific fields.
+Her husband, Pierre Curie, was a co-winner of her first Nobel Prize, making them the first-ever married couple to win the Nobel Prize and launching the Curie family legacy of five Nobel Prizes.
+She was, in 1906, the first woman to become a professor at the University of Paris.
+"""
+
+# Import of a batch of graph documents, with their source chunks, in a single transaction.
+# Chunks are `Document` nodes identified by the hash of their content, linked to the
+# sources they appear in, and relationships record the chunks they were extracted from.
+DOCUMENTS_IMPORT_QUERY = """
+UNWIND $documents AS document
+MERGE (d:Document {id: document.id})
+SET d.text = document.text
+SET d += document.metadata
+SET d.sources = apoc.coll.toSet(coalesce(d.sources, []) + document.source)
+WITH d, document
+UNWIND document.nodes AS row
+MERGE (source:__Entity__ {id: row.id})
+SET source += row.properties
+MERGE (d)-[:MENTIONS]->(source)
+WITH source, row
+CALL apoc.create.addLabels(source, [row.type]) YIELD node
+RETURN count(*)
+"""
+RELATIONSHIPS_IMPORT_QUERY = """
+UNWIND $relationships AS row
+MERGE (source:__Entity__ {id: row.source})
+MERGE (target:__Entity__ {id: row.target})
+WITH source, target, row
+CALL apoc.merge.relationship(source, row.type, {}, row.properties, target) YIELD rel
+SET rel.chunk_ids = apoc.coll.toSet(coalesce(rel.chunk_ids, []) + row.chunk_id)
+RETURN count(*)
+"""
+
+EXISTING_CHUNKS_QUERY = """
+UNWIND $chunks AS chunk
+MATCH (d:Document {id: chunk.id})
+SET d.sources = apoc.coll.toSet(coalesce(d.sources, []) + chunk.source)
+RETURN d.id AS id
+"""
+# Chunks of the ingested sources that are no longer part of them
+ORPHANED_CHUNKS_QUERY = """
+UNWIND $sources AS source
+MATCH (d:Document)
+WHERE source.name IN d.sources AND NOT d.id IN source.chunk_ids
+SET d.sources = [s IN d.sources WHERE s <> source.name]
+WITH DISTINCT d
+WHERE size(d.sources) = 0
+RETURN d.id AS id
+"""
+# Chunks of the sources under the ingested roots that were not ingested again,
+# e.g. files removed from an ingested directory
+PRUNED_CHUNKS_QUERY = """
+MATCH (d:Document)
+WITH d, [
+  s IN d.sources
+  WHERE any(root IN $roots WHERE s = root OR s STARTS WITH root + $separator)
+  AND NOT s IN $sources
+] AS removed
+WHERE size(removed) > 0
+SET d.sources = [s IN d.sources WHERE NOT s IN removed]
+WITH d
+WHERE size(d.sources) = 0
+RETURN d.id AS id
+"""
+# Deletion of chunks, with the relationships and entities only extracted from them
+CHUNKS_DELETE_QUERIES = [
+    """
+    UNWIND $ids AS id
+    MATCH (:Document {id: id})-[:MENTIONS]->(:__Entity__)-[r]-(:__Entity__)
+    WHERE id IN r.chunk_ids
+    SET r.chunk_ids = [c IN r.chunk_ids WHERE c <> id]
+    WITH DISTINCT r
+    WHERE size(r.chunk_ids) = 0
+    DELETE r
+    """,
+    """
+    UNWIND $ids AS id
+    MATCH (d:Document {id: id})
+    OPTIONAL MATCH (d)-[:MENTIONS]->(e:__Entity__)
+    DETACH DELETE d
+    WITH DISTINCT e
+    WHERE e IS NOT NULL AND NOT (e)<-[:MENTIONS]-()
+    DETACH DELETE e
+    """,
+]
+
+
+def batched(iterable: Iterable, n: int) -> Iterator[list]:
+    """Split the iterable into lists of `n` items, the last one may be shorter."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, n)):
+        yield batch
+
+
+def load_documents(paths: list[str]) -> Iterator[Document]:
+    """Lazily read the text files, searching directories recursively.
+
+    Sources are the resolved file paths, so they do not depend on the working
+    directory or on the form of the paths.
+    """
+    for path in map(Path, paths):
+        path = path.resolve()
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+        for file in files:
+            if file.is_file() and file.suffix in {".txt", ".md"}:
+                yield Document(
+                    page_content=file.read_text(encoding="utf-8"),
+                    metadata={"source": str(file)},
+                )
+
+
+def prepare_documents(documents: Iterable[Document]) -> Iterator[Document]:
+    """Split the documents into chunks, identified by the hash of their content."""
     text_splitter = RecursiveCharacterTextSplitter(chunk_size=256)
-    return text_splitter.split_documents(documents)
+    for document in documents:
+        for chunk in text_splitter.split_documents([document]):
+            chunk.metadata["id"] = md5(chunk.page_content.encode("utf-8")).hexdigest()
+            yield chunk
+
+
+class IngestionCheckpoint:
+    """Append-only file of the chunks already written to Neo4j, with their source."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.done = set()
+        if self.path.exists():
+            self.done.update(self.path.read_text().splitlines())
+
+    @staticmethod
+    def key(chunk: Document) -> str:
+        return f"{chunk.metadata['id']}\t{chunk.metadata['source']}"
+
+    def mark_done(self, keys: list[str]) -> None:
+        with self.path.open("a") as file:
+            file.writelines(f"{key}\n" for key in keys)
+            file.flush()
+            os.fsync(file.fileno())
+        self.done.update(keys)
+
+    def discard(self, chunk_ids: Iterable[str]) -> None:
+        """Forget the deleted chunks, so they are written again if they reappear."""
+        chunk_ids = set(chunk_ids)
+        if not chunk_ids:
+            return
+        self.done = {key for key in self.done if key.split("\t")[0] not in chunk_ids}
+        temporary_path = self.path.with_suffix(".tmp")
+        temporary_path.write_text("".join(f"{key}\n" for key in self.done))
+        os.replace(temporary_path, self.path)
+
+
+def filter_new_chunks(
+    graph: Neo4jGraph,
+    chunks: Iterable[Document],
+    chunk_ids_by_source: dict[str, set[str]],
+    checkpoint: IngestionCheckpoint | None = None,
+    batch_size: int = 500,
+) -> Iterator[Document]:
+    """Yield the chunks whose content is not in the knowledge graph yet.
+
+    The IDs of all the chunks of each source are recorded in `chunk_ids_by_source`,
+    and the chunks already in the knowledge graph are linked to their sources.
+    Chunks recorded in the checkpoint, if any, are skipped without looking them up.
+    """
+    seen = set()
+    for batch in batched(chunks, batch_size):
+        for chunk in batch:
+            chunk_ids_by_source[chunk.metadata["source"]].add(chunk.metadata["id"])
+
+        if checkpoint is not None:
+            batch = [
+                chunk
+                for chunk in batch
+                if IngestionCheckpoint.key(chunk) not in checkpoint.done
+            ]
+            if not batch:
+                continue
+
+        existing = {
+            el["id"]
+            for el in graph.query(
+                EXISTING_CHUNKS_QUERY,
+                {
+                    "chunks": [
+                        {"id": chunk.metadata["id"], "source": chunk.metadata["source"]}
+                        for chunk in batch
+                    ]
+                },
+            )
+        }
+        if checkpoint is not None:
+            checkpoint.mark_done(
+                [
+                    IngestionCheckpoint.key(chunk)
+                    for chunk in batch
+                    if chunk.metadata["id"] in existing
+                ]
+            )
+        for chunk in batch:
+            chunk_id = chunk.metadata["id"]
+            if chunk_id not in existing and chunk_id not in seen:
+                seen.add(chunk_id)
+                yield chunk
+
+
+def delete_orphaned_chunks(
+    graph: Neo4jGraph,
+    chunk_ids_by_source: dict[str, set[str]],
+    pruned_roots: list[str] | None = None,
+    batch_size: int = 500,
+) -> list[str]:
+    """Delete the chunks no longer part of any source, return their IDs.
+
+    Sources under the `pruned_roots` paths that are not in `chunk_ids_by_source`,
+    i.e. files removed since they were ingested, are dropped from their chunks too.
+    """
+    orphaned_ids = [
+        el["id"]
+        for el in graph.query(
+            ORPHANED_CHUNKS_QUERY,
+            {
+                "sources": [
+                    {"name": source, "chunk_ids": list(chunk_ids)}
+                    for source, chunk_ids in chunk_ids_by_source.items()
+                ]
+            },
+        )
+    ]
+    if pruned_roots:
+        orphaned_ids += [
+            el["id"]
+            for el in graph.query(
+                PRUNED_CHUNKS_QUERY,
+                {
+                    "roots": pruned_roots,
+                    "separator": os.sep,
+                    "sources": list(chunk_ids_by_source),
+                },
+            )
+        ]
 
+    def delete_batch(tx, ids: list[str]) -> None:
+        for query in CHUNKS_DELETE_QUERIES:
+            tx.run(query, ids=ids).consume()
 
-def create_knowledge_graph(graph_documents: list[GraphDocument]) -> Neo4jGraph:
+    with graph._driver.session(database=graph._database) as session:
+        for batch in batched(orphaned_ids, batch_size):
+            session.execute_write(delete_batch, batch)
+    return orphaned_ids
+
+
+def transform_chunks(
+    llm_transformer: LLMGraphTransformer, chunks: Iterable[Document], max_workers: int
+) -> Iterator[GraphDocument]:
+    """Transform the chunks into graph documents, with at most `max_workers` LLM calls in flight.
+
+    Chunks are read from the iterator only when a worker is free, and graph documents
+    are yielded in completion order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for chunk in chunks:
+            if len(pending) >= max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            pending.add(executor.submit(llm_transformer.process_response, chunk))
+
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def write_graph_documents(
+    graph: Neo4jGraph, graph_documents: list[GraphDocument]
+) -> None:
+    """Write the graph documents and their source chunks in a single transaction."""
+    documents = [
+        {
+            "id": graph_document.source.metadata["id"],
+            "text": graph_document.source.page_content,
+            "source": graph_document.source.metadata["source"],
+            "metadata": {
+                key: value
+                for key, value in graph_document.source.metadata.items()
+                if key != "source"
+            },
+            "nodes": [
+                {
+                    "id": node.id,
+                    "type": node.type.replace("`", ""),
+                    "properties": node.properties,
+                }
+                for node in graph_document.nodes
+            ],
+        }
+        for graph_document in graph_documents
+    ]
+    relationships = [
+        {
+            "source": relationship.source.id,
+            "target": relationship.target.id,
+            "type": relationship.type.replace(" ", "_").upper().replace("`", ""),
+            "properties": relationship.properties,
+            "chunk_id": graph_document.source.metadata["id"],
+        }
+        for graph_document in graph_documents
+        for relationship in graph_document.relationships
+    ]
+
+    def import_batch(tx) -> None:
+        tx.run(DOCUMENTS_IMPORT_QUERY, documents=documents).consume()
+        tx.run(RELATIONSHIPS_IMPORT_QUERY, relationships=relationships).consume()
+
+    with graph._driver.session(database=graph._database) as session:
+        session.execute_write(import_batch)
+
+
+def create_knowledge_graph(
+    chunks: Iterable[Document],
+    checkpoint: IngestionCheckpoint | None = None,
+    pruned_roots: list[str] | None = None,
+    batch_size: int = 50,
+    max_workers: int = 8,
+) -> Neo4jGraph:
     # By default, url, username and password are read from env variables
     graph = Neo4jGraph(refresh_schema=False)
-    graph.add_graph_documents(
-        graph_documents=graph_documents, baseEntityLabel=True, include_source=True
+    graph.query(
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (b:__Entity__) REQUIRE b.id IS UNIQUE"
     )
+    graph.query("CREATE INDEX document_id IF NOT EXISTS FOR (d:Document) ON (d.id)")
+
+    # Only new or changed chunks are transformed, including the chunks not written
+    # by a previous, interrupted run
+    chunk_ids_by_source = defaultdict(set)
+    chunks = filter_new_chunks(graph, chunks, chunk_ids_by_source, checkpoint)
+
+    # Experimental LLM graph transformer that generates graph documents
+    llm_transformer = LLMGraphTransformer(llm=llm)
+    graph_documents = transform_chunks(llm_transformer, chunks, max_workers)
+
+    written = 0
+    for batch in batched(graph_documents, batch_size):
+        write_graph_documents(graph, batch)
+        if checkpoint is not None:
+            checkpoint.mark_done([IngestionCheckpoint.key(doc.source) for doc in batch])
+        written += len(batch)
+        print(f"Written {written} chunks")
+
+    deleted = delete_orphaned_chunks(graph, chunk_ids_by_source, pruned_roots)
+    if checkpoint is not None:
+        checkpoint.discard(deleted)
+    print(f"Deleted {len(deleted)} orphaned chunks")
 
     #  Create full text index for graph traversal
     graph.query(
@@ -71,21 +428,60 @@ def create_vector_index_from_graph(graph: Neo4jGraph) -> None:
 
 
 if __name__ == "__main__":
-    # Example text
-    text = """
-    Marie Curie, born in 1867, was a Polish and naturalised-French physicist and chemist who conducted pioneering research on radioactivity.
-    She was the first woman to win a Nobel Prize, the first person to win a Nobel Prize twice, and the only person to win a Nobel Prize in two scientific fields.
-    Her husband, Pierre Curie, was a co-winner of her first Nobel Prize, making them the first-ever married couple to win the Nobel Prize and launching the Curie family legacy of five Nobel Prizes.
-    She was, in 1906, the first woman to become a professor at the University of Paris.
-    """
-
-    documents = [Document(page_content=text)]
-
-    chunks = prepare_documents(documents)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Text files (.txt, .md) or directories to ingest, the example text if not provided",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50,
+        help="Number of chunks written to Neo4j per transaction",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Maximum number of chunks transformed concurrently by the LLM",
+    )
+    parser.add_argument(
+        "--checkpoint-path",
+        default=".ingestion_checkpoint",
+        help=(
+            "File recording the chunks already written, skipped without looking them "
+            "up in Neo4j. Pass an empty value to always look the chunks up"
+        ),
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help=(
+            "Also delete the chunks of the files under the given paths that were "
+            "removed since they were ingested"
+        ),
+    )
+    args = parser.parse_args()
 
-    # Experimental LLM graph transformer that generates graph documents
-    llm_transformer = LLMGraphTransformer(llm=llm)
-    graph_documents = llm_transformer.convert_to_graph_documents(chunks)
+    if args.paths:
+        documents = load_documents(args.paths)
+    else:
+        documents = [
+            Document(page_content=EXAMPLE_TEXT, metadata={"source": "example"})
+        ]
 
-    neo4j_graph = create_knowledge_graph(graph_documents=graph_documents)
+    neo4j_graph = create_knowledge_graph(
+        prepare_documents(documents),
+        IngestionCheckpoint(args.checkpoint_path) if args.checkpoint_path else None,
+        pruned_roots=(
+            [str(Path(path).resolve()) for path in args.paths] if args.prune else None
+        ),
+        batch_size=args.batch_size,
+        max_workers=args.max_workers,
+    )
+    # Only the new chunks, without embedding, are embedded
     create_vector_index_from_graph(neo4j_graph)
+
+    # Drop the cached query results of the running deployments
+    bump_knowledge_graph_version(neo4j_graph)
@@ -8,7 +8,10 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.graph.state import CompiledStateGraph
 
 
-from .nodes import AgentState, GraphNodes
+from .neo4j_pool import Neo4jConnectionPool
+from .secret_cache import SecretCache, secrets_manager_fetcher
+from .nodes import AgentState, EntityExtractionMode, GraphNodes
+from .query_cache import KnowledgeGraphCache
 
 
 def get_graph_closure(
@@ -18,9 +21,30 @@ def get_graph_closure(
     knowledge_graph_description: str,
     service_manager_service_url: str,
     secret_id: str,
+    neo4j_health_check_interval: float = 30.0,
+    neo4j_max_connection_pool_size: int = 100,
+    entity_extraction_mode: EntityExtractionMode = "combined",
+    entity_fulltext_min_score: float = 1.0,
+    query_cache: KnowledgeGraphCache | None = None,
+    embedding_cache_max_size: int = 100_000,
+    embedding_cache_path: str | None = None,
 ) -> Callable:
     """Graph generator closure."""
 
+    # Neo4j graph and vector index are created once and shared between requests
+    neo4j_pool = Neo4jConnectionPool(
+        api_client=client,
+        embedding_model_id=embedding_model_id,
+        secret_cache=SecretCache(
+            secrets_manager_fetcher(client, service_manager_service_url)
+        ),
+        secret_id=secret_id,
+        health_check_interval=neo4j_health_check_interval,
+        max_connection_pool_size=neo4j_max_connection_pool_size,
+        embedding_cache_max_size=embedding_cache_max_size,
+        embedding_cache_path=embedding_cache_path,
+    )
+
     def get_graph(system_message: SystemMessage | None = None) -> CompiledStateGraph:
         """Get compiled graph with overwritten system prompt, if provided"""
 
@@ -34,10 +58,11 @@ def get_graph_closure(
         graph_nodes = GraphNodes(
             api_client=client,
             model_id=model_id,
-            embedding_model_id=embedding_model_id,
             system_message=system_message,
-            service_manager_service_url=service_manager_service_url,
-            secret_id=secret_id,
+            neo4j_pool=neo4j_pool,
+            entity_extraction_mode=entity_extraction_mode,
+            fulltext_min_score=entity_fulltext_min_score,
+            query_cache=query_cache,
         )
 
         # Define a Graph State
@@ -60,6 +85,9 @@ def get_graph_closure(
         # Vector Index Retriever
         workflow.add_node("vector_retriever", graph_nodes.unstructured_retriever)
 
+        # Join retrieved context
+        workflow.add_node("retrieval_context", graph_nodes.retrieval_context)
+
         # Generate final answer
         workflow.add_node("generate", graph_nodes.generate)
 
@@ -70,16 +98,18 @@ def get_graph_closure(
             # First, we define the start node. We use `agent`.
             # This means these are the edges taken after the `agent` node is called.
             "agent",
-            # Next, we pass in the function that will determine which node is called next.
-            lambda state: state["route"],
-            {
-                "graph_knowledge_base": "graph_search",  # If graph knowledge base is in state
-                # Otherwise we finish.
-                "final_answer": "generate",
-            },
+            # Next, we pass in the function that will determine which nodes are called next.
+            # Graph search and vector retrieval are independent, so they run in parallel.
+            lambda state: (
+                ["graph_search", "vector_retriever"]
+                if state["route"] == "graph_knowledge_base"
+                else "generate"
+            ),
+            ["graph_search", "vector_retriever", "generate"],
         )
-        workflow.add_edge("graph_search", "vector_retriever")
-        workflow.add_edge("vector_retriever", "generate")
+        # Wait for both retrieval branches
+        workflow.add_edge(["graph_search", "vector_retriever"], "retrieval_context")
+        workflow.add_edge("retrieval_context", "generate")
 
         workflow.add_edge("generate", END)
 
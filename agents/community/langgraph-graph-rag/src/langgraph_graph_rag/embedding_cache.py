@@ -0,0 +1,179 @@
+import sqlite3
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterator, Sequence
+
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain_core.embeddings import Embeddings
+from langchain_core.stores import ByteStore
+
+
+class SQLiteByteStore(ByteStore):
+    """Key-value store of bytes persisted in a local SQLite file."""
+
+    # Maximum number of keys per statement, below the SQLite variable limit
+    _batch_size = 500
+
+    def __init__(self, path: str) -> None:
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS store (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+        )
+        self._connection.commit()
+        self._lock = Lock()
+
+    def mget(self, keys: Sequence[str]) -> list[bytes | None]:
+        values = {}
+        with self._lock:
+            for start in range(0, len(keys), self._batch_size):
+                batch = keys[start : start + self._batch_size]
+                values.update(
+                    self._connection.execute(
+                        "SELECT key, value FROM store WHERE key IN "
+                        f"({', '.join('?' * len(batch))})",
+                        batch,
+                    )
+                )
+        return [values.get(key) for key in keys]
+
+    def mset(self, key_value_pairs: Sequence[tuple[str, bytes]]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO store (key, value) VALUES (?, ?)",
+                key_value_pairs,
+            )
+
+    def mdelete(self, keys: Sequence[str]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM store WHERE key = ?", [(key,) for key in keys]
+            )
+
+    def yield_keys(self, *, prefix: str | None = None) -> Iterator[str]:
+        with self._lock:
+            keys = [
+                key
+                for (key,) in self._connection.execute("SELECT key FROM store")
+                if prefix is None or key.startswith(prefix)
+            ]
+        yield from keys
+
+
+class LRUByteStore(ByteStore):
+    """Bounded in-memory key-value store of bytes, in front of an optional persistent store.
+
+    The `max_size` most recently used values are kept in memory. Values missing
+    from memory are read from the persistent store, if any, and kept in memory
+    again. Written values go to both.
+
+    Args:
+        max_size: Maximum number of values kept in memory.
+        persistent_store: Store backing the in-memory values, e.g. `SQLiteByteStore`.
+    """
+
+    def __init__(
+        self, max_size: int = 100_000, persistent_store: ByteStore | None = None
+    ) -> None:
+        self.max_size = max_size
+        self.persistent_store = persistent_store
+
+        self._values: OrderedDict[str, bytes] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    def _remember(self, key: str, value: bytes) -> None:
+        self._values[key] = value
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+    def mget(self, keys: Sequence[str]) -> list[bytes | None]:
+        with self._lock:
+            values = [self._values.get(key) for key in keys]
+            for key, value in zip(keys, values):
+                if value is not None:
+                    self._values.move_to_end(key)
+
+        missing = [key for key, value in zip(keys, values) if value is None]
+        if missing and self.persistent_store is not None:
+            stored = dict(zip(missing, self.persistent_store.mget(missing)))
+            values = [
+                stored.get(key) if value is None else value
+                for key, value in zip(keys, values)
+            ]
+            with self._lock:
+                for key, value in stored.items():
+                    if value is not None:
+                        self._remember(key, value)
+
+        with self._lock:
+            found = sum(value is not None for value in values)
+            self._hits += found
+            self._misses += len(keys) - found
+        return values
+
+    def mset(self, key_value_pairs: Sequence[tuple[str, bytes]]) -> None:
+        if self.persistent_store is not None:
+            self.persistent_store.mset(key_value_pairs)
+        with self._lock:
+            for key, value in key_value_pairs:
+                self._remember(key, value)
+
+    def mdelete(self, keys: Sequence[str]) -> None:
+        if self.persistent_store is not None:
+            self.persistent_store.mdelete(keys)
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def yield_keys(self, *, prefix: str | None = None) -> Iterator[str]:
+        if self.persistent_store is not None:
+            yield from self.persistent_store.yield_keys(prefix=prefix)
+            return
+        with self._lock:
+            keys = [k for k in self._values if prefix is None or k.startswith(prefix)]
+        yield from keys
+
+    def stats(self) -> dict:
+        """Get the number of values in memory, hits, misses and the hit ratio."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._values),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+
+def cache_embeddings(
+    embeddings: Embeddings,
+    model_id: str,
+    max_size: int = 100_000,
+    path: str | None = None,
+) -> CacheBackedEmbeddings:
+    """Wrap the embedding model with a content-addressed embedding cache.
+
+    Embeddings of both documents and queries are cached, keyed by the model id
+    and the SHA-256 hash of the text, so only texts never embedded by the model
+    are sent to the embedding service.
+
+    Args:
+        embeddings: Embedding model, e.g. `WatsonxEmbeddings`.
+        model_id: ID of the embedding model, embeddings of other models are not reused.
+        max_size: Maximum number of embeddings kept in memory.
+        path: Path of the SQLite file persisting the embeddings, in memory only if None.
+    """
+    store = LRUByteStore(
+        max_size=max_size,
+        persistent_store=SQLiteByteStore(path) if path else None,
+    )
+    return CacheBackedEmbeddings.from_bytes_store(
+        embeddings,
+        store,
+        namespace=f"{model_id}:",
+        query_embedding_cache=True,
+        key_encoder="sha256",
+    )
@@ -0,0 +1,177 @@
+import os
+import time
+import weakref
+from threading import Lock
+
+from ibm_watsonx_ai import APIClient
+from langchain_ibm import WatsonxEmbeddings
+from langchain_neo4j import Neo4jGraph, Neo4jVector
+
+from .embedding_cache import cache_embeddings
+from .secret_cache import SecretCache
+
+
+class Neo4jConnectionPool:
+    """Neo4j graph and vector index shared by all requests of the deployment.
+
+    The underlying Neo4j driver keeps a thread-safe pool of connections, so a single
+    `Neo4jGraph` and `Neo4jVector` pair can serve concurrent requests. Connectivity is
+    verified at most once per `health_check_interval` seconds, without blocking the
+    other requests, and the connection is re-established (with freshly resolved
+    credentials) when the check fails. The driver of the replaced connection is
+    closed once the requests still using it complete.
+    Question embeddings are cached, see `cache_embeddings`.
+    """
+
+    def __init__(
+        self,
+        api_client: APIClient,
+        embedding_model_id: str,
+        secret_cache: SecretCache,
+        secret_id: str,
+        health_check_interval: float = 30.0,
+        max_connection_pool_size: int = 100,
+        embedding_cache_max_size: int = 100_000,
+        embedding_cache_path: str | None = None,
+    ) -> None:
+        self.secret_cache = secret_cache
+        self.secret_id = secret_id
+        self.health_check_interval = health_check_interval
+        self.max_connection_pool_size = max_connection_pool_size
+
+        self.embedding_func = cache_embeddings(
+            WatsonxEmbeddings(model_id=embedding_model_id, watsonx_client=api_client),
+            model_id=embedding_model_id,
+            max_size=embedding_cache_max_size,
+            path=embedding_cache_path,
+        )
+
+        self._connection: tuple[Neo4jGraph, Neo4jVector] | None = None
+        self._last_health_check = 0.0
+        # Finalizers closing the drivers of replaced connections
+        self._retired: list[weakref.finalize] = []
+        self._lock = Lock()
+        self._connect_lock = Lock()
+
+    def _get_connection_args(self) -> dict:
+        """Read Neo4j connection arguments from env variables or Secrets Manager."""
+        if os.environ.get("NEO4J_CONN_ARGS_FROM_ENV") == "True":
+            return {
+                "url": os.environ.get("NEO4J_URI"),
+                "username": os.environ.get("NEO4J_USERNAME"),
+                "password": os.environ.get("NEO4J_PASSWORD"),
+                "database": os.environ.get("NEO4J_DATABASE"),
+            }
+
+        try:
+            secret_data = self.secret_cache.get(self.secret_id)
+        except Exception as e:
+            raise RuntimeError(
+                f"Make sure that Secret Manager configuration parameters are correct: `service_manager_service_url` and `secret_id`. Reason: {str(e)}"
+            ) from e
+
+        return {
+            "url": secret_data["neo4j_uri"],
+            "username": secret_data["neo4j_username"],
+            "password": secret_data["neo4j_password"],
+            "database": secret_data["neo4j_database"],
+        }
+
+    def _connect(self) -> tuple[Neo4jGraph, Neo4jVector]:
+        graph = Neo4jGraph(
+            **self._get_connection_args(),
+            driver_config={"max_connection_pool_size": self.max_connection_pool_size},
+        )
+
+        vector_index = Neo4jVector.from_existing_index(
+            graph=graph,
+            embedding=self.embedding_func,
+            index_name="vector",
+            keyword_index_name="keyword",
+            search_type="hybrid",
+            node_label="Document",
+            embedding_node_property="embedding",
+        )
+        return graph, vector_index
+
+    @staticmethod
+    def _is_healthy(graph: Neo4jGraph) -> bool:
+        try:
+            graph.query("RETURN 1")
+        except Exception:
+            return False
+        return True
+
+    def _health_check_due(self) -> bool:
+        return time.monotonic() - self._last_health_check > self.health_check_interval
+
+    def get(self) -> tuple[Neo4jGraph, Neo4jVector]:
+        """Get the shared graph and vector index, (re)connecting if needed."""
+        with self._lock:
+            connection = self._connection
+            if connection is not None and not self._health_check_due():
+                return connection
+
+        # A single thread checks the connection, or reconnects, outside the lock,
+        # while the others keep using the current connection
+        if not self._connect_lock.acquire(blocking=connection is None):
+            return connection
+        try:
+            with self._lock:
+                connection = self._connection
+            if connection is not None and not self._health_check_due():
+                # Checked by another thread in the meantime
+                return connection
+
+            if connection is not None and self._is_healthy(connection[0]):
+                new_connection = connection
+            else:
+                if connection is not None:
+                    # The check may have failed because the credentials were rotated
+                    self.secret_cache.invalidate(self.secret_id)
+                new_connection = self._connect()
+
+            with self._lock:
+                self._last_health_check = time.monotonic()
+                if new_connection is not connection:
+                    self._connection = new_connection
+                    if connection is not None:
+                        self._retire(connection)
+                return new_connection
+        finally:
+            self._connect_lock.release()
+
+    def _retire(self, connection: tuple[Neo4jGraph, Neo4jVector]) -> None:
+        """Close the driver of the replaced connection once no request uses it."""
+        graph, vector_index = connection
+        users = [2]
+
+        def release(driver) -> None:
+            users[0] -= 1
+            if users[0] == 0:
+                try:
+                    driver.close()
+                except Exception:
+                    pass
+
+        # Requests hold the graph and vector index, which share the driver,
+        # until they complete
+        self._retired = [
+            finalizer for finalizer in self._retired if finalizer.alive
+        ] + [
+            weakref.finalize(graph, release, graph._driver),
+            weakref.finalize(vector_index, release, graph._driver),
+        ]
+
+    def close(self) -> None:
+        """Close the Neo4j drivers and all their pooled connections."""
+        with self._lock:
+            connection, self._connection = self._connection, None
+            retired, self._retired = self._retired, []
+        if connection is not None:
+            try:
+                connection[0].close()
+            except Exception:
+                pass
+        for finalizer in retired:
+            finalizer()
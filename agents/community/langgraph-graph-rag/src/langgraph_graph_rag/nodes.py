@@ -1,13 +1,11 @@
-import os
 from typing import Annotated, Sequence, List, Literal
 
 from typing_extensions import TypedDict
 
 from langgraph.graph.message import add_messages
 
-from langchain_ibm import ChatWatsonx, WatsonxEmbeddings
+from langchain_ibm import ChatWatsonx
 
-from langchain_neo4j import Neo4jGraph, Neo4jVector
 from langchain_neo4j.vectorstores.neo4j_vector import remove_lucene_chars
 
 from langchain_core.messages import (
@@ -19,15 +17,16 @@ from langchain_core.messages import (
 from langchain_core.prompts import ChatPromptTemplate
 from ibm_watsonx_ai import APIClient
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-from ibm_cloud_sdk_core.authenticators import BearerTokenAuthenticator
-from ibm_secrets_manager_sdk.secrets_manager_v2 import SecretsManagerV2
+from .neo4j_pool import Neo4jConnectionPool
+from .query_cache import KnowledgeGraphCache, normalize_query
 
 
 class AgentState(TypedDict):
     # The add_messages function defines how an update should be processed
     question: str
+    entities: List[str]
     structured_data: str
     unstructured_data: List[str]
     messages: Annotated[Sequence[BaseMessage], add_messages]
@@ -45,15 +44,56 @@ class Entities(BaseModel):
     )
 
 
+# Route chosen by the agent
+class Router(BaseModel):
+    route: Literal["graph_knowledge_base", "final_answer"] = Field(
+        description=(
+            "Literal type that can only take two values 'graph_knowledge_base' or 'final_answer'. "
+            "This field determines the path or the specific operation that the router will handle."
+        )
+    )
+
+
+# Route and entities of the question, chosen in a single LLM call
+class RouterWithEntities(Router):
+    # The tool is named after the title, so both variants are called "Router"
+    model_config = ConfigDict(title="Router")
+
+    entities: List[str] = Field(
+        default_factory=list,
+        description=(
+            "All the person, organization, or business entities that appear "
+            "in the user query. Empty if the route is 'final_answer'."
+        ),
+    )
+
+
+# Entity extraction modes:
+# - "separate": entities are extracted with a second LLM call after routing,
+# - "combined": entities are extracted by the routing LLM call,
+# - "fulltext": entities are matched against the `entity` full-text index, without LLM.
+EntityExtractionMode = Literal["separate", "combined", "fulltext"]
+
+# Words skipped when matching the question against the `entity` full-text index
+STOP_WORDS = frozenset(
+    "a about after all also an and any are as at be been before between but by can "
+    "could did do does for from had has have how i if in into is it its me more most "
+    "my no not of on or other our over same should so some such than that the their "
+    "them then there these they this those through to under up was we were what when "
+    "where which while who whom why will with would you your".split()
+)
+
+
 class GraphNodes:
     def __init__(
         self,
         api_client: APIClient,
         system_message: SystemMessage,
         model_id: str,
-        embedding_model_id: str,
-        service_manager_service_url: str,
-        secret_id: str,
+        neo4j_pool: Neo4jConnectionPool,
+        entity_extraction_mode: EntityExtractionMode = "combined",
+        fulltext_min_score: float = 1.0,
+        query_cache: KnowledgeGraphCache | None = None,
     ) -> None:
         self.api_client = api_client
         self.llm = ChatWatsonx(model_id=model_id, watsonx_client=api_client)
@@ -61,50 +101,17 @@ class GraphNodes:
             model_id=model_id, watsonx_client=api_client, streaming=False
         )
 
-        embedding_func = WatsonxEmbeddings(
-            model_id=embedding_model_id, watsonx_client=api_client
-        )
-
-        # Neo4j
-        if os.environ.get("NEO4J_CONN_ARGS_FROM_ENV") == "True":
-            url = os.environ.get("NEO4J_URI")
-            username = os.environ.get("NEO4J_USERNAME")
-            password = os.environ.get("NEO4J_PASSWORD")
-            database = os.environ.get("NEO4J_DATABASE")
-        else:
-            try:
-                authenticator = BearerTokenAuthenticator(api_client.token)
-                secretsManager = SecretsManagerV2(authenticator=authenticator)
-                secretsManager.set_service_url(service_url=service_manager_service_url)
-                response = secretsManager.get_secret(id=secret_id)
-            except Exception as e:
-                raise RuntimeError(
-                    f"Make sure that Secret Manager configuration parameters are correct: `service_manager_service_url` and `secret_id`. Reason: {str(e)}"
-                ) from e
-
-            url = response.result["data"]["neo4j_uri"]
-            username = response.result["data"]["neo4j_username"]
-            password = response.result["data"]["neo4j_password"]
-            database = response.result["data"]["neo4j_database"]
-
-        self.graph = Neo4jGraph(
-            url=url,
-            username=username,
-            password=password,
-            database=database,
-        )
+        # Neo4j connections are shared between requests
+        self.graph, self.vector_index = neo4j_pool.get()
 
-        self.vector_index = Neo4jVector.from_existing_index(
-            graph=self.graph,
-            embedding=embedding_func,
-            index_name="vector",
-            keyword_index_name="keyword",
-            search_type="hybrid",
-            node_label="Document",
-            embedding_node_property="embedding",
-        )
+        # Results of repeated queries are shared between requests
+        self.query_cache = query_cache
+        if query_cache is not None:
+            query_cache.check_version(self.graph)
 
         self.system_message = system_message
+        self.entity_extraction_mode = entity_extraction_mode
+        self.fulltext_min_score = fulltext_min_score
 
     def agent(self, state: AgentState, knowledge_graph_description: str) -> dict:
         """
@@ -119,13 +126,11 @@ class GraphNodes:
             dict: The updated state with the route
         """
 
-        class Router(BaseModel):
-            route: Literal["graph_knowledge_base", "final_answer"] = Field(
-                description=(
-                    "Literal type that can only take two values 'graph_knowledge_base' or 'final_answer'. "
-                    "This field determines the path or the specific operation that the router will handle."
-                )
-            )
+        if self.entity_extraction_mode == "combined":
+            # Extract the entities in the same LLM call, to save a round trip
+            router = RouterWithEntities
+        else:
+            router = Router
 
         # Adding knowledge base description will increase the quality of model response
         system_message = SystemMessage(
@@ -139,10 +144,13 @@ class GraphNodes:
         )
         user_query = state["messages"][-1].content
         human_message = HumanMessage(content=f"User query: {user_query}")
-        llm_with_tool = self.llm_no_stream.bind_tools([Router], tool_choice="Router")
+        llm_with_tool = self.llm_no_stream.bind_tools([router], tool_choice="Router")
         response = llm_with_tool.invoke([system_message, human_message])
 
-        update_state = {"question": user_query}
+        update_state = {
+            "question": user_query,
+            "entities": response.tool_calls[0]["args"].get("entities") or [],
+        }
         if response.tool_calls[0]["args"]["route"] == "graph_knowledge_base":
             response.response_metadata["finish_reason"] = "tool_calls"
             return update_state | {
@@ -173,6 +181,37 @@ class GraphNodes:
 
         return entity_chain.invoke({"question": question}).names
 
+    def _match_entities(self, question: str) -> list[str]:
+        """Match the question words against the `entity` full-text index."""
+        words = [
+            word
+            for word in remove_lucene_chars(question).split()
+            if len(word) > 2 and word.lower() not in STOP_WORDS
+        ]
+        if not words:
+            return []
+
+        response = self.graph.query(
+            """CALL db.index.fulltext.queryNodes('entity', $query, {limit:10})
+            YIELD node,score
+            WHERE score >= $min_score
+            RETURN DISTINCT node.id AS id
+            """,
+            {
+                "query": " OR ".join(f"{word}~1" for word in words),
+                "min_score": self.fulltext_min_score,
+            },
+        )
+        return [el["id"] for el in response]
+
+    def get_entities(self, state: AgentState) -> list[str]:
+        """Get the entities of the question, according to the extraction mode."""
+        if self.entity_extraction_mode == "combined":
+            return state.get("entities") or []
+        elif self.entity_extraction_mode == "fulltext":
+            return self._match_entities(state["question"])
+        return self._retrieve_entities(state["question"])
+
     def _generate_full_text_query(self, input_text: str) -> str:
         """
         Generate a full-text search query for a given input string.
@@ -199,30 +238,60 @@ class GraphNodes:
         Returns:
             dict: The updated Agent state with updated structured data
         """
-        question = state["question"]
-        entities = self._retrieve_entities(question)
+        # Queries differing only by case and whitespace have the same results
+        full_text_queries = {}
+        for entity in self.get_entities(state):
+            if remove_lucene_chars(entity).split():
+                query = self._generate_full_text_query(entity)
+                full_text_queries.setdefault(normalize_query(query), query)
+        if not full_text_queries:
+            return {"structured_data": ""}
+
+        outputs = {}
+        if self.query_cache is not None:
+            for key in full_text_queries:
+                cached = self.query_cache.graph_search.get(key)
+                if cached is not None:
+                    outputs[key] = cached
+
+        missing_keys = [key for key in full_text_queries if key not in outputs]
+        if missing_keys:
+            found = self._search_neighbourhoods(
+                [full_text_queries[key] for key in missing_keys]
+            )
+            for key, key_outputs in zip(missing_keys, found):
+                outputs[key] = key_outputs
+                if self.query_cache is not None:
+                    self.query_cache.graph_search.put(key, key_outputs)
 
-        result = ""
-        for entity in entities:
-            response = self.graph.query(
-                """CALL db.index.fulltext.queryNodes('entity', $query, {limit:2})
+        result = "".join("\n".join(outputs[key]) + "\n" for key in full_text_queries)
+
+        return {
+            "structured_data": result,
+        }
+
+    def _search_neighbourhoods(self, full_text_queries: list[str]) -> list[list[str]]:
+        """Get the neighbourhood of the entities matching each full-text query."""
+        # Look up the neighbourhood of all entities in a single round trip
+        response = self.graph.query(
+            """UNWIND range(0, size($queries) - 1) AS i
+            CALL db.index.fulltext.queryNodes('entity', $queries[i], {limit:2})
             YIELD node,score
-            CALL () {
+            CALL (node) {
               MATCH (node)-[r:!MENTIONS]->(neighbor)
               RETURN node.id + ' - ' + type(r) + ' -> ' + neighbor.id AS output
               UNION
               MATCH (node)<-[r:!MENTIONS]-(neighbor)
               RETURN neighbor.id + ' - ' + type(r) + ' -> ' +  node.id AS output
             }
-            RETURN output LIMIT 20
+            WITH i, collect(output)[..20] AS outputs
+            RETURN i, outputs
             """,
-                {"query": self._generate_full_text_query(entity)},
-            )
-            result += "\n".join([el["output"] for el in response]) + "\n"
-
-        return {
-            "structured_data": result,
-        }
+            {"queries": full_text_queries},
+        )
+        # Queries not matching any entity have no row
+        outputs = {el["i"]: el["outputs"] for el in response}
+        return [outputs.get(i, []) for i in range(len(full_text_queries))]
 
     def unstructured_retriever(self, state: AgentState) -> dict:
         """Vector retriever node.
@@ -234,14 +303,43 @@ class GraphNodes:
             dict: The updated Agent state with updated unstructured_data
         """
         question = state["question"]
-        unstructured_data = [
-            el.page_content for el in self.vector_index.similarity_search(question)
-        ]
+        if self.query_cache is None:
+            unstructured_data = [
+                el.page_content for el in self.vector_index.similarity_search(question)
+            ]
+            return {"unstructured_data": unstructured_data}
+
+        # Look up the question, then near-duplicate questions by their embedding
+        cache = self.query_cache.vector_retrieval
+        key = normalize_query(question)
+        unstructured_data = cache.get(key, count_miss=False)
+        if unstructured_data is None:
+            embedding = self.vector_index.embedding.embed_query(question)
+            unstructured_data = cache.get_similar(embedding)
+            if unstructured_data is None:
+                unstructured_data = [
+                    el.page_content
+                    for el in self.vector_index.similarity_search_by_vector(
+                        embedding, query=question
+                    )
+                ]
+            cache.put(key, unstructured_data, embedding)
+
+        return {"unstructured_data": unstructured_data}
+
+    def retrieval_context(self, state: AgentState) -> dict:
+        """Join node of the graph search and vector retriever branches.
+
+        Args:
+            state (AgentState): The current Agent state
 
+        Returns:
+            dict: The updated Agent state with the retrieved context message
+        """
         unstructured_context = "\n".join(
             map(
                 lambda doc: "#Document:\n" + doc + "\n",
-                unstructured_data,
+                state["unstructured_data"],
             )
         )
         context_prompt = f"""Structured data:
@@ -249,7 +347,6 @@ class GraphNodes:
 Unstructured data:\n{unstructured_context}
 """
         return {
-            "unstructured_data": unstructured_data,
             "messages": [
                 ToolMessage(
                     content=context_prompt,
@@ -0,0 +1,282 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from langchain_neo4j import Neo4jGraph
+
+# Marker node updated by every ingestion into the knowledge graph
+KNOWLEDGE_GRAPH_VERSION_QUERY = """
+OPTIONAL MATCH (v:__KnowledgeGraphVersion__)
+RETURN v.version AS version
+"""
+BUMP_KNOWLEDGE_GRAPH_VERSION_QUERY = """
+MERGE (v:__KnowledgeGraphVersion__)
+SET v.version = randomUUID()
+"""
+
+
+def bump_knowledge_graph_version(graph: "Neo4jGraph") -> None:
+    """Mark the knowledge graph as changed, invalidating the query caches of all deployments."""
+    graph.query(BUMP_KNOWLEDGE_GRAPH_VERSION_QUERY)
+
+
+def normalize_query(text: str) -> str:
+    """Normalize case and whitespace, which do not change the search results."""
+    return " ".join(text.lower().split())
+
+
+class _EmbeddingMatrix:
+    """Unit embeddings of cached queries, stored in the rows of a preallocated matrix.
+
+    Adding or removing an embedding updates a single row, the matrix doubles in size
+    when full. Rows of removed embeddings are zeroed and reused.
+    """
+
+    def __init__(self, initial_rows: int = 64) -> None:
+        self.initial_rows = initial_rows
+        self.matrix: np.ndarray | None = None
+        self.size = 0
+        self._keys: list[Any] = []
+        self._rows: dict[Any, int] = {}
+        self._free_rows: list[int] = []
+
+    def add(self, key: Any, embedding: np.ndarray) -> None:
+        if self.matrix is None:
+            self.matrix = np.zeros((self.initial_rows, len(embedding)), np.float32)
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._keys[row] = key
+        else:
+            row = self.size
+            if row == len(self.matrix):
+                # Earlier snapshots keep the previous matrix
+                self.matrix = np.concatenate([self.matrix, np.zeros_like(self.matrix)])
+            self._keys.append(key)
+            self.size += 1
+
+        self.matrix[row] = embedding
+        self._rows[key] = row
+
+    def remove(self, key: Any) -> None:
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self.matrix[row] = 0.0
+            self._keys[row] = None
+            self._free_rows.append(row)
+
+    def key(self, row: int) -> Any | None:
+        """Get the key of the embedding in the row, None if the row is not in use."""
+        return self._keys[row] if row < self.size else None
+
+    def snapshot(self) -> np.ndarray | None:
+        """Get the rows in use, to be multiplied outside of the cache lock."""
+        if not self._rows:
+            return None
+        return self.matrix[: self.size]
+
+
+@dataclass
+class _CachedResult:
+    value: Any
+    expires_at: float
+    embedding: np.ndarray | None = None
+
+
+class QueryCache:
+    """Bounded in-memory LRU cache of query results, with TTL.
+
+    Results can also be looked up by embedding: `get_similar` returns the result of
+    a cached query whose embedding has a cosine similarity of at least
+    `similarity_threshold` with the given one, so near-duplicate questions share
+    their results.
+
+    Args:
+        max_size: Maximum number of cached results, the least recently used are evicted.
+        ttl: Number of seconds after which a cached result expires.
+        similarity_threshold: Minimum cosine similarity of near-duplicate queries.
+        clock: Monotonic clock used to measure the age of cached results.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 600.0,
+        similarity_threshold: float = 0.97,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.clock = clock
+
+        self._results: OrderedDict[str, _CachedResult] = OrderedDict()
+        # Embeddings of the cached results, updated with each change
+        self._embeddings = _EmbeddingMatrix()
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    def get(self, key: str, count_miss: bool = True) -> Any | None:
+        """Get the cached result of the query, or None.
+
+        With `count_miss=False`, a miss is not counted in the statistics, e.g. when
+        it is followed by a `get_similar` lookup of the same query.
+        """
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and self.clock() >= cached.expires_at:
+                self._remove(key)
+                cached = None
+
+            if cached is None:
+                self._misses += count_miss
+                return None
+
+            self._results.move_to_end(key)
+            self._hits += 1
+            return cached.value
+
+    def get_similar(self, embedding: Sequence[float]) -> Any | None:
+        """Get the cached result of the most similar query, if similar enough, or None."""
+        embedding = self._unit(embedding)
+        with self._lock:
+            matrix = self._embeddings.snapshot()
+
+        # Other requests use the cache while the similarities are computed, the best
+        # match is checked again under the lock, as its row may have been reused
+        best = None
+        if matrix is not None:
+            best = int((matrix @ embedding).argmax())
+
+        with self._lock:
+            if best is not None:
+                key = self._embeddings.key(best)
+                cached = self._results.get(key)
+                if (
+                    cached is not None
+                    and cached.embedding is not None
+                    and float(cached.embedding @ embedding) >= self.similarity_threshold
+                    and self.clock() < cached.expires_at
+                ):
+                    self._results.move_to_end(key)
+                    self._hits += 1
+                    return cached.value
+
+            self._misses += 1
+            return None
+
+    def put(
+        self, key: str, value: Any, embedding: Sequence[float] | None = None
+    ) -> None:
+        """Cache the result of the query, optionally with the query embedding."""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._results[key] = _CachedResult(
+                value=value,
+                expires_at=self.clock() + self.ttl,
+                embedding=None if embedding is None else self._unit(embedding),
+            )
+            if embedding is not None:
+                self._embeddings.add(key, self._results[key].embedding)
+
+            while len(self._results) > self.max_size:
+                self._remove(next(iter(self._results)))
+
+    @staticmethod
+    def _unit(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _remove(self, key: str) -> None:
+        cached = self._results.pop(key, None)
+        if cached is not None and cached.embedding is not None:
+            self._embeddings.remove(key)
+
+    def invalidate(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._results.clear()
+            self._embeddings = _EmbeddingMatrix()
+
+    def stats(self) -> dict:
+        """Get the number of cached results, hits, misses and the hit ratio."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._results),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+
+class KnowledgeGraphCache:
+    """Caches of the graph search and vector retrieval results of the knowledge graph.
+
+    Both caches are dropped when the knowledge graph changes: ingestion scripts call
+    `bump_knowledge_graph_version`, and the version is read from Neo4j at most
+    once per `version_check_interval` seconds.
+
+    Args:
+        max_size: Maximum number of cached results of each cache.
+        ttl: Number of seconds after which a cached result expires.
+        similarity_threshold: Minimum cosine similarity of the embeddings
+            of near-duplicate questions sharing their vector retrieval results.
+        version_check_interval: Number of seconds between knowledge graph version checks.
+        clock: Monotonic clock used to measure the age of cached results.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 600.0,
+        similarity_threshold: float = 0.97,
+        version_check_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.version_check_interval = version_check_interval
+        self.clock = clock
+
+        self.graph_search = QueryCache(max_size, ttl, clock=clock)
+        self.vector_retrieval = QueryCache(
+            max_size, ttl, similarity_threshold=similarity_threshold, clock=clock
+        )
+
+        self._version: str | None = None
+        self._next_version_check = 0.0
+        self._lock = Lock()
+
+    def check_version(self, graph: "Neo4jGraph") -> None:
+        """Drop the cached results if the knowledge graph changed since the last check."""
+        with self._lock:
+            if self.clock() < self._next_version_check:
+                return
+            self._next_version_check = self.clock() + self.version_check_interval
+
+        # Other requests keep using the cache while the version is read
+        version = graph.query(KNOWLEDGE_GRAPH_VERSION_QUERY)[0]["version"]
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop the cached results of both caches."""
+        self.graph_search.invalidate()
+        self.vector_retrieval.invalidate()
+
+    def stats(self) -> dict:
+        """Get the statistics of both caches."""
+        return {
+            "graph_search": self.graph_search.stats(),
+            "vector_retrieval": self.vector_retrieval.stats(),
+        }
@@ -0,0 +1,121 @@
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from threading import Lock, Thread
+from typing import Callable, TYPE_CHECKING
+
+from ibm_cloud_sdk_core.authenticators import BearerTokenAuthenticator
+from ibm_secrets_manager_sdk.secrets_manager_v2 import SecretsManagerV2
+
+if TYPE_CHECKING:
+    from ibm_watsonx_ai import APIClient
+
+
+def secrets_manager_fetcher(
+    api_client: "APIClient", service_manager_service_url: str
+) -> Callable[[str], dict]:
+    """Get function reading the secret data from IBM Cloud Secrets Manager.
+
+    The Secrets Manager client is authenticated with the current `api_client` token
+    at the time of each fetch, so refreshes use the latest request token.
+    """
+
+    def fetch_secret(secret_id: str) -> dict:
+        authenticator = BearerTokenAuthenticator(api_client.token)
+        secretsManager = SecretsManagerV2(authenticator=authenticator)
+        secretsManager.set_service_url(service_url=service_manager_service_url)
+        response = secretsManager.get_secret(id=secret_id)
+
+        return response.result["data"]
+
+    return fetch_secret
+
+
+@dataclass
+class _CachedSecret:
+    data: dict
+    refresh_at: float
+    expires_at: float
+
+
+class SecretCache:
+    """In-memory TTL cache of secrets with single-flight fetches.
+
+    Concurrent lookups of a missing or expired secret share a single fetch.
+    Once a cached secret is older than `(1 - refresh_ahead) * ttl`, it is
+    refreshed in a background thread while the cached value keeps being served,
+    so secret fetches stay off the request path as long as the secret is in use.
+
+    Args:
+        fetch_secret: Function returning the secret data for a given secret id.
+        ttl: Number of seconds after which a cached secret expires.
+        refresh_ahead: Fraction of `ttl` before expiry when the background refresh starts.
+        clock: Monotonic clock used to measure the age of cached secrets.
+    """
+
+    def __init__(
+        self,
+        fetch_secret: Callable[[str], dict],
+        ttl: float = 3600.0,
+        refresh_ahead: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.fetch_secret = fetch_secret
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.clock = clock
+
+        self._secrets: dict[str, _CachedSecret] = {}
+        self._in_flight: dict[str, Future] = {}
+        self._lock = Lock()
+
+    def get(self, secret_id: str) -> dict:
+        """Get the secret data, fetching it only when not cached or expired."""
+        with self._lock:
+            now = self.clock()
+            cached = self._secrets.get(secret_id)
+
+            if cached is not None and now < cached.expires_at:
+                if now >= cached.refresh_at and secret_id not in self._in_flight:
+                    future = self._in_flight[secret_id] = Future()
+                    Thread(
+                        target=self._fetch, args=(secret_id, future), daemon=True
+                    ).start()
+                return cached.data
+
+            future = self._in_flight.get(secret_id)
+            is_owner = future is None
+            if is_owner:
+                future = self._in_flight[secret_id] = Future()
+
+        if is_owner:
+            self._fetch(secret_id, future)
+
+        return future.result()
+
+    def _fetch(self, secret_id: str, future: Future) -> None:
+        try:
+            data = self.fetch_secret(secret_id)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[secret_id]
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            now = self.clock()
+            self._secrets[secret_id] = _CachedSecret(
+                data=data,
+                refresh_at=now + self.ttl * (1 - self.refresh_ahead),
+                expires_at=now + self.ttl,
+            )
+            del self._in_flight[secret_id]
+        future.set_result(data)
+
+    def invalidate(self, secret_id: str | None = None) -> None:
+        """Drop the given secret, or all secrets, from the cache."""
+        with self._lock:
+            if secret_id is None:
+                self._secrets.clear()
+            else:
+                self._secrets.pop(secret_id, None)
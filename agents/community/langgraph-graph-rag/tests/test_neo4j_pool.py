@@ -0,0 +1,145 @@
+import gc
+import threading
+
+import pytest
+
+from langgraph_graph_rag import neo4j_pool
+from langgraph_graph_rag.neo4j_pool import Neo4jConnectionPool
+from langgraph_graph_rag.secret_cache import SecretCache
+
+
+class FakeDriver:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeGraph:
+    """Stand-in of `Neo4jGraph`, whose health check can be failed or blocked."""
+
+    connections = 0
+    healthy = True
+    check_started = threading.Event()
+    check_released = threading.Event()
+
+    def __init__(self, **kwargs) -> None:
+        self.connection_args = kwargs
+        self._driver = FakeDriver()
+        FakeGraph.connections += 1
+
+    def query(self, query: str) -> list:
+        FakeGraph.check_started.set()
+        FakeGraph.check_released.wait(5)
+        if not FakeGraph.healthy:
+            raise ConnectionError("Neo4j unavailable")
+        return [{"1": 1}]
+
+    def close(self) -> None:
+        self._driver.close()
+
+
+class FakeVector:
+    def __init__(self, driver: FakeDriver) -> None:
+        self._driver = driver
+
+    @classmethod
+    def from_existing_index(cls, graph: FakeGraph, **kwargs) -> "FakeVector":
+        return cls(graph._driver)
+
+
+@pytest.fixture
+def pool(monkeypatch) -> Neo4jConnectionPool:
+    FakeGraph.connections = 0
+    FakeGraph.healthy = True
+    FakeGraph.check_started = threading.Event()
+    FakeGraph.check_released = threading.Event()
+    FakeGraph.check_released.set()
+
+    monkeypatch.setenv("NEO4J_CONN_ARGS_FROM_ENV", "True")
+    monkeypatch.setattr(neo4j_pool, "Neo4jGraph", FakeGraph)
+    monkeypatch.setattr(neo4j_pool, "Neo4jVector", FakeVector)
+    monkeypatch.setattr(neo4j_pool, "WatsonxEmbeddings", lambda **kwargs: None)
+    monkeypatch.setattr(neo4j_pool, "cache_embeddings", lambda embeddings, **kw: None)
+
+    pool = Neo4jConnectionPool(
+        api_client=None,
+        embedding_model_id="model",
+        secret_cache=SecretCache(lambda secret_id: {}),
+        secret_id="secret",
+        health_check_interval=0,
+    )
+    yield pool
+    FakeGraph.check_released.set()
+    pool.close()
+
+
+class TestNeo4jConnectionPool:
+    def test_connection_is_shared(self, pool):
+        pool.health_check_interval = 60
+
+        assert pool.get() is pool.get()
+        assert FakeGraph.connections == 1
+
+    def test_health_check_does_not_block_other_requests(self, pool):
+        connection = pool.get()
+        FakeGraph.check_released.clear()
+
+        checker = threading.Thread(target=pool.get)
+        checker.start()
+        assert FakeGraph.check_started.wait(5)
+
+        # The check is still running, the current connection is returned meanwhile
+        assert pool.get() is connection
+
+        FakeGraph.check_released.set()
+        checker.join(5)
+        assert pool.get() is connection
+        assert FakeGraph.connections == 1
+
+    def test_failed_check_reconnects_and_keeps_old_driver_for_its_users(self, pool):
+        old_graph, old_vector_index = pool.get()
+        old_driver = old_graph._driver
+
+        FakeGraph.healthy = False
+        new_graph, _ = pool.get()
+
+        assert new_graph is not old_graph
+        # A request still holds the old graph and vector index
+        assert not old_driver.closed
+
+        del old_graph, old_vector_index
+        gc.collect()
+        assert old_driver.closed
+        assert not new_graph._driver.closed
+
+    def test_close_closes_current_and_replaced_drivers(self, pool):
+        old_graph, _ = pool.get()
+        FakeGraph.healthy = False
+        new_graph, _ = pool.get()
+
+        pool.close()
+
+        assert old_graph._driver.closed
+        assert new_graph._driver.closed
+
+    def test_failed_check_reconnects_with_rotated_credentials(self, pool, monkeypatch):
+        monkeypatch.delenv("NEO4J_CONN_ARGS_FROM_ENV")
+        secret = {
+            "neo4j_uri": "neo4j://localhost",
+            "neo4j_username": "neo4j",
+            "neo4j_password": "old",
+            "neo4j_database": "neo4j",
+        }
+        pool.secret_cache = SecretCache(lambda secret_id: dict(secret))
+
+        old_graph, _ = pool.get()
+        secret["neo4j_password"] = "new"
+        assert pool.get()[0] is old_graph
+
+        FakeGraph.healthy = False
+        new_graph, _ = pool.get()
+
+        assert old_graph.connection_args["password"] == "old"
+        assert new_graph.connection_args["password"] == "new"
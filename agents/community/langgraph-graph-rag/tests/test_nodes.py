@@ -0,0 +1,131 @@
+from unittest import mock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from langgraph_graph_rag import agent, nodes
+from langgraph_graph_rag.nodes import GraphNodes
+
+# Calls made to the fake LLM and the fake graph, pydantic models copy class fields
+llm_calls = []
+graph_queries = []
+
+
+class FakeChatWatsonx:
+    """Stand-in of `ChatWatsonx`, routing to the knowledge graph with fixed entities."""
+
+    def __init__(self, **kwargs) -> None:
+        self.tools = []
+
+    def bind_tools(self, tools: list, **kwargs) -> "FakeChatWatsonx":
+        bound = FakeChatWatsonx()
+        bound.tools = tools
+        return bound
+
+    def with_structured_output(self, schema: type) -> RunnableLambda:
+        def extract(prompt_value):
+            llm_calls.append("extract")
+            return schema(names=["IBM"])
+
+        return RunnableLambda(extract)
+
+    def invoke(self, messages: list) -> AIMessage:
+        llm_calls.append("route")
+        args = {"route": "graph_knowledge_base"}
+        if "entities" in self.tools[0].model_fields:
+            args["entities"] = ["IBM"]
+        return AIMessage(
+            content="", tool_calls=[{"name": "Router", "args": args, "id": "call_0"}]
+        )
+
+
+class FakeGraph:
+    def query(self, query: str, params: dict | None = None) -> list:
+        graph_queries.append(params)
+        return [{"id": "IBM"}, {"id": "Red Hat"}]
+
+
+@pytest.fixture(autouse=True)
+def fakes(monkeypatch):
+    llm_calls.clear()
+    graph_queries.clear()
+    monkeypatch.setattr(nodes, "ChatWatsonx", FakeChatWatsonx)
+
+
+def make_graph_nodes(**kwargs) -> GraphNodes:
+    neo4j_pool = mock.Mock()
+    neo4j_pool.get.return_value = (FakeGraph(), None)
+    return GraphNodes(
+        api_client=None,
+        system_message=SystemMessage("system"),
+        model_id="model",
+        neo4j_pool=neo4j_pool,
+        **kwargs,
+    )
+
+
+def route(graph_nodes: GraphNodes, question: str) -> dict:
+    return graph_nodes.agent(
+        {"messages": [HumanMessage(question)]}, knowledge_graph_description="IBM"
+    )
+
+
+class TestEntityExtraction:
+    def test_combined_mode_extracts_entities_when_routing(self):
+        graph_nodes = make_graph_nodes(entity_extraction_mode="combined")
+        state = route(graph_nodes, "Who acquired Red Hat?")
+
+        assert state["route"] == "graph_knowledge_base"
+        assert graph_nodes.get_entities(state) == ["IBM"]
+        assert llm_calls == ["route"]
+
+    def test_router_tool_is_named_router(self):
+        for router in [nodes.Router, nodes.RouterWithEntities]:
+            assert convert_to_openai_tool(router)["function"]["name"] == "Router"
+
+    def test_separate_mode_extracts_entities_with_second_call(self):
+        graph_nodes = make_graph_nodes(entity_extraction_mode="separate")
+        state = route(graph_nodes, "Who acquired Red Hat?")
+
+        assert state["entities"] == []
+        assert graph_nodes.get_entities(state) == ["IBM"]
+        assert llm_calls == ["route", "extract"]
+
+    def test_fulltext_mode_matches_question_words(self):
+        graph_nodes = make_graph_nodes(
+            entity_extraction_mode="fulltext", fulltext_min_score=2.5
+        )
+        state = route(graph_nodes, "Who is the CEO of IBM?")
+
+        assert graph_nodes.get_entities(state) == ["IBM", "Red Hat"]
+        assert llm_calls == ["route"]
+        assert graph_queries == [{"query": "CEO~1 OR IBM~1", "min_score": 2.5}]
+
+    def test_fulltext_mode_skips_questions_without_words(self):
+        graph_nodes = make_graph_nodes(entity_extraction_mode="fulltext")
+
+        assert graph_nodes.get_entities({"question": "Who is he?"}) == []
+        assert graph_queries == []
+
+    def test_fulltext_min_score_is_passed_by_graph_closure(self, monkeypatch):
+        neo4j_pool = mock.Mock()
+        neo4j_pool.return_value.get.return_value = (FakeGraph(), None)
+        monkeypatch.setattr(agent, "Neo4jConnectionPool", neo4j_pool)
+        monkeypatch.setattr(agent, "SecretCache", mock.Mock())
+        graph_nodes_class = mock.Mock(wraps=GraphNodes)
+        monkeypatch.setattr(agent, "GraphNodes", graph_nodes_class)
+
+        agent.get_graph_closure(
+            None,
+            "model",
+            "embedding_model",
+            "IBM",
+            "",
+            "",
+            entity_extraction_mode="fulltext",
+            entity_fulltext_min_score=3.0,
+        )()
+
+        assert graph_nodes_class.call_args.kwargs["fulltext_min_score"] == 3.0
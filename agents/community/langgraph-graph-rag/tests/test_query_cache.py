@@ -0,0 +1,128 @@
+from langgraph_graph_rag.query_cache import (
+    KnowledgeGraphCache,
+    QueryCache,
+    normalize_query,
+)
+
+
+def one_hot(index: int, size: int) -> list[float]:
+    return [float(i == index) for i in range(size)]
+
+
+class VersionedGraph:
+    """Stand-in of `Neo4jGraph` answering the knowledge graph version query."""
+
+    def __init__(self) -> None:
+        self.version = "1"
+        self.queries = 0
+
+    def query(self, query: str) -> list[dict]:
+        self.queries += 1
+        return [{"version": self.version}]
+
+
+class TestQueryCache:
+    def test_normalize_query(self):
+        assert normalize_query("  Who founded\n IBM ") == "who founded ibm"
+
+    def test_result_expires_after_ttl(self, clock):
+        cache = QueryCache(ttl=10, clock=clock)
+        cache.put("ibm", ["IBM - FOUNDED_BY -> Charles Flint"])
+
+        clock.now = 9
+        assert cache.get("ibm") == ["IBM - FOUNDED_BY -> Charles Flint"]
+        clock.now = 10
+        assert cache.get("ibm") is None
+        assert cache.stats()["size"] == 0
+
+    def test_least_recently_used_result_is_evicted(self):
+        cache = QueryCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_zero_max_size_disables_cache(self):
+        cache = QueryCache(max_size=0)
+        cache.put("a", 1)
+
+        assert cache.get("a") is None
+
+    def test_similar_query_shares_result(self):
+        cache = QueryCache(similarity_threshold=0.9)
+        cache.put("who founded ibm", ["chunk"], [1.0, 0.0, 0.1])
+
+        assert cache.get_similar([2.0, 0.0, 0.1]) == ["chunk"]
+        assert cache.get_similar([0.0, 1.0, 0.0]) is None
+        assert cache.stats() | {"hit_ratio": None} == {
+            "size": 1,
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": None,
+        }
+
+    def test_expired_similar_query_is_not_returned(self, clock):
+        cache = QueryCache(ttl=10, clock=clock)
+        cache.put("who founded ibm", ["chunk"], [1.0, 0.0])
+
+        clock.now = 10
+        assert cache.get_similar([1.0, 0.0]) is None
+
+    def test_similarity_lookup_follows_updates_and_evictions(self):
+        cache = QueryCache(max_size=100)
+        # More embeddings than the initial rows of the matrix
+        for i in range(200):
+            cache.put(f"q{i}", i, one_hot(i, 200))
+        cache.put("q199", "updated", one_hot(199, 200))
+
+        assert cache.get_similar(one_hot(150, 200)) == 150
+        assert cache.get_similar(one_hot(199, 200)) == "updated"
+        # Evicted queries are no longer matched
+        assert cache.get_similar(one_hot(0, 200)) is None
+
+        cache.invalidate()
+        assert cache.get_similar(one_hot(150, 200)) is None
+
+    def test_removed_rows_are_reused(self):
+        cache = QueryCache(max_size=2)
+        for i in range(100):
+            cache.put(f"q{i}", i, one_hot(i % 3, 3))
+
+        assert cache._embeddings.size <= 3
+        assert cache.get_similar(one_hot(0, 3)) == 99
+        assert cache.get_similar(one_hot(1, 3)) is None
+
+
+class TestKnowledgeGraphCache:
+    def test_new_version_drops_cached_results(self, clock):
+        cache = KnowledgeGraphCache(version_check_interval=30, clock=clock)
+        graph = VersionedGraph()
+        cache.check_version(graph)
+        cache.graph_search.put("ibm", ["IBM - FOUNDED_BY -> Charles Flint"])
+        cache.vector_retrieval.put("ibm", ["chunk"], [1.0, 0.0])
+
+        graph.version = "2"
+        clock.now = 29
+        cache.check_version(graph)
+        assert cache.graph_search.get("ibm") is not None
+        assert graph.queries == 1
+
+        clock.now = 30
+        cache.check_version(graph)
+        assert graph.queries == 2
+        assert cache.graph_search.get("ibm") is None
+        assert cache.vector_retrieval.get_similar([1.0, 0.0]) is None
+
+    def test_same_version_keeps_cached_results(self, clock):
+        cache = KnowledgeGraphCache(version_check_interval=0, clock=clock)
+        graph = VersionedGraph()
+        cache.check_version(graph)
+        cache.graph_search.put("ibm", ["IBM - FOUNDED_BY -> Charles Flint"])
+
+        cache.check_version(graph)
+        assert cache.graph_search.get("ibm") is not None
+        assert cache.stats()["graph_search"]["hits"] == 1
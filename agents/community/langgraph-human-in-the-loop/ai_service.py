@@ -1,10 +1,18 @@
-def deployable_ai_service(context, url=None, model_id=None):
-    import urllib
+def deployable_ai_service(
+    context,
+    url=None,
+    model_id=None,
+    checkpointer_max_threads=1000,
+    checkpointer_thread_ttl=86400,
+    checkpointer_spill_path=None,
+    checkpointer_spill_after=None,
+):
     from typing import Generator
     import uuid
 
+    from langgraph_hitl.client_manager import APIClientManager
     from langgraph_hitl.agent import get_graph
-    from ibm_watsonx_ai import APIClient, Credentials
+    from langgraph_hitl.checkpointer import BoundedInMemorySaver
     from langchain_core.messages import (
         BaseMessage,
         HumanMessage,
@@ -13,22 +21,24 @@ def deployable_ai_service(context, url=None, model_id=None):
     )
 
     from langgraph.types import Command
-    from langgraph.checkpoint.memory import InMemorySaver
 
-    checkpointer = InMemorySaver()
-
-    hostname = urllib.parse.urlparse(url).hostname or ""
-    is_cloud_url = hostname.lower().endswith("cloud.ibm.com")
-    instance_id = None if is_cloud_url else "openshift"
+    # Threads waiting for the human approval are kept in memory for at most
+    # `checkpointer_thread_ttl` seconds, the least recently used threads above
+    # `checkpointer_max_threads` are evicted (or moved to `checkpointer_spill_path`)
+    checkpointer = BoundedInMemorySaver(
+        max_threads=checkpointer_max_threads,
+        ttl=checkpointer_thread_ttl,
+        spill_path=checkpointer_spill_path or None,
+        spill_after=checkpointer_spill_after,
+    )
 
-    client = APIClient(
-        credentials=Credentials(
-            url=url,
-            token=context.generate_token(),
-            instance_id=instance_id,
-        ),
+    # One API client, with pooled HTTP connections, is shared by all requests
+    client_manager = APIClientManager(
+        url=url,
         space_id=context.get_space_id(),
+        token=context.generate_token(),
     )
+    client = client_manager.client
 
     graph = get_graph(client, model_id, checkpointer)
 
@@ -130,8 +140,8 @@ def deployable_ai_service(context, url=None, model_id=None):
         Please note that the `system message` MUST be placed first in the list of messages!
         """
 
-        # Overwrite inner context token in the API client
-        client.set_token(context.get_token())
+        # Use the request token for the API client calls made by this request
+        client_manager.set_token(context.get_token())
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
         messages = [convert_dict_to_message(_dict) for _dict in raw_messages]
@@ -210,8 +220,8 @@ def deployable_ai_service(context, url=None, model_id=None):
         headers = context.get_headers()
         is_assistant = headers.get("X-Ai-Interface") == "assistant"
 
-        # Overwrite inner context token in the API client
-        client.set_token(context.get_token())
+        # Use the request token for the API client calls made by this request
+        client_manager.set_token(context.get_token())
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
         thread_id = payload.get("thread_id")
@@ -249,7 +259,6 @@ def deployable_ai_service(context, url=None, model_id=None):
             elif chunk_type == "updates":
                 if agent := data.get("agent"):
                     msg_obj = agent["messages"][0]
-                    checkpointer.delete_thread(thread_id)
                     if msg_obj.response_metadata.get("finish_reason") == "stop":
                         continue
                 elif tool := data.get("tools"):
@@ -284,4 +293,8 @@ def deployable_ai_service(context, url=None, model_id=None):
                     chunk_response["thread_id"] = thread_id
                 yield chunk_response
 
+        if thread_id is None:
+            # remove thread_id from checkpointer memory, when no human approval needed
+            checkpointer.delete_thread(config["configurable"]["thread_id"])
+
     return generate, generate_stream
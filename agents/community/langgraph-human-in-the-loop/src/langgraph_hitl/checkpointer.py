@@ -0,0 +1,214 @@
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+class BoundedInMemorySaver(InMemorySaver):
+    """In-memory checkpointer keeping a bounded number of threads.
+
+    Threads not accessed for `ttl` seconds are deleted. When more than `max_threads`
+    threads are held in memory, the least recently used ones are evicted. If
+    `spill_path` is provided, evicted threads (and threads idle for `spill_after`
+    seconds) are moved to a local SQLite file instead of being deleted, and are
+    loaded back into memory when accessed again.
+
+    Args:
+        max_threads: Maximum number of threads held in memory.
+        ttl: Number of seconds after the last access when a thread is deleted.
+        spill_path: Path of the SQLite file used for evicted threads, disabled if None.
+        spill_after: Number of seconds after the last access when a thread is moved
+            to the SQLite file, only used together with `spill_path`.
+        clock: Clock returning the current time in seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_threads: int = 1000,
+        ttl: float = 24 * 60 * 60,
+        spill_path: str | None = None,
+        spill_after: float | None = None,
+        clock: Callable[[], float] = time.time,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self.ttl = ttl
+        self.spill_after = spill_after
+        self.clock = clock
+
+        # thread ID -> time of the last access, ordered from the least recently used
+        self._last_access: OrderedDict[str, float] = OrderedDict()
+        self._lock = RLock()
+        self._stats = {"evicted": 0, "expired": 0, "spilled": 0, "restored": 0}
+
+        self._spill = None
+        if spill_path:
+            self._spill = sqlite3.connect(spill_path, check_same_thread=False)
+            self._spill.execute(
+                "CREATE TABLE IF NOT EXISTS threads "
+                "(thread_id TEXT PRIMARY KEY, last_access REAL, data BLOB)"
+            )
+            self._spill.commit()
+
+    # Checkpointer interface
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            self._expire()
+            if thread_id not in self._last_access and not self._restore(thread_id):
+                return None
+            self._touch(thread_id)
+            return super().get_tuple(config)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._lock:
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            self._touch(config["configurable"]["thread_id"])
+            self._expire()
+            return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+            self._touch(config["configurable"]["thread_id"])
+            self._expire()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            super().delete_thread(thread_id)
+            self._last_access.pop(thread_id, None)
+            if self._spill is not None:
+                self._spill.execute(
+                    "DELETE FROM threads WHERE thread_id = ?", (thread_id,)
+                )
+                self._spill.commit()
+
+    # Metrics
+
+    def metrics(self) -> dict[str, int]:
+        """Get the number of held threads, their memory usage and eviction counters."""
+        with self._lock:
+            memory_bytes = 0
+            for namespaces in self.storage.values():
+                for checkpoints in namespaces.values():
+                    for checkpoint, metadata, _ in checkpoints.values():
+                        memory_bytes += len(checkpoint[1]) + len(metadata[1])
+            for writes in self.writes.values():
+                memory_bytes += sum(len(write[2][1]) for write in writes.values())
+            memory_bytes += sum(len(blob[1]) for blob in self.blobs.values())
+
+            metrics = {
+                "threads_in_memory": len(self._last_access),
+                "memory_bytes": memory_bytes,
+                "threads_spilled": 0,
+                **{f"{name}_total": count for name, count in self._stats.items()},
+            }
+            if self._spill is not None:
+                (metrics["threads_spilled"],) = self._spill.execute(
+                    "SELECT COUNT(*) FROM threads"
+                ).fetchone()
+
+            return metrics
+
+    # Eviction
+
+    def _touch(self, thread_id: str) -> None:
+        self._last_access[thread_id] = self.clock()
+        self._last_access.move_to_end(thread_id)
+
+    def _expire(self) -> None:
+        now = self.clock()
+
+        while self._last_access:
+            thread_id, last_access = next(iter(self._last_access.items()))
+            idle = now - last_access
+            if idle > self.ttl:
+                self._stats["expired"] += 1
+                self._drop(thread_id)
+            elif len(self._last_access) > self.max_threads:
+                self._stats["evicted"] += 1
+                self._evict(thread_id)
+            elif self.spill_after is not None and idle > self.spill_after:
+                self._evict(thread_id)
+            else:
+                break
+
+        if self._spill is not None:
+            cursor = self._spill.execute(
+                "DELETE FROM threads WHERE last_access < ?", (now - self.ttl,)
+            )
+            self._stats["expired"] += cursor.rowcount
+            self._spill.commit()
+
+    def _drop(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        del self._last_access[thread_id]
+
+    def _evict(self, thread_id: str) -> None:
+        """Move the thread to the SQLite file if enabled, otherwise delete it."""
+        if self._spill is not None:
+            data = {
+                "storage": {
+                    checkpoint_ns: dict(checkpoints)
+                    for checkpoint_ns, checkpoints in self.storage[thread_id].items()
+                },
+                "writes": {k: v for k, v in self.writes.items() if k[0] == thread_id},
+                "blobs": {k: v for k, v in self.blobs.items() if k[0] == thread_id},
+            }
+            # Checkpoints are already serialized, pickle only wraps the mappings
+            self._spill.execute(
+                "INSERT OR REPLACE INTO threads VALUES (?, ?, ?)",
+                (thread_id, self._last_access[thread_id], pickle.dumps(data)),
+            )
+            self._spill.commit()
+            self._stats["spilled"] += 1
+        self._drop(thread_id)
+
+    def _restore(self, thread_id: str) -> bool:
+        """Load the thread back from the SQLite file, if it was spilled."""
+        if self._spill is None:
+            return False
+
+        row = self._spill.execute(
+            "SELECT data FROM threads WHERE thread_id = ?", (thread_id,)
+        ).fetchone()
+        if row is None:
+            return False
+
+        data = pickle.loads(row[0])
+        for checkpoint_ns, checkpoints in data["storage"].items():
+            self.storage[thread_id][checkpoint_ns] = checkpoints
+        for key, writes in data["writes"].items():
+            self.writes[key] = writes
+        self.blobs.update(data["blobs"])
+
+        self._spill.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+        self._spill.commit()
+        self._stats["restored"] += 1
+        return True
@@ -0,0 +1,94 @@
+import urllib.parse
+from contextvars import ContextVar
+from threading import Lock
+
+import httpx
+from ibm_watsonx_ai import APIClient, Credentials
+from ibm_watsonx_ai.utils.auth import TokenAuth
+from ibm_watsonx_ai.utils.utils import HttpClientConfig
+
+# Token of the request handled in the current thread or asyncio task
+_request_token: ContextVar[str | None] = ContextVar("request_token", default=None)
+
+
+class RequestTokenAuth(TokenAuth):
+    """Token authentication preferring the token of the current request.
+
+    Falls back to the last token set on the client outside of requests,
+    e.g. for background refreshes.
+    """
+
+    def get_token(self) -> str:
+        return _request_token.get() or super().get_token()
+
+    async def aget_token(self) -> str:
+        return self.get_token()
+
+
+class APIClientManager:
+    """Single `APIClient` shared by all requests of the deployment.
+
+    The client, together with its pool of keep-alive HTTP connections, is created
+    once when the deployment starts, so requests do not pay for client construction
+    and TLS handshakes. The token is request-scoped: it is kept in a context variable,
+    so concurrent requests served by different threads (or asyncio tasks) each call
+    the API with their own token, without serializing on the shared client.
+
+    Args:
+        url: watsonx.ai service URL.
+        space_id: ID of the deployment space.
+        token: Initial authorization token.
+        max_connections: Maximum number of concurrent HTTP connections.
+        max_keepalive_connections: Maximum number of idle connections kept alive.
+        keepalive_expiry: Number of seconds an idle connection is kept alive.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        space_id: str,
+        token: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+    ) -> None:
+        hostname = urllib.parse.urlparse(url).hostname or ""
+        is_cloud_url = hostname.lower().endswith("cloud.ibm.com")
+        instance_id = None if is_cloud_url else "openshift"
+
+        http_client_config = HttpClientConfig(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+        )
+
+        self.client = APIClient(
+            credentials=Credentials(url=url, token=token, instance_id=instance_id),
+            space_id=space_id,
+            httpx_client=http_client_config,
+            async_httpx_client=http_client_config,
+        )
+        # Read the token of the current request on every API call
+        self.client._auth_method = RequestTokenAuth(
+            token, on_token_set=self.client._auth_method._on_token_set
+        )
+        self._token = token
+        self._lock = Lock()
+
+    def set_token(self, token: str) -> APIClient:
+        """Set the token for the current request and return the shared client.
+
+        The token applies to the client calls made from the current thread or asyncio
+        task, and from the work it dispatches with a copy of its context (asyncio tasks,
+        LangGraph nodes and tools). It also becomes the fallback token used outside
+        of requests.
+        """
+        _request_token.set(token)
+        with self._lock:
+            if token != self._token:
+                self.client.set_token(token)
+                self._token = token
+
+        return self.client
@@ -0,0 +1,102 @@
+"""Tests for the bounded checkpointer in langgraph_hitl.checkpointer."""
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from langgraph_hitl.checkpointer import BoundedInMemorySaver
+
+
+def config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+def put_checkpoint(saver: BoundedInMemorySaver, thread_id: str) -> None:
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": ["x" * 100]}
+    checkpoint["channel_versions"] = {"messages": 1}
+    next_config = saver.put(config(thread_id), checkpoint, {}, {"messages": 1})
+    saver.put_writes(next_config, [("messages", "y")], task_id="task")
+
+
+def test_evicts_least_recently_used_threads() -> None:
+    saver = BoundedInMemorySaver(max_threads=2)
+
+    put_checkpoint(saver, "a")
+    put_checkpoint(saver, "b")
+    assert saver.get_tuple(config("a")) is not None
+    put_checkpoint(saver, "c")
+
+    assert saver.get_tuple(config("a")) is not None
+    assert saver.get_tuple(config("b")) is None
+    assert saver.get_tuple(config("c")) is not None
+    assert saver.metrics()["threads_in_memory"] == 2
+    assert saver.metrics()["evicted_total"] == 1
+
+
+def test_expires_idle_threads(clock) -> None:
+    saver = BoundedInMemorySaver(ttl=60, clock=clock)
+
+    put_checkpoint(saver, "a")
+    clock.now = 30
+    put_checkpoint(saver, "b")
+    clock.now = 61
+
+    assert saver.get_tuple(config("a")) is None
+    assert saver.get_tuple(config("b")) is not None
+    assert saver.metrics()["expired_total"] == 1
+    assert not any(key[0] == "a" for key in saver.blobs)
+    assert not any(key[0] == "a" for key in saver.writes)
+
+
+def test_spills_evicted_threads_and_restores_them(tmp_path) -> None:
+    saver = BoundedInMemorySaver(max_threads=1, spill_path=str(tmp_path / "spill.db"))
+
+    put_checkpoint(saver, "a")
+    expected = saver.get_tuple(config("a"))
+    put_checkpoint(saver, "b")
+
+    metrics = saver.metrics()
+    assert metrics["threads_in_memory"] == 1
+    assert metrics["threads_spilled"] == 1
+
+    restored = saver.get_tuple(config("a"))
+    assert restored.checkpoint == expected.checkpoint
+    assert restored.pending_writes == expected.pending_writes
+    assert saver.metrics()["restored_total"] == 1
+
+
+def test_spills_idle_threads(tmp_path, clock) -> None:
+    saver = BoundedInMemorySaver(
+        ttl=60, spill_path=str(tmp_path / "spill.db"), spill_after=10, clock=clock
+    )
+
+    put_checkpoint(saver, "a")
+    clock.now = 20
+    put_checkpoint(saver, "b")
+
+    assert saver.metrics()["threads_in_memory"] == 1
+    assert saver.metrics()["threads_spilled"] == 1
+
+    clock.now = 100
+    assert saver.get_tuple(config("a")) is None
+    assert saver.metrics()["threads_spilled"] == 0
+
+
+def test_delete_thread_removes_spilled_thread(tmp_path) -> None:
+    saver = BoundedInMemorySaver(max_threads=1, spill_path=str(tmp_path / "spill.db"))
+
+    put_checkpoint(saver, "a")
+    put_checkpoint(saver, "b")
+    saver.delete_thread("a")
+
+    assert saver.get_tuple(config("a")) is None
+    assert saver.metrics()["threads_spilled"] == 0
+
+
+def test_memory_bytes_released_after_delete() -> None:
+    saver = BoundedInMemorySaver()
+
+    put_checkpoint(saver, "a")
+    assert saver.metrics()["memory_bytes"] > 100
+
+    saver.delete_thread("a")
+    assert saver.metrics()["memory_bytes"] == 0
@@ -1,11 +1,21 @@
 def deployable_ai_service(
-    context, url=None, model_id=None, postgres_db_connection_id=None
+    context,
+    url=None,
+    model_id=None,
+    postgres_db_connection_id=None,
+    postgres_pool_min_size=1,
+    postgres_pool_max_size=10,
+    postgres_pool_max_idle=600,
 ):
-    import urllib
     from typing import Generator
     from langgraph.checkpoint.postgres import PostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+    from langgraph_react_with_database_memory.client_manager import APIClientManager
     from langgraph_react_with_database_memory.agent import get_graph_closure
-    from ibm_watsonx_ai import APIClient, Credentials
+    from langgraph_react_with_database_memory.message_archive import (
+        PostgresMessageArchive,
+    )
     from langchain_core.messages import (
         BaseMessage,
         HumanMessage,
@@ -13,18 +23,13 @@ def deployable_ai_service(
         SystemMessage,
     )
 
-    hostname = urllib.parse.urlparse(url).hostname or ""
-    is_cloud_url = hostname.lower().endswith("cloud.ibm.com")
-    instance_id = None if is_cloud_url else "openshift"
-
-    client = APIClient(
-        credentials=Credentials(
-            url=url,
-            token=context.generate_token(),
-            instance_id=instance_id,
-        ),
+    # One API client, with pooled HTTP connections, is shared by all requests
+    client_manager = APIClientManager(
+        url=url,
         space_id=context.get_space_id(),
+        token=context.generate_token(),
     )
+    client = client_manager.client
 
     def generate_database_URI():
         db_details = client.connections.get_details(postgres_db_connection_id)
@@ -38,10 +43,26 @@ def deployable_ai_service(
 
     DB_URI = generate_database_URI()
 
-    graph = get_graph_closure(client, model_id)
+    # Long-lived connection pool shared by all requests, connections are checked
+    # before being handed out and closed after staying idle for `max_idle` seconds
+    connection_pool = ConnectionPool(
+        conninfo=DB_URI,
+        min_size=postgres_pool_min_size,
+        max_size=postgres_pool_max_size,
+        max_idle=postgres_pool_max_idle,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        check=ConnectionPool.check_connection,
+        open=True,
+    )
+    saver = PostgresSaver(connection_pool)
+    saver.setup()
+
+    # Messages leaving the context window are moved from the thread state to the
+    # archive table, so each turn only loads the messages passed to the model
+    message_archive = PostgresMessageArchive(connection_pool)
+    message_archive.setup()
 
-    with PostgresSaver.from_conn_string(DB_URI) as saver:
-        saver.setup()
+    graph = get_graph_closure(client, model_id, message_archive=message_archive)
 
     def get_formatted_message(
         resp: BaseMessage, is_assistant: bool = False
@@ -136,40 +157,37 @@ def deployable_ai_service(
         Please note that the `system message` MUST be placed first in the list of messages!
         """
 
-        client.set_token(context.get_token())
+        client_manager.set_token(context.get_token())
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
         thread_id = payload.get("thread_id")
         messages = [convert_dict_to_message(_dict) for _dict in raw_messages]
-        with PostgresSaver.from_conn_string(DB_URI) as saver:
-            if messages and messages[0].type == "system":
-                agent = graph(saver, thread_id, messages[0].content)
-                del messages[0]
-            else:
-                agent = graph(saver, thread_id)
+        if messages and messages[0].type == "system":
+            agent = graph(saver, thread_id, messages[0].content)
+            del messages[0]
+        else:
+            agent = graph(saver, thread_id)
 
-            if thread_id:
-                config = {"configurable": {"thread_id": thread_id}}
-                generated_response = agent.invoke({"messages": messages}, config)
-            else:
-                generated_response = agent.invoke({"messages": messages})
+        if thread_id:
+            config = {"configurable": {"thread_id": thread_id}}
+            generated_response = agent.invoke({"messages": messages}, config)
+        else:
+            generated_response = agent.invoke({"messages": messages})
 
-            choices = []
-            execute_response = {
-                "headers": {"Content-Type": "application/json"},
-                "body": {"choices": choices},
-            }
+        choices = []
+        execute_response = {
+            "headers": {"Content-Type": "application/json"},
+            "body": {"choices": choices},
+        }
 
-            choices.append(
-                {
-                    "index": 0,
-                    "message": get_formatted_message(
-                        generated_response["messages"][-1]
-                    ),
-                }
-            )
+        choices.append(
+            {
+                "index": 0,
+                "message": get_formatted_message(generated_response["messages"][-1]),
+            }
+        )
 
-            return execute_response
+        return execute_response
 
     def generate_stream(context) -> Generator[dict, ..., ...]:
         """
@@ -196,59 +214,58 @@ def deployable_ai_service(
         headers = context.get_headers()
         is_assistant = headers.get("X-Ai-Interface") == "assistant"
 
-        client.set_token(context.get_token())
+        client_manager.set_token(context.get_token())
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
         thread_id = payload.get("thread_id")
         messages = [convert_dict_to_message(_dict) for _dict in raw_messages]
-        with PostgresSaver.from_conn_string(DB_URI) as saver:
-            if messages and messages[0].type == "system":
-                agent = graph(saver, thread_id, messages[0].content)
-                del messages[0]
-            else:
-                agent = graph(saver, thread_id)
+        if messages and messages[0].type == "system":
+            agent = graph(saver, thread_id, messages[0].content)
+            del messages[0]
+        else:
+            agent = graph(saver, thread_id)
 
-            if thread_id:
-                config = {"configurable": {"thread_id": thread_id}}
-                response_stream = agent.stream(
-                    {"messages": messages}, config, stream_mode=["updates", "messages"]
-                )
-            else:
-                response_stream = agent.stream(
-                    {"messages": messages}, stream_mode=["updates", "messages"]
-                )
-
-            for chunk_type, data in response_stream:
-                if chunk_type == "messages":
-                    msg_obj = data[0]
-                    if msg_obj.type == "tool":
-                        continue
-                elif chunk_type == "updates":
-                    if agent := data.get("agent"):
-                        msg_obj = agent["messages"][0]
-                        if msg_obj.response_metadata.get("finish_reason") == "stop":
-                            continue
-                    elif tool := data.get("tools"):
-                        msg_obj = tool["messages"][0]
-                    else:
+        if thread_id:
+            config = {"configurable": {"thread_id": thread_id}}
+            response_stream = agent.stream(
+                {"messages": messages}, config, stream_mode=["updates", "messages"]
+            )
+        else:
+            response_stream = agent.stream(
+                {"messages": messages}, stream_mode=["updates", "messages"]
+            )
+
+        for chunk_type, data in response_stream:
+            if chunk_type == "messages":
+                msg_obj = data[0]
+                if msg_obj.type == "tool":
+                    continue
+            elif chunk_type == "updates":
+                if agent := data.get("agent"):
+                    msg_obj = agent["messages"][0]
+                    if msg_obj.response_metadata.get("finish_reason") == "stop":
                         continue
+                elif tool := data.get("tools"):
+                    msg_obj = tool["messages"][0]
                 else:
                     continue
+            else:
+                continue
 
-                if (
-                    message := get_formatted_message(msg_obj, is_assistant=is_assistant)
-                ) is not None:
-                    chunk_response = {
-                        "choices": [
-                            {
-                                "index": 0,
-                                "delta": message,
-                                "finish_reason": msg_obj.response_metadata.get(
-                                    "finish_reason"
-                                ),
-                            }
-                        ]
-                    }
-                    yield chunk_response
+            if (
+                message := get_formatted_message(msg_obj, is_assistant=is_assistant)
+            ) is not None:
+                chunk_response = {
+                    "choices": [
+                        {
+                            "index": 0,
+                            "delta": message,
+                            "finish_reason": msg_obj.response_metadata.get(
+                                "finish_reason"
+                            ),
+                        }
+                    ]
+                }
+                yield chunk_response
 
     return generate, generate_stream
@@ -1,5 +1,8 @@
 import urllib
 from langgraph.checkpoint.postgres import PostgresSaver
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+from langgraph_react_with_database_memory.message_archive import PostgresMessageArchive
 from utils import load_config, generate_database_URI
 from ibm_watsonx_ai import APIClient, Credentials
 
@@ -26,7 +29,11 @@ client = APIClient(
 
 DB_URI = generate_database_URI(client, db_connection_id)
 
-with PostgresSaver.from_conn_string(DB_URI) as saver:
-    saver.delete_thread(thread_id)
+# Delete both the thread state and the messages archived from the thread
+with ConnectionPool(
+    DB_URI, kwargs={"autocommit": True, "row_factory": dict_row}
+) as connection_pool:
+    PostgresSaver(connection_pool).delete_thread(thread_id)
+    PostgresMessageArchive(connection_pool).delete_thread(thread_id)
 
 print(f"Successfully deleted conversation with id: {thread_id}")
@@ -1,16 +1,36 @@
 from typing import Callable
 
 from ibm_watsonx_ai import APIClient
+from langchain_core.runnables import RunnableConfig
 from langchain_ibm import ChatWatsonx
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import create_react_agent
-from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.messages import (
+    BaseMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
 from langgraph_react_with_database_memory import TOOLS
+from langgraph_react_with_database_memory.message_archive import MessageArchive
 from langgraph.checkpoint.postgres import PostgresSaver
 
 
-def get_graph_closure(client: APIClient, model_id: str) -> Callable:
-    """Graph generator closure."""
+def get_graph_closure(
+    client: APIClient,
+    model_id: str,
+    max_messages_in_context: int = 50,
+    message_archive: MessageArchive | None = None,
+) -> Callable:
+    """Graph generator closure.
+
+    Only the last `max_messages_in_context` messages of a thread are passed to the
+    model. When a `message_archive` is given, only these messages are kept in the
+    thread state and older messages are moved to the archive, so loading a thread
+    costs the same regardless of its length, while the full thread history can still
+    be read with `get_thread_history`. Without an archive, every message is kept in
+    the thread state.
+    """
 
     # Initialise ChatWatsonx
     chat = ChatWatsonx(model_id=model_id, watsonx_client=client)
@@ -18,32 +38,50 @@ def get_graph_closure(client: APIClient, model_id: str) -> Callable:
     # Define system prompt
     default_system_prompt = "You are a helpful AI assistant, please respond to the user's query to the best of your ability!"
 
-    max_messages_in_context = 50
-
     def get_graph(
         memory: PostgresSaver, thread_id=None, system_prompt=default_system_prompt
     ) -> CompiledStateGraph:
         """Get compiled graph with overwritten system prompt, if provided"""
 
-        def messages_modifier(state: dict) -> dict[str, list[BaseMessage]]:
-            """Reduces number of agent's input messages"""
-            messages_from_history = state.get("messages", [])
-            input_messages = [SystemMessage(content=system_prompt)]
-            for msg in messages_from_history:
-                if not isinstance(msg, SystemMessage):
-                    input_messages.append(msg)
-
-            if len(input_messages) > max_messages_in_context:
-                if max_messages_in_context == 0:
-                    input_messages = []
-                elif max_messages_in_context == 1:
-                    input_messages = [input_messages[0]]
-                else:
-                    input_messages = [input_messages[0]] + input_messages[
-                        -(max_messages_in_context - 1) :
-                    ]
-
-            return {"messages": input_messages}
+        def messages_modifier(
+            state: dict, config: RunnableConfig
+        ) -> dict[str, list[BaseMessage]]:
+            """Reduces number of agent's input messages and of messages stored in the thread"""
+            messages_from_history = [
+                msg
+                for msg in state.get("messages", [])
+                if not isinstance(msg, SystemMessage)
+            ]
+
+            # The system prompt takes one place in the context
+            window_size = max(max_messages_in_context - 1, 0)
+            window = messages_from_history[-window_size:] if window_size else []
+
+            # Do not start the window with tool results cut off from their tool call
+            while window and isinstance(window[0], ToolMessage):
+                window.pop(0)
+
+            if max_messages_in_context == 0:
+                input_messages = []
+            else:
+                input_messages = [SystemMessage(content=system_prompt), *window]
+
+            update = {"llm_input_messages": input_messages}
+            if message_archive is not None and window:
+                # Archive the messages leaving the window before removing them from
+                # the thread state. A thread is never emptied, even when no message
+                # fits in the window
+                window_ids = {msg.id for msg in window}
+                outdated = [
+                    msg for msg in state["messages"] if msg.id not in window_ids
+                ]
+                if outdated:
+                    message_archive.append(
+                        config["configurable"]["thread_id"], outdated
+                    )
+                    update["messages"] = [RemoveMessage(id=msg.id) for msg in outdated]
+
+            return update
 
         if thread_id:
             return create_react_agent(
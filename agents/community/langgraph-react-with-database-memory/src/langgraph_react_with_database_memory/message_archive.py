@@ -0,0 +1,134 @@
+import threading
+from typing import Protocol, Sequence
+
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+
+SETUP_QUERIES = [
+    """
+    CREATE TABLE IF NOT EXISTS thread_message_archive (
+        seq BIGSERIAL PRIMARY KEY,
+        thread_id TEXT NOT NULL,
+        message_id TEXT NOT NULL,
+        message JSONB NOT NULL,
+        UNIQUE (thread_id, message_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS thread_message_archive_thread_id_seq_idx
+    ON thread_message_archive (thread_id, seq)
+    """,
+]
+
+INSERT_QUERY = """
+INSERT INTO thread_message_archive (thread_id, message_id, message)
+VALUES (%s, %s, %s)
+ON CONFLICT (thread_id, message_id) DO NOTHING
+"""
+
+SELECT_QUERY = """
+SELECT message FROM thread_message_archive WHERE thread_id = %s ORDER BY seq
+"""
+
+DELETE_QUERY = "DELETE FROM thread_message_archive WHERE thread_id = %s"
+
+
+class MessageArchive(Protocol):
+    """Append-only store of the messages moved out of the thread state."""
+
+    def append(self, thread_id: str, messages: Sequence[BaseMessage]) -> None: ...
+
+    def get_messages(self, thread_id: str) -> list[BaseMessage]: ...
+
+    def delete_thread(self, thread_id: str) -> None: ...
+
+
+class PostgresMessageArchive:
+    """Message archive kept in a Postgres table, next to the checkpoints.
+
+    Messages are only written when they leave the context window and only read
+    when the full thread history is requested, never on a regular turn.
+
+    Args:
+        pool: Connection pool shared with the checkpointer.
+    """
+
+    def __init__(self, pool: ConnectionPool) -> None:
+        self.pool = pool
+
+    def setup(self) -> None:
+        """Create the archive table, if it does not exist yet."""
+        with self.pool.connection() as conn:
+            for query in SETUP_QUERIES:
+                conn.execute(query)
+
+    def append(self, thread_id: str, messages: Sequence[BaseMessage]) -> None:
+        """Archive the messages, skipping the ones already archived."""
+        if not messages:
+            return
+        rows = [
+            (thread_id, message.id, Jsonb(message_dict))
+            for message, message_dict in zip(messages, messages_to_dict(messages))
+        ]
+        with self.pool.connection() as conn, conn.cursor() as cursor:
+            cursor.executemany(INSERT_QUERY, rows)
+
+    def get_messages(self, thread_id: str) -> list[BaseMessage]:
+        """Get the archived messages of the thread, oldest first."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(SELECT_QUERY, (thread_id,)).fetchall()
+        return messages_from_dict([row["message"] for row in rows])
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete the archived messages of the thread."""
+        with self.pool.connection() as conn:
+            conn.execute(DELETE_QUERY, (thread_id,))
+
+
+class InMemoryMessageArchive:
+    """Message archive kept in memory, e.g. for local runs and tests."""
+
+    def __init__(self) -> None:
+        self._messages: dict[str, dict[str, BaseMessage]] = {}
+        self._lock = threading.Lock()
+
+    def append(self, thread_id: str, messages: Sequence[BaseMessage]) -> None:
+        with self._lock:
+            archived = self._messages.setdefault(thread_id, {})
+            for message in messages:
+                archived.setdefault(message.id, message)
+
+    def get_messages(self, thread_id: str) -> list[BaseMessage]:
+        with self._lock:
+            return list(self._messages.get(thread_id, {}).values())
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._messages.pop(thread_id, None)
+
+
+def get_thread_history(
+    checkpointer: BaseCheckpointSaver, archive: MessageArchive, thread_id: str
+) -> list[BaseMessage]:
+    """Get every message of the thread: the archived ones, then the thread state.
+
+    Messages archived by a turn that failed before its checkpoint was saved are
+    still in the thread state, so they are only returned once.
+    """
+    checkpoint_tuple = checkpointer.get_tuple(
+        {"configurable": {"thread_id": thread_id}}
+    )
+    state_messages = (
+        checkpoint_tuple.checkpoint["channel_values"].get("messages", [])
+        if checkpoint_tuple
+        else []
+    )
+    state_ids = {message.id for message in state_messages}
+    archived = [
+        message
+        for message in archive.get_messages(thread_id)
+        if message.id not in state_ids
+    ]
+    return [*archived, *state_messages]
@@ -0,0 +1,106 @@
+import itertools
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from langgraph_react_with_database_memory import agent
+from langgraph_react_with_database_memory.message_archive import (
+    InMemoryMessageArchive,
+    get_thread_history,
+)
+
+
+class FakeChatModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def run_turns(
+    monkeypatch, turns: int, saver: InMemorySaver | None = None, **kwargs
+) -> list:
+    chat = FakeChatModel(messages=(AIMessage("IBM") for _ in itertools.count()))
+    monkeypatch.setattr(agent, "ChatWatsonx", lambda **_: chat)
+    saver = saver or InMemorySaver()
+    graph = agent.get_graph_closure(None, "", **kwargs)(saver, thread_id="thread")
+    config = {"configurable": {"thread_id": "thread"}}
+
+    for turn in range(turns):
+        graph.invoke({"messages": [HumanMessage(f"Question {turn}")]}, config)
+
+    return graph.get_state(config).values["messages"]
+
+
+class TestMessagesWindow:
+    def test_full_history_is_kept_by_default(self, monkeypatch):
+        messages = run_turns(monkeypatch, turns=20, max_messages_in_context=5)
+
+        assert len(messages) == 40
+
+    def test_thread_state_is_trimmed_with_archive(self, monkeypatch):
+        archive = InMemoryMessageArchive()
+        messages = run_turns(
+            monkeypatch, turns=20, max_messages_in_context=5, message_archive=archive
+        )
+
+        assert len(messages) <= 5
+        assert messages[-1].content == "IBM"
+        assert messages[-2].content == "Question 19"
+        assert len(archive.get_messages("thread")) == 40 - len(messages)
+
+    def test_full_history_is_kept_in_archive(self, monkeypatch):
+        saver = InMemorySaver()
+        archive = InMemoryMessageArchive()
+        run_turns(
+            monkeypatch,
+            turns=20,
+            saver=saver,
+            max_messages_in_context=5,
+            message_archive=archive,
+        )
+
+        history = get_thread_history(saver, archive, "thread")
+
+        assert [message.content for message in history] == [
+            content
+            for turn in range(20)
+            for content in (f"Question {turn}", "IBM")
+        ]
+
+    def test_thread_is_not_emptied_without_context(self, monkeypatch):
+        archive = InMemoryMessageArchive()
+        messages = run_turns(
+            monkeypatch, turns=3, max_messages_in_context=0, message_archive=archive
+        )
+
+        assert len(messages) == 6
+        assert archive.get_messages("thread") == []
+
+
+class TestMessageArchive:
+    def test_messages_are_archived_once(self):
+        archive = InMemoryMessageArchive()
+        question = HumanMessage("Question", id="1")
+
+        archive.append("thread", [question])
+        archive.append("thread", [question, AIMessage("IBM", id="2")])
+
+        assert [m.id for m in archive.get_messages("thread")] == ["1", "2"]
+
+    def test_history_skips_messages_still_in_the_state(self, monkeypatch):
+        saver = InMemorySaver()
+        archive = InMemoryMessageArchive()
+        messages = run_turns(
+            monkeypatch,
+            turns=5,
+            saver=saver,
+            max_messages_in_context=3,
+            message_archive=archive,
+        )
+        # A turn failing after archiving leaves its messages in both places
+        archive.append("thread", messages)
+
+        history = get_thread_history(saver, archive, "thread")
+
+        assert len(history) == 10
+        assert len({message.id for message in history}) == 10
@@ -7,12 +7,15 @@ def deployable_ai_service(
     tool_config_dialect,
     tool_config_model_id,
     base_knowledge_description=None,
+    schema_cache_ttl=3600,
+    schema_digest_max_chars=8000,
+    query_cache_max_size=1000,
+    query_cache_ttl=300,
 ):
-    import urllib
     from typing import Generator
 
+    from langgraph_sql_rag.client_manager import APIClientManager
     from langgraph_sql_rag.agent import get_graph_closure
-    from ibm_watsonx_ai import APIClient, Credentials
     from langchain_core.messages import (
         BaseMessage,
         HumanMessage,
@@ -21,18 +24,13 @@ def deployable_ai_service(
         ToolMessage,
     )
 
-    hostname = urllib.parse.urlparse(url).hostname or ""
-    is_cloud_url = hostname.lower().endswith("cloud.ibm.com")
-    instance_id = None if is_cloud_url else "openshift"
-
-    client = APIClient(
-        credentials=Credentials(
-            url=url,
-            token=context.generate_token(),
-            instance_id=instance_id,
-        ),
+    # One API client, with pooled HTTP connections, is shared by all requests
+    client_manager = APIClientManager(
+        url=url,
         space_id=context.get_space_id(),
+        token=context.generate_token(),
     )
+    client = client_manager.client
 
     graph = get_graph_closure(
         client,
@@ -43,6 +41,10 @@ def deployable_ai_service(
             "dialect": tool_config_dialect,
             "model_id": tool_config_model_id,
         },
+        schema_cache_ttl=schema_cache_ttl,
+        schema_digest_max_chars=schema_digest_max_chars,
+        query_cache_max_size=query_cache_max_size,
+        query_cache_ttl=query_cache_ttl,
     )()
 
     def _validate_messages(messages: list[dict]):
@@ -89,7 +91,7 @@ def deployable_ai_service(
         Please note that the `system message` MUST be placed first in the list of messages!
         """
 
-        client.set_token(context.get_token())
+        client_manager.set_token(context.get_token())
 
         raw_messages = context.get_json()["messages"]
         _validate_messages(messages=raw_messages)
@@ -150,7 +152,7 @@ def deployable_ai_service(
         }
         Please note that the `system message` MUST be placed first in the list of messages!
         """
-        client.set_token(context.get_token())
+        client_manager.set_token(context.get_token())
 
         payload = context.get_json()
         raw_messages = payload.get("messages", [])
@@ -4,13 +4,39 @@ from ibm_watsonx_ai import APIClient
 from langchain_ibm import ChatWatsonx
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import create_react_agent
+from langchain_core.messages import BaseMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph_sql_rag import sql_tools_watsonx
+from langgraph_sql_rag.query_cache import QueryResultCache
+from langgraph_sql_rag.schema_cache import SchemaCache
+from langgraph_sql_rag.tools import sql_database_watsonx
 
 
-def get_graph_closure(client: APIClient, model_id: str, tool_config: dict) -> Callable:
+def get_graph_closure(
+    client: APIClient,
+    model_id: str,
+    tool_config: dict,
+    schema_cache_ttl: float | None = 3600,
+    schema_digest_max_chars: int = 8000,
+    query_cache_max_size: int = 1000,
+    query_cache_ttl: float = 300,
+) -> Callable:
     """Graph generator closure."""
 
+    # Tables and columns of the schema are read once, and reloaded after the TTL
+    schema_cache = SchemaCache(
+        lambda: sql_database_watsonx(api_client=client, tool_config=tool_config),
+        ttl=schema_cache_ttl,
+        max_digest_chars=schema_digest_max_chars,
+    )
+
+    # Results of identical SELECT queries are reused until the TTL
+    query_cache = (
+        QueryResultCache(max_size=query_cache_max_size, ttl=query_cache_ttl)
+        if query_cache_max_size
+        else None
+    )
+
     # Initialise ChatWatsonx
     chat = ChatWatsonx(
         model_id=model_id, watsonx_client=client, params={"temperature": 0.01}
@@ -28,9 +54,8 @@ def get_graph_closure(client: APIClient, model_id: str, tool_config: dict) -> Ca
 
     DO NOT make any DML statements (INSERT, UPDATE, DELETE, DROP etc.) to the database.
 
-    To start you should ALWAYS look at the tables in the database to see what you can query.
-    Do NOT skip this step.
-    Then you should query the schema of the most relevant tables."""
+    The tables in the database and their columns are listed below, so you do not need to list the tables unless the list is incomplete.
+    Query the schema of the most relevant tables only if you need their keys or sample rows."""
 
     system_prompt_template = ChatPromptTemplate.from_messages(
         [("system", SYSTEM_PROMPT_TEMPLATE)]
@@ -42,12 +67,24 @@ def get_graph_closure(client: APIClient, model_id: str, tool_config: dict) -> Ca
     tools = sql_tools_watsonx(
         api_client=client,
         tool_config=tool_config,
+        schema_cache=schema_cache,
+        query_cache=query_cache,
     )
 
-    def get_graph(system_prompt=default_system_prompt) -> CompiledStateGraph:
+    def prompt_with_schema(state: dict) -> list[BaseMessage]:
+        """Default system prompt, followed by the current tables and columns."""
+        system_prompt = default_system_prompt + "\n\n" + schema_cache.get_digest()
+        return [SystemMessage(system_prompt)] + list(state["messages"])
+
+    def get_graph(system_prompt=None) -> CompiledStateGraph:
         """Get compiled graph with overwritten db dialect, if provided"""
 
         # Create instance of compiled graph
-        return create_react_agent(chat, tools=tools, prompt=system_prompt)
+        return create_react_agent(
+            chat, tools=tools, prompt=system_prompt or prompt_with_schema
+        )
+
+    get_graph.schema_cache = schema_cache
+    get_graph.query_cache = query_cache
 
     return get_graph
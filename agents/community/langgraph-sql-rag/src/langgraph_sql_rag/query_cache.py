@@ -0,0 +1,147 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+# String literals and quoted identifiers, kept as is by the normalization
+_QUOTED = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+# Quoted spans and comments, matched in a single pass from left to right, so quotes
+# in comments and comment markers in literals are not mistaken for each other
+_TOKENS = re.compile(
+    rf"(?P<quoted>{_QUOTED.pattern})|(?P<comment>--[^\n]*|/\*.*?\*/)", re.DOTALL
+)
+_WHITESPACE = re.compile(r"\s+")
+_WRITE_KEYWORDS = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|UPSERT|CREATE|ALTER|DROP|TRUNCATE|"
+    r"RENAME|GRANT|REVOKE|CALL|EXEC|EXECUTE|INTO|LOCK|SET)\b",
+    re.IGNORECASE,
+)
+
+
+def normalize_sql(query: str) -> str:
+    """Strip comments, collapse whitespace and trailing semicolons of the SQL query.
+
+    String literals and quoted identifiers are left untouched, so queries differing
+    only in their values are never merged.
+    """
+    parts = []
+    unquoted = ""
+    position = 0
+    for match in _TOKENS.finditer(query):
+        unquoted += query[position : match.start()]
+        position = match.end()
+        if match.group("comment"):
+            unquoted += " "
+        else:
+            parts += [_WHITESPACE.sub(" ", unquoted), match.group()]
+            unquoted = ""
+    parts.append(_WHITESPACE.sub(" ", unquoted + query[position:]))
+
+    return "".join(parts).strip().rstrip("; ")
+
+
+def is_read_only(query: str) -> bool:
+    """Whether the normalized SQL query is a single SELECT statement."""
+    unquoted = _QUOTED.sub("''", query)
+    if ";" in unquoted:
+        return False
+    first_keyword = unquoted.lstrip("( ").split(" ", 1)[0].upper()
+    return first_keyword in {"SELECT", "WITH"} and not _WRITE_KEYWORDS.search(unquoted)
+
+
+class QueryResultCache:
+    """Bounded in-memory LRU cache of SQL query results, with TTL.
+
+    Results are keyed by the database namespace, e.g. connection ID and schema,
+    and the normalized SQL text. Only single SELECT statements are cached,
+    other statements are always executed and clear the cache, as they may have
+    modified the data.
+
+    Args:
+        max_size: Maximum number of cached results, the least recently used are evicted.
+        ttl: Number of seconds after which a cached result expires.
+        clock: Monotonic clock used to measure the age of cached results.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+
+        self._results: OrderedDict[tuple[Hashable, str], tuple[str, float]] = (
+            OrderedDict()
+        )
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+        self._lock = threading.Lock()
+
+    def get_or_run(
+        self,
+        namespace: Hashable,
+        query: str,
+        run: Callable[[str], str],
+        is_error: Callable[[str], bool] = lambda result: False,
+    ) -> str:
+        """Get the cached result of the query, calling `run` on a miss.
+
+        Results for which `is_error` is true are not cached.
+        """
+        normalized_query = normalize_sql(query)
+        if not is_read_only(normalized_query):
+            try:
+                return run(query)
+            finally:
+                with self._lock:
+                    self._stats["bypassed"] += 1
+                    self._results.clear()
+
+        key = (namespace, normalized_query)
+        with self._lock:
+            if (cached := self._results.get(key)) is not None:
+                result, expires_at = cached
+                if self.clock() < expires_at:
+                    self._results.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return result
+                del self._results[key]
+                self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+
+        result = run(query)
+        if self.max_size <= 0 or is_error(result):
+            return result
+
+        with self._lock:
+            self._results[key] = result, self.clock() + self.ttl
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+                self._stats["evictions"] += 1
+
+        return result
+
+    def invalidate(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._results.clear()
+
+    def stats(self) -> dict:
+        """Get the number of cached results, hits, misses, bypasses and the hit ratio."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "size": len(self._results),
+                **self._stats,
+                "hit_ratio": self._stats["hits"] / lookups if lookups else 0.0,
+            }
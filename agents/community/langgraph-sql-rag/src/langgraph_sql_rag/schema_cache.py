@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import Callable, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_ibm.utilities.sql_database import WatsonxSQLDatabase
+
+
+class SchemaCache:
+    """Table list and table schemas of the database, kept in memory.
+
+    The database, whose table list and column metadata are read when it is created,
+    is loaded once at startup with `load_database`. Once `ttl` seconds have passed,
+    the next access reloads it in a background thread, while the current one keeps
+    being served. Table schemas with sample rows are cached per table until the
+    next reload.
+
+    The digest added to the prompt lists the tables with their columns, up to
+    `max_digest_chars` characters. Beyond that, it tells the model to list the other
+    tables and get their columns with the SQL tools.
+
+    Args:
+        load_database: Function creating the database, reading its metadata.
+        ttl: Number of seconds after which the database is reloaded,
+            it is never reloaded if None.
+        max_digest_chars: Maximum number of characters of the listed tables and columns.
+        clock: Monotonic clock used to measure the age of the database.
+    """
+
+    def __init__(
+        self,
+        load_database: Callable[[], "WatsonxSQLDatabase"],
+        ttl: float | None = 3600.0,
+        max_digest_chars: int = 8000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.load_database = load_database
+        self.ttl = ttl
+        self.max_digest_chars = max_digest_chars
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._reloading = False
+        self._stats = {"hits": 0, "misses": 0, "reloads": 0, "failed_reloads": 0}
+        self._set_database(load_database())
+
+    def _set_database(self, database: "WatsonxSQLDatabase") -> None:
+        table_names = list(database.get_usable_table_names())
+        digest = self._digest(database, table_names)
+        with self._lock:
+            self._database = database
+            self._table_names = table_names
+            self._table_info: dict[str, str] = {}
+            self._digest_text = digest
+            self._loaded_at = self.clock()
+
+    def _digest(self, database: "WatsonxSQLDatabase", table_names: list[str]) -> str:
+        # Column metadata read by WatsonxSQLDatabase when it was created, langchain-ibm
+        # has no public method returning it without fetching sample rows
+        metadata = getattr(database, "_meta_all_tables", None) or {}
+
+        header = f'Tables of the "{database.schema}" schema'
+        lines = [f"{header}, with their columns:" if metadata else f"{header}:"]
+        length = 0
+        for table_name in table_names:
+            fields = metadata.get(table_name, {}).get("fields", [])
+            columns = ", ".join(
+                f"{field['name']} {field.get('type', {}).get('native_type', '')}".strip()
+                for field in fields
+            )
+            line = f"- {table_name}({columns})" if columns else f"- {table_name}"
+            length += len(line) + 1
+            if length > self.max_digest_chars:
+                break
+            lines.append(line)
+
+        if len(lines) - 1 < len(table_names):
+            lines.append(
+                f"Only {len(lines) - 1} of the {len(table_names)} tables are listed, "
+                "use the sql_db_list_tables tool to list all the tables and "
+                "the sql_db_schema tool to get their columns."
+            )
+        return "\n".join(lines)
+
+    def _check_ttl(self) -> None:
+        with self._lock:
+            if (
+                self.ttl is None
+                or self._reloading
+                or self.clock() - self._loaded_at < self.ttl
+            ):
+                return
+            self._reloading = True
+
+        threading.Thread(target=self.reload, daemon=True).start()
+
+    def reload(self) -> bool:
+        """Reload the database metadata, return whether it succeeded."""
+        try:
+            self._set_database(self.load_database())
+        except Exception:
+            with self._lock:
+                self._stats["failed_reloads"] += 1
+                # Retry after another `ttl` seconds
+                self._loaded_at = self.clock()
+            return False
+        finally:
+            with self._lock:
+                self._reloading = False
+
+        with self._lock:
+            self._stats["reloads"] += 1
+        return True
+
+    @property
+    def database(self) -> "WatsonxSQLDatabase":
+        """Current database."""
+        self._check_ttl()
+        return self._database
+
+    def get_table_names(self) -> list[str]:
+        """Get the names of the usable tables."""
+        self._check_ttl()
+        return self._table_names
+
+    def get_digest(self) -> str:
+        """Get the compact list of tables and columns, to be added to the prompt."""
+        self._check_ttl()
+        return self._digest_text
+
+    def get_table_info(self, table_names: Iterable[str]) -> str:
+        """Get the schema and sample rows of the tables, or an error message."""
+        self._check_ttl()
+        with self._lock:
+            database, table_info = self._database, self._table_info
+            all_table_names = set(self._table_names)
+
+        table_names = list(table_names)
+        missing_tables = set(table_names).difference(all_table_names)
+        if missing_tables:
+            return f"Error: table_names {missing_tables} not found in database"
+
+        infos = []
+        for table_name in table_names:
+            if (info := table_info.get(table_name)) is not None:
+                with self._lock:
+                    self._stats["hits"] += 1
+            else:
+                with self._lock:
+                    self._stats["misses"] += 1
+                info = database.get_table_info_no_throw([table_name])
+                if info.startswith("Error:"):
+                    return info
+                table_info[table_name] = info
+            infos.append(info)
+
+        return "\n\n".join(infos)
+
+    def stats(self) -> dict:
+        """Get the number of tables, table info hits and misses, and reloads."""
+        with self._lock:
+            return {
+                "tables": len(self._table_names),
+                **self._stats,
+                "age": self.clock() - self._loaded_at,
+            }
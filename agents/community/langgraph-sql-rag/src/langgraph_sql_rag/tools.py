@@ -1,17 +1,90 @@
 from typing import TYPE_CHECKING
 
+from langchain_core.callbacks import CallbackManagerForToolRun
 from langchain_core.tools import BaseTool
 from langchain_ibm import ChatWatsonx
 from langchain_ibm.agent_toolkits.sql import WatsonxSQLDatabaseToolkit
+from langchain_ibm.agent_toolkits.sql.tool import (
+    InfoSQLDatabaseTool,
+    ListSQLDatabaseTool,
+    QuerySQLDatabaseTool,
+)
 from langchain_ibm.utilities.sql_database import WatsonxSQLDatabase
+from pydantic import Field
+
+from langgraph_sql_rag.query_cache import QueryResultCache
+from langgraph_sql_rag.schema_cache import SchemaCache
 
 if TYPE_CHECKING:
     from ibm_watsonx_ai import APIClient
 
 
+class CachedListSQLDatabaseTool(ListSQLDatabaseTool):
+    """Tool for getting tables names, from the schema cache."""
+
+    schema_cache: SchemaCache = Field(exclude=True)
+
+    def _run(
+        self,
+        tool_input: str = "",
+        run_manager: CallbackManagerForToolRun | None = None,
+    ) -> str:
+        """Get a comma-separated list of table names."""
+        return ", ".join(self.schema_cache.get_table_names())
+
+
+class CachedInfoSQLDatabaseTool(InfoSQLDatabaseTool):
+    """Tool for getting metadata about a SQL database, from the schema cache."""
+
+    schema_cache: SchemaCache = Field(exclude=True)
+
+    def _run(
+        self,
+        table_names: str,
+        run_manager: CallbackManagerForToolRun | None = None,
+    ) -> str:
+        """Get the schema for tables in a comma-separated list."""
+        return self.schema_cache.get_table_info(
+            [t.strip() for t in table_names.split(",")]
+        )
+
+
+class CachedQuerySQLDatabaseTool(QuerySQLDatabaseTool):
+    """Tool for querying a SQL database, with SELECT results cached."""
+
+    query_cache: QueryResultCache = Field(exclude=True)
+    cache_namespace: tuple[str, str] = Field(exclude=True)
+
+    def _run(
+        self,
+        query: str,
+        run_manager: CallbackManagerForToolRun | None = None,
+    ) -> str:
+        """Execute the query, return the results or an error message."""
+        return self.query_cache.get_or_run(
+            self.cache_namespace,
+            query,
+            self.db.run_no_throw,
+            is_error=lambda result: result.startswith("Error:"),
+        )
+
+
+def sql_database_watsonx(
+    api_client: "APIClient",
+    tool_config: dict,
+) -> WatsonxSQLDatabase:
+    return WatsonxSQLDatabase(
+        connection_id=tool_config["connection_id"],
+        schema=tool_config["schema"],
+        watsonx_client=api_client,
+    )
+
+
 def sql_tools_watsonx(
     api_client: "APIClient",
     tool_config: dict,
+    schema_cache: SchemaCache | None = None,
+    query_cache: QueryResultCache | None = None,
 ) -> list[BaseTool]:
     chat_llm = ChatWatsonx(
         model_id=tool_config["model_id"],
@@ -19,11 +92,40 @@ def sql_tools_watsonx(
         watsonx_client=api_client,
     )
 
-    sql_database = WatsonxSQLDatabase(
-        connection_id=tool_config["connection_id"],
-        schema=tool_config["schema"],
-        watsonx_client=api_client,
-    )
+    if schema_cache is None:
+        sql_database = sql_database_watsonx(api_client, tool_config)
+    else:
+        sql_database = schema_cache.database
     sql_toolkit = WatsonxSQLDatabaseToolkit(db=sql_database, llm=chat_llm)
 
-    return sql_toolkit.get_tools()
+    # SELECT results, table list and schemas are answered from memory when cached
+    cached_tools = []
+    for tool in sql_toolkit.get_tools():
+        if isinstance(tool, QuerySQLDatabaseTool) and query_cache is not None:
+            tool = CachedQuerySQLDatabaseTool(
+                db=sql_database,
+                query_cache=query_cache,
+                cache_namespace=(tool_config["connection_id"], tool_config["schema"]),
+                description=tool.description,
+            )
+        elif isinstance(tool, ListSQLDatabaseTool) and schema_cache is not None:
+            tool = CachedListSQLDatabaseTool(
+                db=sql_database,
+                schema_cache=schema_cache,
+                description=tool.description,
+            )
+        elif isinstance(tool, InfoSQLDatabaseTool) and schema_cache is not None:
+            # Tables are already listed in the system prompt, so they do not need
+            # to be listed first, unless the prompt says the list is incomplete
+            tool = CachedInfoSQLDatabaseTool(
+                db=sql_database,
+                schema_cache=schema_cache,
+                description=(
+                    "Input to this tool is a comma-separated list of tables, output "
+                    "is the SQL statement with table metadata and sample rows. "
+                    "Example Input: table1, table2, table3"
+                ),
+            )
+        cached_tools.append(tool)
+
+    return cached_tools
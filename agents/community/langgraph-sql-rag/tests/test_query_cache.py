@@ -0,0 +1,115 @@
+from langgraph_sql_rag.query_cache import QueryResultCache, is_read_only, normalize_sql
+
+
+class FakeDatabase:
+    def __init__(self) -> None:
+        self.queries = []
+
+    def run_no_throw(self, query: str) -> str:
+        self.queries.append(query)
+        if "MISSING" in query:
+            return "Error: table MISSING not found"
+        return "[(42,)]"
+
+
+def is_error(result: str) -> bool:
+    return result.startswith("Error:")
+
+
+class TestNormalizeSql:
+    def test_whitespace_comments_and_semicolons(self):
+        assert normalize_sql(
+            "SELECT id\n  FROM  orders -- open orders\nWHERE status = 'OPEN' ;"
+        ) == ("SELECT id FROM orders WHERE status = 'OPEN'")
+
+    def test_string_literals_are_kept(self):
+        assert normalize_sql("SELECT 'a  --  b'") == "SELECT 'a  --  b'"
+
+    def test_quotes_in_comments_are_ignored(self):
+        assert normalize_sql("SELECT * FROM t -- don't\n WHERE a='x'") == (
+            "SELECT * FROM t WHERE a='x'"
+        )
+        assert normalize_sql('SELECT /* it\'s */ a, "b--c" FROM t') == (
+            'SELECT a, "b--c" FROM t'
+        )
+
+
+class TestIsReadOnly:
+    def test_select_statements(self):
+        assert is_read_only("SELECT COUNT(*) FROM orders")
+        assert is_read_only("WITH t AS (SELECT 1) SELECT * FROM t")
+        assert is_read_only("SELECT * FROM orders WHERE note = 'DELETE ME'")
+
+    def test_other_statements(self):
+        assert not is_read_only("DELETE FROM orders")
+        assert not is_read_only("SELECT * INTO backup FROM orders")
+        assert not is_read_only("SELECT 1; DROP TABLE orders")
+        assert not is_read_only(
+            "WITH t AS (SELECT 1) INSERT INTO orders SELECT * FROM t"
+        )
+
+
+class TestQueryResultCache:
+    def test_identical_select_is_executed_once(self):
+        query_cache = QueryResultCache()
+        database = FakeDatabase()
+
+        for query in ["SELECT COUNT(*) FROM orders", "SELECT  COUNT(*)\nFROM orders;"]:
+            result = query_cache.get_or_run("db", query, database.run_no_throw)
+
+        assert result == "[(42,)]"
+        assert database.queries == ["SELECT COUNT(*) FROM orders"]
+        assert query_cache.stats()["hits"] == 1
+        assert query_cache.stats()["hit_ratio"] == 0.5
+
+    def test_namespaces_are_isolated(self):
+        query_cache = QueryResultCache()
+        database = FakeDatabase()
+
+        query_cache.get_or_run(("conn", "SALES"), "SELECT 1", database.run_no_throw)
+        query_cache.get_or_run(("conn", "HR"), "SELECT 1", database.run_no_throw)
+
+        assert len(database.queries) == 2
+
+    def test_errors_are_not_cached(self):
+        query_cache = QueryResultCache()
+        database = FakeDatabase()
+
+        for _ in range(2):
+            query_cache.get_or_run(
+                "db", "SELECT * FROM MISSING", database.run_no_throw, is_error
+            )
+
+        assert len(database.queries) == 2
+        assert query_cache.stats()["size"] == 0
+
+    def test_write_statement_bypasses_and_clears_cache(self):
+        query_cache = QueryResultCache()
+        database = FakeDatabase()
+
+        query_cache.get_or_run("db", "SELECT 1", database.run_no_throw)
+        query_cache.get_or_run("db", "UPDATE orders SET x = 1", database.run_no_throw)
+        query_cache.get_or_run("db", "SELECT 1", database.run_no_throw)
+
+        assert len(database.queries) == 3
+        assert query_cache.stats()["bypassed"] == 1
+
+    def test_expired_and_evicted_results_are_executed_again(self, clock):
+        query_cache = QueryResultCache(max_size=2, ttl=10, clock=clock)
+        database = FakeDatabase()
+
+        for query in ["SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3", "SELECT 2"]:
+            query_cache.get_or_run("db", query, database.run_no_throw)
+        clock.now = 10
+        query_cache.get_or_run("db", "SELECT 2", database.run_no_throw)
+
+        assert database.queries == [
+            "SELECT 1",
+            "SELECT 2",
+            "SELECT 3",
+            "SELECT 2",
+            "SELECT 2",
+        ]
+        stats = query_cache.stats()
+        assert stats["evictions"] == 2
+        assert stats["expirations"] == 1
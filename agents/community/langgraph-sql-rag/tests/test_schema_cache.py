@@ -0,0 +1,125 @@
+import time
+
+from langgraph_sql_rag.schema_cache import SchemaCache
+
+
+class FakeDatabase:
+    schema = "SALES"
+
+    def __init__(self, version: int = 0) -> None:
+        self.table_info_calls = []
+        self._meta_all_tables = {
+            "ORDERS": {
+                "fields": [
+                    {"name": "ID", "type": {"native_type": "INTEGER"}},
+                    {"name": f"STATUS_V{version}", "type": {"native_type": "VARCHAR"}},
+                ]
+            },
+            "CUSTOMERS": {
+                "fields": [{"name": "NAME", "type": {"native_type": "VARCHAR"}}]
+            },
+        }
+
+    def get_usable_table_names(self) -> list[str]:
+        return sorted(self._meta_all_tables)
+
+    def get_table_info_no_throw(self, table_names: list[str]) -> str:
+        self.table_info_calls.append(table_names)
+        return "\n\n".join(f'CREATE TABLE "SALES"."{name}"' for name in table_names)
+
+
+def database_loader():
+    databases = []
+
+    def load_database() -> FakeDatabase:
+        databases.append(FakeDatabase(len(databases)))
+        return databases[-1]
+
+    return load_database, databases
+
+
+class TestSchemaCache:
+    def test_digest_lists_tables_and_columns(self):
+        load_database, _ = database_loader()
+        schema_cache = SchemaCache(load_database)
+
+        assert schema_cache.get_table_names() == ["CUSTOMERS", "ORDERS"]
+        assert schema_cache.get_digest() == (
+            'Tables of the "SALES" schema, with their columns:\n'
+            "- CUSTOMERS(NAME VARCHAR)\n"
+            "- ORDERS(ID INTEGER, STATUS_V0 VARCHAR)"
+        )
+
+    def test_digest_is_capped(self):
+        load_database, _ = database_loader()
+        schema_cache = SchemaCache(load_database, max_digest_chars=30)
+
+        assert schema_cache.get_digest() == (
+            'Tables of the "SALES" schema, with their columns:\n'
+            "- CUSTOMERS(NAME VARCHAR)\n"
+            "Only 1 of the 2 tables are listed, use the sql_db_list_tables tool to "
+            "list all the tables and the sql_db_schema tool to get their columns."
+        )
+
+    def test_digest_without_column_metadata(self):
+        def load_database() -> FakeDatabase:
+            database = FakeDatabase()
+            database.get_usable_table_names = lambda: ["CUSTOMERS", "ORDERS"]
+            del database._meta_all_tables
+            return database
+
+        schema_cache = SchemaCache(load_database)
+
+        assert schema_cache.get_digest() == (
+            'Tables of the "SALES" schema:\n- CUSTOMERS\n- ORDERS'
+        )
+
+    def test_table_info_is_fetched_once_per_table(self):
+        load_database, databases = database_loader()
+        schema_cache = SchemaCache(load_database)
+
+        schema_cache.get_table_info(["ORDERS", "CUSTOMERS"])
+        info = schema_cache.get_table_info(["ORDERS"])
+
+        assert info == 'CREATE TABLE "SALES"."ORDERS"'
+        assert databases[0].table_info_calls == [["ORDERS"], ["CUSTOMERS"]]
+        assert schema_cache.stats()["hits"] == 1
+        assert schema_cache.stats()["misses"] == 2
+
+    def test_unknown_table_returns_error(self):
+        load_database, _ = database_loader()
+        schema_cache = SchemaCache(load_database)
+
+        assert schema_cache.get_table_info(["INVOICES"]) == (
+            "Error: table_names {'INVOICES'} not found in database"
+        )
+
+    def test_reload_after_ttl(self, clock):
+        load_database, databases = database_loader()
+        schema_cache = SchemaCache(load_database, ttl=60, clock=clock)
+
+        clock.now = 30
+        assert schema_cache.database is databases[0]
+
+        clock.now = 60
+        # Starts the reload in the background
+        assert schema_cache.get_table_names() == ["CUSTOMERS", "ORDERS"]
+        deadline = time.monotonic() + 5
+        while schema_cache.stats()["reloads"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert schema_cache.database is databases[1]
+        assert "STATUS_V1" in schema_cache.get_digest()
+
+    def test_failed_reload_keeps_current_database(self):
+        load_database, databases = database_loader()
+        schema_cache = SchemaCache(load_database, ttl=None)
+
+        def failing_load():
+            raise ConnectionError("Database unavailable")
+
+        schema_cache.load_database = failing_load
+
+        assert not schema_cache.reload()
+        assert schema_cache.database is databases[0]
+        assert schema_cache.stats()["failed_reloads"] == 1
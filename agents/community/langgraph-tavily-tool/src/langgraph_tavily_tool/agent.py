@@ -1,12 +1,24 @@
 from typing import Callable
 
+from typing_extensions import NotRequired
+
 from ibm_watsonx_ai import APIClient
+from langchain_core.messages import BaseMessage, SystemMessage
 from langchain_ibm import ChatWatsonx
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import create_react_agent
+from langgraph.prebuilt.chat_agent_executor import AgentState
 
 from langgraph_tavily_tool import tavily_search_watsonx
 
+DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant, please respond to the user's query to the best of your ability!"
+
+
+class PromptAgentState(AgentState):
+    """ReAct agent state carrying the system prompt of the current request."""
+
+    system_prompt: NotRequired[str]
+
 
 def get_graph_closure(
     client: APIClient, model_id: str, service_manager_service_url: str, secret_id: str
@@ -24,10 +36,7 @@ def get_graph_closure(
         )
     ]
 
-    # Define system prompt
-    default_system_prompt = "You are a helpful AI assistant, please respond to the user's query to the best of your ability!"
-
-    def get_graph(system_prompt=default_system_prompt) -> CompiledStateGraph:
+    def get_graph(system_prompt=DEFAULT_SYSTEM_PROMPT) -> CompiledStateGraph:
         """Get compiled graph with overwritten system prompt, if provided"""
 
         # Create instance of compiled graph
@@ -38,3 +47,37 @@ def get_graph_closure(
         )
 
     return get_graph
+
+
+def get_prompt_as_state_graph(
+    client: APIClient, model_id: str, service_manager_service_url: str, secret_id: str
+) -> CompiledStateGraph:
+    """Get a single compiled graph reading the system prompt from the graph state.
+
+    The system prompt is passed in the `system_prompt` key of the graph input
+    and falls back to the default system prompt when it is not provided.
+    """
+
+    # Initialise ChatWatsonx
+    chat = ChatWatsonx(model_id=model_id, watsonx_client=client)
+
+    TOOLS = [
+        tavily_search_watsonx(
+            api_client=client,
+            service_manager_service_url=service_manager_service_url,
+            secret_id=secret_id,
+        )
+    ]
+
+    def prompt_from_state(state: PromptAgentState) -> list[BaseMessage]:
+        """Prepend the system prompt of the current request to the messages"""
+        system_prompt = state.get("system_prompt") or DEFAULT_SYSTEM_PROMPT
+        return [SystemMessage(content=system_prompt), *state["messages"]]
+
+    # Create instance of compiled graph
+    return create_react_agent(
+        chat,
+        tools=TOOLS,
+        prompt=prompt_from_state,
+        state_schema=PromptAgentState,
+    )
@@ -1,9 +1,10 @@
+from functools import lru_cache
 from typing import Callable, TYPE_CHECKING
 
 from langchain_core.tools import tool
 from langchain_tavily import TavilySearch
-from ibm_cloud_sdk_core.authenticators import BearerTokenAuthenticator
-from ibm_secrets_manager_sdk.secrets_manager_v2 import SecretsManagerV2
+
+from langgraph_tavily_tool.secret_cache import SecretCache, secrets_manager_fetcher
 
 if TYPE_CHECKING:
     from ibm_watsonx_ai import APIClient
@@ -13,20 +14,24 @@ def tavily_search_watsonx(
     api_client: "APIClient",
     service_manager_service_url: str,
     secret_id: str,
+    secret_cache: SecretCache | None = None,
 ) -> Callable:
-    authenticator = BearerTokenAuthenticator(api_client.token)
-
-    secretsManager = SecretsManagerV2(authenticator=authenticator)
-
-    secretsManager.set_service_url(service_url=service_manager_service_url)
-
-    response = secretsManager.get_secret(id=secret_id)
-
-    tavily_search_tool = TavilySearch(
-        max_results=2,
-        topic="general",
-        tavily_api_key=response.result["data"]["tavily_api_key"],
-    )
+    if secret_cache is None:
+        secret_cache = SecretCache(
+            secrets_manager_fetcher(api_client, service_manager_service_url)
+        )
+
+    @lru_cache(maxsize=1)
+    def get_tavily_search_tool(tavily_api_key: str) -> TavilySearch:
+        # Rebuilt only when the API key stored in Secrets Manager is rotated
+        return TavilySearch(
+            max_results=2,
+            topic="general",
+            tavily_api_key=tavily_api_key,
+        )
+
+    # Fail fast on misconfigured Secrets Manager and warm up the cache
+    get_tavily_search_tool(secret_cache.get(secret_id)["tavily_api_key"])
 
     @tool("search", parse_docstring=True)
     def tavily_search(query: str) -> str:
@@ -39,6 +44,9 @@ def tavily_search_watsonx(
         Returns:
             String of search results.
         """
+        tavily_search_tool = get_tavily_search_tool(
+            secret_cache.get(secret_id)["tavily_api_key"]
+        )
         response = tavily_search_tool.invoke({"query": query})
         joined_content = "\n".join([el["content"] for el in response["results"]])
 
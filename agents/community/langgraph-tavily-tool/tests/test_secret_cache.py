@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from langgraph_tavily_tool.secret_cache import SecretCache
+
+
+class FakeSecretsManager:
+    """Local stand-in for Secrets Manager counting the performed fetches."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls = 0
+        self.version = 0
+        self.fail = False
+
+    def get_secret(self, secret_id: str) -> dict:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("Secrets Manager unavailable")
+        return {"tavily_api_key": f"{secret_id}-v{self.version}"}
+
+
+class TestSecretCache:
+    def test_secret_is_fetched_once_within_ttl(self, clock):
+        secrets_manager = FakeSecretsManager()
+        cache = SecretCache(secrets_manager.get_secret, ttl=60, clock=clock)
+
+        assert cache.get("tavily") == {"tavily_api_key": "tavily-v0"}
+        clock.now = 10
+        assert cache.get("tavily") == {"tavily_api_key": "tavily-v0"}
+        assert secrets_manager.calls == 1
+
+    def test_concurrent_lookups_share_single_fetch(self):
+        secrets_manager = FakeSecretsManager(delay=0.1)
+        cache = SecretCache(secrets_manager.get_secret)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get("tavily")))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert secrets_manager.calls == 1
+        assert len(results) == 10
+
+    def test_secret_is_refreshed_in_background_before_expiry(self, clock):
+        secrets_manager = FakeSecretsManager(delay=0.05)
+        cache = SecretCache(
+            secrets_manager.get_secret, ttl=100, refresh_ahead=0.2, clock=clock
+        )
+        cache.get("tavily")
+        secrets_manager.version = 1
+
+        # Stale value is served while the refresh runs in the background
+        clock.now = 85
+        assert cache.get("tavily") == {"tavily_api_key": "tavily-v0"}
+
+        deadline = time.monotonic() + 5
+        while cache.get("tavily")["tavily_api_key"] != "tavily-v1":
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert secrets_manager.calls == 2
+
+    def test_expired_secret_is_fetched_again(self, clock):
+        secrets_manager = FakeSecretsManager()
+        cache = SecretCache(secrets_manager.get_secret, ttl=60, clock=clock)
+        cache.get("tavily")
+
+        clock.now = 61
+        secrets_manager.version = 1
+        assert cache.get("tavily") == {"tavily_api_key": "tavily-v1"}
+
+    def test_fetch_error_is_not_cached(self):
+        secrets_manager = FakeSecretsManager()
+        secrets_manager.fail = True
+        cache = SecretCache(secrets_manager.get_secret)
+
+        with pytest.raises(RuntimeError):
+            cache.get("tavily")
+
+        secrets_manager.fail = False
+        assert cache.get("tavily") == {"tavily_api_key": "tavily-v0"}